@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""Scaling benchmark for the map tooling on synthetic boards.
+
+`synth_map` builds random boards that pass generate_map.validate_map: the
+major cities plus numbered and named CITY/SEA/WILDERNESS nodes scattered over
+the board, joined by a random spanning tree of nearby nodes and some extra
+local edges, with path types that follow the endpoints (SEA -> SHIP,
+WILDERNESS -> UNCHARTED, city pairs mostly TRAIN). Each size is then timed
+through the stages generate_map.py runs:
+
+  generate      synth_map itself
+  validate      generate_map.validate_map (the verify_map.ts checks and more)
+  adjacency     generate_map.build_adjacency (offsets/targets arrays)
+  reachability  depth-limited neighbourhoods of every node from those arrays
+  render        reference render and pick buffer
+  hit_index     generate_map.build_hit_index
+  serialize     TypeScript module and hit index JSON
+
+Every run is appended to bench_map_results.jsonl. Each stage is compared with
+the last recorded run of the same size, and the log-log slope between sizes
+shows stages that scale worse than linearly.
+
+Usage:
+  python3 bench_map.py
+  python3 bench_map.py --sizes 1000,10000 --repeat 3
+  python3 bench_map.py --sizes 100000 --seed 7 --no-save
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import generate_map
+import map_data
+
+ROOT = Path(__file__).resolve().parent
+RESULTS_FILE = ROOT / "bench_map_results.jsonl"
+DEFAULT_SIZES = "1000,10000,100000"
+TYPE_WEIGHTS = {"CITY": 0.35, "SEA": 0.3, "WILDERNESS": 0.35}
+NAMED_FRACTION = 0.05
+# Average nodes per grid cell when picking nearby neighbours.
+NODES_PER_CELL = 4
+STAGES = ["generate", "validate", "adjacency", "reachability", "render", "hit_index", "serialize"]
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def path_type(a: dict, b: dict, rng: random.Random) -> str:
+    types = {a["type"], b["type"]}
+    if "SEA" in types:
+        return "SHIP"
+    if "WILDERNESS" in types:
+        return "UNCHARTED"
+    return "TRAIN" if rng.random() < 0.8 else "SHIP"
+
+
+def synth_map(count: int, seed: int, extra_edges: float = 1.0) -> list[dict]:
+    """A random connected board with `count` nodes (at least the major cities)."""
+    rng = random.Random(seed)
+    count = max(count, len(map_data.MAJOR_CITIES))
+    types = list(TYPE_WEIGHTS)
+    weights = list(TYPE_WEIGHTS.values())
+    nodes: list[dict] = []
+    for i in range(count):
+        if i < len(map_data.MAJOR_CITIES):
+            node_id, type_ = map_data.MAJOR_CITIES[i], "CITY"
+        else:
+            type_ = rng.choices(types, weights)[0]
+            node_id = f"site_{i}" if rng.random() < NAMED_FRACTION else str(i)
+        nodes.append(
+            {
+                "id": node_id,
+                "name": node_id.replace("_", " ").title(),
+                "type": type_,
+                "x": round(rng.uniform(0, 100), 2),
+                "y": round(rng.uniform(0, 100), 2),
+                "connections": [],
+            }
+        )
+
+    linked: set[tuple[int, int]] = set()
+
+    def link(a: int, b: int) -> None:
+        key = (min(a, b), max(a, b))
+        if a == b or key in linked:
+            return
+        linked.add(key)
+        kind = path_type(nodes[a], nodes[b], rng)
+        nodes[a]["connections"].append({"targetId": nodes[b]["id"], "type": kind})
+        nodes[b]["connections"].append({"targetId": nodes[a]["id"], "type": kind})
+
+    cells_per_side = max(1, int(math.sqrt(count / NODES_PER_CELL)))
+    cell = 100 / cells_per_side
+    grid: dict[tuple[int, int], list[int]] = {}
+    for i, node in enumerate(nodes):
+        cx, cy = int(node["x"] // cell), int(node["y"] // cell)
+        near = [j for dx in (-1, 0, 1) for dy in (-1, 0, 1) for j in grid.get((cx + dx, cy + dy), [])]
+        if i:
+            # Linking every node to an earlier one keeps the board connected.
+            link(i, rng.choice(near) if near else rng.randrange(i))
+            if near and rng.random() < extra_edges:
+                link(i, rng.choice(near))
+        grid.setdefault((cx, cy), []).append(i)
+    return nodes
+
+
+def reachability(adjacency: dict, depth: int) -> int:
+    """Total size of every node's depth-limited neighbourhood (the work a reach index stores)."""
+    offsets = adjacency["offsets"]
+    targets = adjacency["targets"]
+    total = 0
+    for start in range(len(offsets) - 1):
+        seen = {start}
+        frontier = [start]
+        for _ in range(depth):
+            following: list[int] = []
+            for current in frontier:
+                for target in targets[offsets[current]:offsets[current + 1]]:
+                    if target not in seen:
+                        seen.add(target)
+                        following.append(target)
+            frontier = following
+        total += len(seen) - 1
+    return total
+
+
+def timed(fn, repeat: int):
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def bench_size(count: int, seed: int, repeat: int, reach_depth: int) -> dict:
+    timings: dict[str, float] = {}
+    timings["generate"], nodes = timed(lambda: synth_map(count, seed), repeat)
+    timings["validate"], errors = timed(lambda: generate_map.validate_map(nodes), repeat)
+    if errors:
+        raise RuntimeError(f"synthetic map of {count} nodes is invalid: {errors[0]}")
+    timings["adjacency"], adjacency = timed(lambda: generate_map.build_adjacency(nodes), repeat)
+    timings["reachability"], reach = timed(lambda: reachability(adjacency, reach_depth), repeat)
+    timings["render"], _ = timed(
+        lambda: (generate_map.render_reference_map(nodes), generate_map.render_pick_buffer(nodes)), repeat
+    )
+    timings["hit_index"], hit_index = timed(lambda: generate_map.build_hit_index(nodes), repeat)
+    timings["serialize"], payload = timed(
+        lambda: generate_map.render_ts_module(nodes, with_coords=True) + json.dumps(hit_index, separators=(",", ":")),
+        repeat,
+    )
+    return {
+        "nodes": len(nodes),
+        "edges": len(adjacency["targets"]) // 2,
+        "reach_entries": reach,
+        "serialized_bytes": len(payload.encode("utf-8")),
+        "seconds": timings,
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=False
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def load_results(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    records: list[dict] = []
+    for line in read_text(path).splitlines():
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records
+
+
+def previous_timings(records: list[dict], nodes: int, seed: int) -> dict[str, float] | None:
+    for record in reversed(records):
+        for size in record.get("sizes", []):
+            if size["nodes"] == nodes and record.get("seed") == seed:
+                return size["seconds"]
+    return None
+
+
+def format_report(sizes: list[dict], history: list[dict], seed: int, regress_ratio: float) -> tuple[str, list[str]]:
+    lines = ["| nodes | edges | stage | seconds | us/node | slope | vs last |", "| - | - | - | - | - | - | - |"]
+    regressions: list[str] = []
+    for position, size in enumerate(sizes):
+        before = previous_timings(history, size["nodes"], seed)
+        smaller = sizes[position - 1] if position else None
+        for stage in STAGES:
+            seconds = size["seconds"][stage]
+            slope = "-"
+            if smaller and smaller["seconds"][stage] > 0 and seconds > 0 and size["nodes"] != smaller["nodes"]:
+                slope = f"{math.log(seconds / smaller['seconds'][stage]) / math.log(size['nodes'] / smaller['nodes']):.2f}"
+            change = "-"
+            if before and before.get(stage):
+                ratio = seconds / before[stage]
+                change = f"{ratio:.2f}x"
+                if ratio > regress_ratio:
+                    regressions.append(f"{stage} at {size['nodes']} nodes: {before[stage]:.3f}s -> {seconds:.3f}s")
+            lines.append(
+                f"| {size['nodes']} | {size['edges']} | {stage} | {seconds:.3f} | "
+                f"{seconds / size['nodes'] * 1e6:.1f} | {slope} | {change} |"
+            )
+    return "\n".join(lines), regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated node counts")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the synthetic maps")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the fastest is kept")
+    parser.add_argument("--reach-depth", type=int, default=2, help="Moves per neighbourhood in the reachability stage")
+    parser.add_argument("--results", default=str(RESULTS_FILE), help="JSON lines file the results are appended to")
+    parser.add_argument("--no-save", action="store_true", help="Compare with earlier results without appending")
+    parser.add_argument("--regress-ratio", type=float, default=1.25, help="Slowdown versus the last run that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when a stage regressed")
+    args = parser.parse_args()
+
+    try:
+        counts = sorted({int(value) for value in args.sizes.split(",") if value.strip()})
+    except ValueError:
+        print(f"invalid --sizes: {args.sizes}", file=sys.stderr)
+        return 1
+    results_path = Path(args.results)
+    history = load_results(results_path)
+
+    sizes: list[dict] = []
+    for count in counts:
+        print(f"Benchmarking {count} nodes...", file=sys.stderr)
+        sizes.append(bench_size(count, args.seed, args.repeat, args.reach_depth))
+    report, regressions = format_report(sizes, history, args.seed, args.regress_ratio)
+    print(report)
+
+    if not args.no_save:
+        record = {
+            "ts": dt.datetime.now().isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "reach_depth": args.reach_depth,
+            "sizes": sizes,
+        }
+        with results_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    if regressions:
+        print("Regressions versus the last recorded run:", file=sys.stderr)
+        for line in regressions:
+            print(f"- {line}", file=sys.stderr)
+        return 1 if args.fail_on_regression else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
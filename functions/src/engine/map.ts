@@ -1,3 +1,4 @@
+// Generated by generate_map.py from map_data.py. Do not edit by hand.
 export type LocationType = 'CITY' | 'SEA' | 'WILDERNESS';
 export type PathType = 'TRAIN' | 'SHIP' | 'UNCHARTED';
 
@@ -9,120 +10,21 @@ export interface MapNode {
 }
 
 export const WORLD_MAP: Record<string, MapNode> = {
-    // --- Major Cities ---
-    "arkham": {
-        id: "arkham",
-        name: "Arkham",
-        type: "CITY",
-        connections: [
-            { targetId: "london", type: "SHIP" },
-            { targetId: "5", type: "UNCHARTED" },
-            { targetId: "6", type: "TRAIN" },
-            { targetId: "8", type: "SHIP" },
-            { targetId: "9", type: "UNCHARTED" }
-        ]
-    },
-    "san_francisco": {
-        id: "san_francisco",
-        name: "San Francisco",
-        type: "CITY",
-        connections: [
-            { targetId: "1", type: "TRAIN" },
-            { targetId: "2", type: "SHIP" },
-            { targetId: "5", type: "UNCHARTED" },
-            { targetId: "6", type: "TRAIN" },
-            { targetId: "7", type: "TRAIN" }
-        ]
-    },
-    "buenos_aires": {
-        id: "buenos_aires",
-        name: "Buenos Aires",
-        type: "CITY",
-        connections: [
-            { targetId: "3", type: "SHIP" },
-            { targetId: "7", type: "TRAIN" },
-            { targetId: "8", type: "SHIP" },
-            { targetId: "11", type: "SHIP" },
-            { targetId: "12", type: "SHIP" },
-            { targetId: "amazon", type: "UNCHARTED" }
-        ]
-    },
-    "london": {
-        id: "london",
-        name: "London",
-        type: "CITY",
-        connections: [
-            { targetId: "arkham", type: "SHIP" },
-            { targetId: "rome", type: "TRAIN" },
-            { targetId: "13", type: "SHIP" }
-        ]
-    },
-    "rome": {
-        id: "rome",
-        name: "Rome",
-        type: "CITY",
-        connections: [
-            { targetId: "london", type: "TRAIN" },
-            { targetId: "istanbul", type: "TRAIN" },
-            { targetId: "pyramids", type: "UNCHARTED" },
-            { targetId: "10", type: "UNCHARTED" },
-            { targetId: "14", type: "TRAIN" }
-        ]
-    },
-    "istanbul": {
-        id: "istanbul",
-        name: "Istanbul",
-        type: "CITY",
-        connections: [
-            { targetId: "rome", type: "TRAIN" },
-            { targetId: "pyramids", type: "UNCHARTED" },
-            { targetId: "16", type: "TRAIN" },
-            { targetId: "17", type: "TRAIN" }
-        ]
-    },
-    "tokyo": {
-        id: "tokyo",
-        name: "Tokyo",
-        type: "CITY",
-        connections: [
-            { targetId: "shanghai", type: "SHIP" },
-            { targetId: "19", type: "UNCHARTED" },
-            { targetId: "20", type: "TRAIN" }
-        ]
-    },
-    "shanghai": {
-        id: "shanghai",
-        name: "Shanghai",
-        type: "CITY",
-        connections: [
-            { targetId: "tokyo", type: "SHIP" },
-            { targetId: "himalayas", type: "UNCHARTED" },
-            { targetId: "17", type: "TRAIN" },
-            { targetId: "19", type: "UNCHARTED" },
-            { targetId: "20", type: "TRAIN" }
-        ]
-    },
-    "sydney": {
-        id: "sydney",
-        name: "Sydney",
-        type: "CITY",
-        connections: [
-            { targetId: "antarctica", type: "SHIP" },
-            { targetId: "18", type: "SHIP" },
-            { targetId: "20", type: "SHIP" },
-            { targetId: "21", type: "UNCHARTED" }
-        ]
-    },
-
-    // --- Named Locations ---
+    "san_francisco": { id: "san_francisco", name: "San Francisco", type: "CITY", connections: [{ targetId: "1", type: "TRAIN" }, { targetId: "2", type: "SHIP" }, { targetId: "5", type: "UNCHARTED" }, { targetId: "6", type: "TRAIN" }, { targetId: "7", type: "TRAIN" }] },
+    "arkham": { id: "arkham", name: "Arkham", type: "CITY", connections: [{ targetId: "london", type: "SHIP" }, { targetId: "5", type: "UNCHARTED" }, { targetId: "6", type: "TRAIN" }, { targetId: "8", type: "SHIP" }, { targetId: "9", type: "UNCHARTED" }] },
+    "buenos_aires": { id: "buenos_aires", name: "Buenos Aires", type: "CITY", connections: [{ targetId: "3", type: "SHIP" }, { targetId: "7", type: "TRAIN" }, { targetId: "8", type: "SHIP" }, { targetId: "11", type: "SHIP" }, { targetId: "12", type: "SHIP" }, { targetId: "amazon", type: "UNCHARTED" }] },
+    "london": { id: "london", name: "London", type: "CITY", connections: [{ targetId: "arkham", type: "SHIP" }, { targetId: "rome", type: "TRAIN" }, { targetId: "13", type: "SHIP" }] },
+    "rome": { id: "rome", name: "Rome", type: "CITY", connections: [{ targetId: "london", type: "TRAIN" }, { targetId: "istanbul", type: "TRAIN" }, { targetId: "pyramids", type: "UNCHARTED" }, { targetId: "10", type: "UNCHARTED" }, { targetId: "14", type: "TRAIN" }] },
+    "istanbul": { id: "istanbul", name: "Istanbul", type: "CITY", connections: [{ targetId: "rome", type: "TRAIN" }, { targetId: "pyramids", type: "UNCHARTED" }, { targetId: "16", type: "TRAIN" }, { targetId: "17", type: "TRAIN" }] },
+    "tokyo": { id: "tokyo", name: "Tokyo", type: "CITY", connections: [{ targetId: "shanghai", type: "SHIP" }, { targetId: "19", type: "UNCHARTED" }, { targetId: "20", type: "TRAIN" }] },
+    "shanghai": { id: "shanghai", name: "Shanghai", type: "CITY", connections: [{ targetId: "tokyo", type: "SHIP" }, { targetId: "himalayas", type: "UNCHARTED" }, { targetId: "17", type: "TRAIN" }, { targetId: "19", type: "UNCHARTED" }, { targetId: "20", type: "TRAIN" }] },
+    "sydney": { id: "sydney", name: "Sydney", type: "CITY", connections: [{ targetId: "antarctica", type: "SHIP" }, { targetId: "18", type: "SHIP" }, { targetId: "20", type: "SHIP" }, { targetId: "21", type: "UNCHARTED" }] },
     "amazon": { id: "amazon", name: "The Amazon", type: "WILDERNESS", connections: [{ targetId: "buenos_aires", type: "UNCHARTED" }, { targetId: "7", type: "UNCHARTED" }] },
     "pyramids": { id: "pyramids", name: "The Pyramids", type: "WILDERNESS", connections: [{ targetId: "rome", type: "UNCHARTED" }, { targetId: "istanbul", type: "UNCHARTED" }, { targetId: "heart_of_africa", type: "UNCHARTED" }, { targetId: "10", type: "UNCHARTED" }] },
     "heart_of_africa": { id: "heart_of_africa", name: "Heart of Africa", type: "WILDERNESS", connections: [{ targetId: "pyramids", type: "UNCHARTED" }, { targetId: "15", type: "UNCHARTED" }] },
     "antarctica": { id: "antarctica", name: "Antarctica", type: "WILDERNESS", connections: [{ targetId: "sydney", type: "SHIP" }, { targetId: "12", type: "SHIP" }] },
     "himalayas": { id: "himalayas", name: "Himalayas", type: "WILDERNESS", connections: [{ targetId: "shanghai", type: "UNCHARTED" }, { targetId: "17", type: "UNCHARTED" }] },
     "tunguska": { id: "tunguska", name: "Tunguska", type: "WILDERNESS", connections: [{ targetId: "16", type: "UNCHARTED" }, { targetId: "19", type: "UNCHARTED" }] },
-
-    // --- Numbered Spaces (1-21) ---
     "1": { id: "1", name: "1", type: "CITY", connections: [{ targetId: "4", type: "UNCHARTED" }, { targetId: "san_francisco", type: "TRAIN" }] },
     "2": { id: "2", name: "2", type: "SEA", connections: [{ targetId: "san_francisco", type: "SHIP" }] },
     "3": { id: "3", name: "3", type: "SEA", connections: [{ targetId: "buenos_aires", type: "SHIP" }] },
@@ -143,5 +45,14 @@ export const WORLD_MAP: Record<string, MapNode> = {
     "18": { id: "18", name: "18", type: "SEA", connections: [{ targetId: "sydney", type: "SHIP" }, { targetId: "15", type: "SHIP" }] },
     "19": { id: "19", name: "19", type: "WILDERNESS", connections: [{ targetId: "tokyo", type: "UNCHARTED" }, { targetId: "tunguska", type: "UNCHARTED" }, { targetId: "shanghai", type: "UNCHARTED" }] },
     "20": { id: "20", name: "20", type: "CITY", connections: [{ targetId: "tokyo", type: "TRAIN" }, { targetId: "shanghai", type: "TRAIN" }, { targetId: "sydney", type: "SHIP" }, { targetId: "17", type: "TRAIN" }] },
-    "21": { id: "21", name: "21", type: "WILDERNESS", connections: [{ targetId: "sydney", type: "UNCHARTED" }] }
+    "21": { id: "21", name: "21", type: "WILDERNESS", connections: [{ targetId: "sydney", type: "UNCHARTED" }] },
 };
+
+export const PATH_TYPES: PathType[] = ["TRAIN", "SHIP", "UNCHARTED"];
+export const NODE_IDS: string[] = ["san_francisco", "arkham", "buenos_aires", "london", "rome", "istanbul", "tokyo", "shanghai", "sydney", "amazon", "pyramids", "heart_of_africa", "antarctica", "himalayas", "tunguska", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "13", "14", "15", "16", "17", "18", "19", "20", "21"];
+
+// Neighbours of NODE_IDS[i] are ADJACENCY_TARGETS[ADJACENCY_OFFSETS[i] .. ADJACENCY_OFFSETS[i + 1]),
+// as NODE_IDS indices; ADJACENCY_PATH_TYPES holds the matching PATH_TYPES indices.
+export const ADJACENCY_OFFSETS: number[] = [0, 5, 10, 16, 19, 24, 28, 31, 36, 40, 42, 46, 48, 50, 52, 54, 56, 57, 58, 60, 63, 66, 71, 75, 76, 80, 82, 84, 85, 87, 92, 95, 100, 102, 105, 109, 110];
+export const ADJACENCY_TARGETS: number[] = [15, 16, 19, 20, 21, 3, 19, 20, 22, 23, 17, 21, 22, 25, 26, 9, 1, 4, 27, 3, 5, 10, 24, 28, 4, 10, 30, 31, 7, 33, 34, 6, 13, 31, 33, 34, 12, 32, 34, 35, 2, 21, 4, 5, 11, 24, 10, 29, 8, 26, 7, 31, 30, 33, 18, 0, 0, 2, 19, 15, 0, 1, 18, 0, 1, 21, 0, 2, 9, 22, 20, 1, 2, 24, 21, 1, 4, 10, 29, 22, 2, 29, 2, 12, 3, 4, 30, 11, 31, 32, 24, 25, 5, 14, 28, 5, 13, 7, 34, 29, 8, 29, 6, 14, 7, 6, 7, 8, 31, 8];
+export const ADJACENCY_PATH_TYPES: number[] = [0, 1, 2, 0, 0, 1, 2, 0, 1, 2, 1, 0, 1, 1, 1, 2, 1, 0, 1, 0, 0, 2, 2, 0, 0, 2, 0, 0, 1, 2, 0, 1, 2, 0, 2, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 2, 2, 2, 2, 2, 0, 1, 1, 2, 2, 2, 2, 2, 0, 0, 0, 0, 0, 2, 1, 0, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 0, 0, 2, 0, 1, 2, 1, 0, 2, 0, 0, 2, 0, 0, 0, 1, 1, 2, 2, 2, 0, 0, 1, 0, 2];
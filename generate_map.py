@@ -1,95 +1,575 @@
-from PIL import Image, ImageDraw, ImageFont
-import os
+#!/usr/bin/env python3
+"""Build every board artefact from map_data.py.
+
+The canonical map is validated (the checks in verify_map.ts plus symmetric
+connections and connectivity), then the TypeScript modules, the precomputed
+adjacency arrays, the reference render and the pointer hit-test artefacts are
+written in one pass. The pass is skipped when the source hash matches the last
+successful build.
+
+Hit testing (board pixels, WIDTH x HEIGHT):
+  public/assets/map_pick.png        pick buffer; pixel (r, g, b) encodes the pick
+                                    id r << 16 | g << 8 | b, 0 is empty board
+  public/assets/map_hit_index.json  pick ids 1..len(nodes) are nodes, the rest
+                                    edges; a uniform grid lists the pick ids
+                                    whose hit area may reach each cell, as
+                                    cellItems[cellOffsets[c] .. cellOffsets[c + 1])
+                                    with c = row * cols + col
+
+--watch keeps a layout preview (map_preview.png) up to date while map_data.py
+is edited. Background, edge and node layers are cached separately, and a save
+only redraws the layers and rectangles touched by changed nodes and edges
+before compositing them; the build artefacts are left alone.
+
+Usage:
+  python3 generate_map.py
+  python3 generate_map.py --check
+  python3 generate_map.py --force
+  python3 generate_map.py --watch --underlay docs/map_concept_v2.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib
+import json
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+import map_data
+
+ROOT = Path(__file__).resolve().parent
 
 # Map Dimensions (Square to match the aspect ratio used in CSS)
 WIDTH = 1024
 HEIGHT = 1024
 
-# Map Data (Copied from src/data/map.ts)
-nodes = [
-    {"id": "san_francisco", "x": 8, "y": 48},
-    {"id": "arkham", "x": 28, "y": 45},
-    {"id": "buenos_aires", "x": 32, "y": 82},
-    {"id": "london", "x": 48, "y": 38},
-    {"id": "rome", "x": 57, "y": 48},
-    {"id": "istanbul", "x": 60, "y": 38},
-    {"id": "tokyo", "x": 92, "y": 48},
-    {"id": "shanghai", "x": 82, "y": 52},
-    {"id": "sydney", "x": 92, "y": 80},
-    {"id": "amazon", "x": 22, "y": 65},
-    {"id": "pyramids", "x": 55, "y": 58},
-    {"id": "heart_of_africa", "x": 52, "y": 72},
-    {"id": "antarctica", "x": 60, "y": 95},
-    {"id": "himalayas", "x": 72, "y": 48},
-    {"id": "tunguska", "x": 78, "y": 28},
-    {"id": "1", "x": 12, "y": 68},
-    {"id": "2", "x": 20, "y": 72},
-    {"id": "3", "x": 36, "y": 35},
-    {"id": "4", "x": 44, "y": 35},
-    {"id": "5", "x": 36, "y": 46},
-    {"id": "6", "x": 38, "y": 58},
-    {"id": "7", "x": 48, "y": 52},
-    {"id": "8", "x": 50, "y": 44},
-    {"id": "9", "x": 30, "y": 52},
-    {"id": "10", "x": 78, "y": 38},
-    {"id": "11", "x": 70, "y": 32},
-    {"id": "12", "x": 50, "y": 85},
-    {"id": "13", "x": 52, "y": 78},
-    {"id": "14", "x": 66, "y": 40},
-    {"id": "15", "x": 68, "y": 58},
-    {"id": "16", "x": 75, "y": 58},
-    {"id": "17", "x": 82, "y": 62},
-    {"id": "18", "x": 82, "y": 72},
-    {"id": "19", "x": 88, "y": 40},
-    {"id": "20", "x": 86, "y": 90},
-    {"id": "21", "x": 96, "y": 62}
-]
-
-# Define categories
-major_cities = ["san_francisco", "arkham", "buenos_aires", "london", "rome", "istanbul", "tokyo", "shanghai", "sydney"]
-named_wilderness = ["amazon", "pyramids", "heart_of_africa", "antarctica", "himalayas", "tunguska"]
-numbered_cities = ["1", "5", "6", "7", "14", "15", "16", "17", "20"]
-numbered_wilderness = ["4", "9", "10", "19", "21"]
-numbered_sea = ["2", "3", "8", "11", "12", "13", "18"]
-
-# Create a black image
-img = Image.new('RGB', (WIDTH, HEIGHT), color='black')
-draw = ImageDraw.Draw(img)
-
-# Draw nodes
-for node in nodes:
-    # Convert percentage to pixels
-    px = int((node['x'] / 100) * WIDTH)
-    py = int((node['y'] / 100) * HEIGHT)
-    
-    nid = node['id']
-    
-    if nid in major_cities:
+REFERENCE_IMAGE = ROOT / "reference_map_layout.png"
+PICK_IMAGE = ROOT / "public" / "assets" / "map_pick.png"
+HIT_INDEX = ROOT / "public" / "assets" / "map_hit_index.json"
+# Grid cell size of the hit index and the half-width of an edge's hit area, in pixels.
+HIT_CELL_SIZE = 64
+EDGE_HIT_HALF_WIDTH = 4
+CACHE_FILE = ROOT / ".map_build_cache.json"
+# Output path -> whether the module carries board coordinates.
+TS_TARGETS = {
+    ROOT / "src" / "data" / "map.ts": True,
+    ROOT / "functions" / "src" / "engine" / "map.ts": False,
+}
+SOURCE_FILES = [ROOT / "map_data.py", Path(__file__).resolve()]
+PREVIEW_IMAGE = ROOT / "map_preview.png"
+EDGE_COLORS = {"TRAIN": "#C8A165", "SHIP": "#1E90FF", "UNCHARTED": "#7F7F7F"}
+EDGE_WIDTH = 3
+# Past this share of the canvas, redraw everything instead of rectangle by rectangle.
+FULL_REDRAW_FRACTION = 0.5
+
+# (x0, y0, x1, y1) in pixels, x1/y1 exclusive.
+Box = tuple[int, int, int, int]
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def write_text(path: Path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    if path.exists() and read_text(path) == content:
+        return False
+    write_text(path, content)
+    return True
+
+
+def source_hash() -> str:
+    digest = hashlib.sha256()
+    for path in SOURCE_FILES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def is_named(node: dict) -> bool:
+    return not node["id"].isdigit()
+
+
+def node_style(node: dict) -> tuple[int, str]:
+    if node["type"] == "CITY" and is_named(node):
         # Major City: Large Gold Circle
-        radius = 15
-        draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill='#FFD700', outline='#FFD700')
-    elif nid in named_wilderness:
+        return 15, "#FFD700"
+    if node["type"] == "WILDERNESS" and is_named(node):
         # Named Wilderness: Large Green Circle (to be distinct)
-        radius = 15
-        draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill='#00FF00', outline='#00FF00')
-    elif nid in numbered_cities:
+        return 15, "#00FF00"
+    if node["type"] == "CITY":
         # Numbered City: Small White Circle
-        radius = 8
-        draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill='white', outline='white')
-    elif nid in numbered_wilderness:
+        return 8, "white"
+    if node["type"] == "WILDERNESS":
         # Numbered Wilderness: Small Green Circle
-        radius = 8
-        draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill='#90EE90', outline='#90EE90')
-    elif nid in numbered_sea:
+        return 8, "#90EE90"
+    if node["type"] == "SEA":
         # Numbered Sea: Small Blue Circle
-        radius = 8
-        draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill='#00BFFF', outline='#00BFFF')
-    else:
-        # Fallback
-        radius = 5
-        draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill='gray', outline='gray')
-
-# Save the image
-output_path = "reference_map_layout.png"
-img.save(output_path)
-print(f"Reference map generated at {output_path}")
+        return 8, "#00BFFF"
+    # Fallback
+    return 5, "gray"
+
+
+def to_pixels(node: dict, width: int = WIDTH, height: int = HEIGHT) -> tuple[int, int]:
+    # Convert percentage to pixels
+    return int((node["x"] / 100) * width), int((node["y"] / 100) * height)
+
+
+def validate_map(nodes: list[dict]) -> list[str]:
+    errors: list[str] = []
+    by_id: dict[str, dict] = {}
+    for node in nodes:
+        if node["id"] in by_id:
+            errors.append(f"Duplicate node id: {node['id']}")
+        by_id[node["id"]] = node
+        if node["type"] not in map_data.LOCATION_TYPES:
+            errors.append(f"Unknown location type on {node['id']}: {node['type']}")
+        if not (0 <= node["x"] <= 100 and 0 <= node["y"] <= 100):
+            errors.append(f"Coordinates out of range on {node['id']}: ({node['x']}, {node['y']})")
+
+    for city_id in map_data.MAJOR_CITIES:
+        if city_id not in by_id:
+            errors.append(f"Missing city: {city_id}")
+
+    for node in nodes:
+        seen: set[str] = set()
+        for conn in node["connections"]:
+            target_id = conn["targetId"]
+            if conn["type"] not in map_data.PATH_TYPES:
+                errors.append(f"Unknown path type from {node['id']} to {target_id}: {conn['type']}")
+            if target_id == node["id"]:
+                errors.append(f"Self connection on {node['id']}")
+                continue
+            if target_id in seen:
+                errors.append(f"Duplicate connection from {node['id']} to {target_id}")
+            seen.add(target_id)
+            target = by_id.get(target_id)
+            if target is None:
+                errors.append(f"Invalid connection from {node['id']} to {target_id}")
+                continue
+            back = [c for c in target["connections"] if c["targetId"] == node["id"]]
+            if not back:
+                errors.append(f"Asymmetric connection: {node['id']} -> {target_id} has no return path")
+            elif back[0]["type"] != conn["type"]:
+                errors.append(
+                    f"Path type mismatch between {node['id']} and {target_id}: {conn['type']} vs {back[0]['type']}"
+                )
+
+    if nodes:
+        reached = {nodes[0]["id"]}
+        queue = deque([nodes[0]["id"]])
+        while queue:
+            current = by_id[queue.popleft()]
+            for conn in current["connections"]:
+                target_id = conn["targetId"]
+                if target_id in by_id and target_id not in reached:
+                    reached.add(target_id)
+                    queue.append(target_id)
+        unreachable = [node["id"] for node in nodes if node["id"] not in reached]
+        if unreachable:
+            errors.append(f"Graph is not connected; unreachable from {nodes[0]['id']}: {', '.join(unreachable)}")
+    return errors
+
+
+def build_adjacency(nodes: list[dict]) -> dict[str, list]:
+    index = {node["id"]: i for i, node in enumerate(nodes)}
+    offsets = [0]
+    targets: list[int] = []
+    path_types: list[int] = []
+    for node in nodes:
+        for conn in node["connections"]:
+            targets.append(index[conn["targetId"]])
+            path_types.append(map_data.PATH_TYPES.index(conn["type"]))
+        offsets.append(len(targets))
+    return {
+        "nodeIds": [node["id"] for node in nodes],
+        "offsets": offsets,
+        "targets": targets,
+        "pathTypes": path_types,
+    }
+
+
+def ts_list(values: list) -> str:
+    return "[" + ", ".join(json.dumps(v, ensure_ascii=False) for v in values) + "]"
+
+
+def render_ts_module(nodes: list[dict], *, with_coords: bool) -> str:
+    adjacency = build_adjacency(nodes)
+    location_union = " | ".join(f"'{t}'" for t in map_data.LOCATION_TYPES)
+    path_union = " | ".join(f"'{t}'" for t in map_data.PATH_TYPES)
+    lines = [
+        "// Generated by generate_map.py from map_data.py. Do not edit by hand.",
+        f"export type LocationType = {location_union};",
+        f"export type PathType = {path_union};",
+        "",
+        "export interface MapNode {",
+        "    id: string;",
+        "    name: string;",
+        "    type: LocationType;",
+    ]
+    if with_coords:
+        lines += ["    x: number;", "    y: number;"]
+    lines += [
+        "    connections: { targetId: string; type: PathType }[];",
+        "}",
+        "",
+        "export const WORLD_MAP: Record<string, MapNode> = {",
+    ]
+    for node in nodes:
+        conns = ", ".join(
+            f"{{ targetId: {json.dumps(c['targetId'])}, type: {json.dumps(c['type'])} }}" for c in node["connections"]
+        )
+        coords = f" x: {node['x']}, y: {node['y']}," if with_coords else ""
+        lines.append(
+            f"    {json.dumps(node['id'])}: {{ id: {json.dumps(node['id'])}, "
+            f"name: {json.dumps(node['name'], ensure_ascii=False)}, type: {json.dumps(node['type'])},"
+            f"{coords} connections: [{conns}] }},"
+        )
+    lines += [
+        "};",
+        "",
+        f"export const PATH_TYPES: PathType[] = {ts_list(map_data.PATH_TYPES)};",
+        f"export const NODE_IDS: string[] = {ts_list(adjacency['nodeIds'])};",
+        "",
+        "// Neighbours of NODE_IDS[i] are ADJACENCY_TARGETS[ADJACENCY_OFFSETS[i] .. ADJACENCY_OFFSETS[i + 1]),",
+        "// as NODE_IDS indices; ADJACENCY_PATH_TYPES holds the matching PATH_TYPES indices.",
+        f"export const ADJACENCY_OFFSETS: number[] = {ts_list(adjacency['offsets'])};",
+        f"export const ADJACENCY_TARGETS: number[] = {ts_list(adjacency['targets'])};",
+        f"export const ADJACENCY_PATH_TYPES: number[] = {ts_list(adjacency['pathTypes'])};",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def render_reference_map(nodes: list[dict], width: int = WIDTH, height: int = HEIGHT) -> Image.Image:
+    # Create a black image
+    img = Image.new("RGB", (width, height), color="black")
+    draw = ImageDraw.Draw(img)
+    for node in nodes:
+        px, py = to_pixels(node, width, height)
+        radius, color = node_style(node)
+        draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill=color, outline=color)
+    return img
+
+
+def build_edges(nodes: list[dict]) -> list[tuple[int, int, str]]:
+    """Undirected connections as (node index, node index, path type), each listed once."""
+    index = {node["id"]: i for i, node in enumerate(nodes)}
+    edges: list[tuple[int, int, str]] = []
+    for i, node in enumerate(nodes):
+        for conn in node["connections"]:
+            j = index[conn["targetId"]]
+            if i < j:
+                edges.append((i, j, conn["type"]))
+    return edges
+
+
+def pick_color(pick_id: int) -> tuple[int, int, int]:
+    return (pick_id >> 16) & 0xFF, (pick_id >> 8) & 0xFF, pick_id & 0xFF
+
+
+def render_pick_buffer(nodes: list[dict], width: int = WIDTH, height: int = HEIGHT) -> Image.Image:
+    # No anti-aliasing in RGB mode, so every pixel is exactly one pick id. Nodes are drawn last to win over edges.
+    img = Image.new("RGB", (width, height), color=(0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    centres = [to_pixels(node, width, height) for node in nodes]
+    for edge_no, (i, j, _) in enumerate(build_edges(nodes)):
+        draw.line((centres[i], centres[j]), fill=pick_color(len(nodes) + 1 + edge_no), width=EDGE_HIT_HALF_WIDTH * 2 + 1)
+    for i, node in enumerate(nodes):
+        px, py = centres[i]
+        radius, _ = node_style(node)
+        draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill=pick_color(i + 1))
+    return img
+
+
+def segment_distance(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    return ((px - ax - t * dx) ** 2 + (py - ay - t * dy) ** 2) ** 0.5
+
+
+def build_hit_index(nodes: list[dict], width: int = WIDTH, height: int = HEIGHT, cell: int = HIT_CELL_SIZE) -> dict:
+    cols = -(-width // cell)
+    rows = -(-height // cell)
+    cells: list[list[int]] = [[] for _ in range(cols * rows)]
+    centres = [to_pixels(node, width, height) for node in nodes]
+    node_entries = []
+    for i, node in enumerate(nodes):
+        px, py = centres[i]
+        radius, _ = node_style(node)
+        node_entries.append({"id": node["id"], "x": px, "y": py, "r": radius})
+        # The ellipse's bounding box is inclusive, so it fills up to a pixel past the radius.
+        reach = radius + 1
+        for row in range(max(0, (py - reach) // cell), min(rows - 1, (py + reach) // cell) + 1):
+            for col in range(max(0, (px - reach) // cell), min(cols - 1, (px + reach) // cell) + 1):
+                # Closest point of the cell to the centre decides overlap.
+                nx = min(max(px, col * cell), (col + 1) * cell)
+                ny = min(max(py, row * cell), (row + 1) * cell)
+                if (nx - px) ** 2 + (ny - py) ** 2 <= reach * reach:
+                    cells[row * cols + col].append(i + 1)
+    edge_entries = []
+    # Conservative for edges: a cell is listed when its centre lies within the
+    # drawn half-width plus half a cell diagonal of the segment. The extra pixel
+    # covers the rasteriser rounding the wide line's polygon outwards.
+    reach = (EDGE_HIT_HALF_WIDTH * 2 + 1) / 2 + 1 + cell * 0.7072
+    for edge_no, (i, j, path_type) in enumerate(build_edges(nodes)):
+        (ax, ay), (bx, by) = centres[i], centres[j]
+        edge_entries.append({"a": i, "b": j, "type": path_type})
+        pick_id = len(nodes) + 1 + edge_no
+        for row in range(max(0, int((min(ay, by) - reach) // cell)), min(rows - 1, int((max(ay, by) + reach) // cell)) + 1):
+            for col in range(max(0, int((min(ax, bx) - reach) // cell)), min(cols - 1, int((max(ax, bx) + reach) // cell)) + 1):
+                if segment_distance((col + 0.5) * cell, (row + 0.5) * cell, ax, ay, bx, by) <= reach:
+                    cells[row * cols + col].append(pick_id)
+    offsets = [0]
+    items: list[int] = []
+    for members in cells:
+        items.extend(members)
+        offsets.append(len(items))
+    return {
+        "width": width,
+        "height": height,
+        "cellSize": cell,
+        "cols": cols,
+        "rows": rows,
+        "edgeHalfWidth": EDGE_HIT_HALF_WIDTH,
+        "nodes": node_entries,
+        "edges": edge_entries,
+        "cellOffsets": offsets,
+        "cellItems": items,
+    }
+
+
+def boxes_overlap(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def merge_boxes(boxes: list[Box], width: int = WIDTH, height: int = HEIGHT) -> list[Box]:
+    """Clamp to the canvas and merge overlapping boxes until none overlap."""
+    pending = [
+        (max(0, x0), max(0, y0), min(width, x1), min(height, y1))
+        for x0, y0, x1, y1 in boxes
+        if x1 > 0 and y1 > 0 and x0 < width and y0 < height
+    ]
+    merged: list[Box] = []
+    while pending:
+        box = pending.pop()
+        for other in merged:
+            if boxes_overlap(box, other):
+                merged.remove(other)
+                pending.append((min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3])))
+                break
+        else:
+            merged.append(box)
+    return merged
+
+
+class LayeredRenderer:
+    """Preview render kept as cached background, edge and node layers.
+
+    `update(nodes)` compares the board with the previous call, redraws only the
+    changed rectangles of the layers that changed, and recomposites those
+    rectangles into `composite`.
+    """
+
+    def __init__(self, width: int = WIDTH, height: int = HEIGHT, underlay: Path | None = None) -> None:
+        self.width = width
+        self.height = height
+        if underlay is not None:
+            self.background = Image.open(underlay).convert("RGB").resize((width, height))
+        else:
+            self.background = Image.new("RGB", (width, height), color="black")
+        self.edges = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        self.nodes = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        self.scratch = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        self.composite = self.background.copy()
+        self.node_looks: dict[str, tuple] = {}
+        self.edge_looks: dict[tuple[str, str], tuple] = {}
+
+    def _looks(self, nodes: list[dict]) -> tuple[dict[str, tuple], dict[tuple[str, str], tuple]]:
+        # Only what is drawn: moving a node dirties its edges, renaming it dirties nothing.
+        by_id = {node["id"]: node for node in nodes}
+        node_looks = {node["id"]: (to_pixels(node, self.width, self.height), node_style(node)) for node in nodes}
+        edge_looks: dict[tuple[str, str], tuple] = {}
+        for node in nodes:
+            for conn in node["connections"]:
+                target = by_id.get(conn["targetId"])
+                if target is not None and node["id"] < target["id"]:
+                    edge_looks[(node["id"], target["id"])] = (node_looks[node["id"]][0], node_looks[target["id"]][0], conn["type"])
+        return node_looks, edge_looks
+
+    def _node_box(self, look: tuple) -> Box:
+        (px, py), (radius, _) = look
+        return px - radius - 1, py - radius - 1, px + radius + 2, py + radius + 2
+
+    def _edge_box(self, look: tuple) -> Box:
+        (ax, ay), (bx, by), _ = look
+        return min(ax, bx) - EDGE_WIDTH, min(ay, by) - EDGE_WIDTH, max(ax, bx) + EDGE_WIDTH + 1, max(ay, by) + EDGE_WIDTH + 1
+
+    def _redraw(self, layer: Image.Image, box: Box, shapes: list[tuple[Box, object]]) -> None:
+        # Shapes go on a full-size scratch at their real coordinates: PIL's wide
+        # lines are not pixel-identical when drawn translated into a small tile.
+        draw = ImageDraw.Draw(self.scratch)
+        touched: list[Box] = []
+        for shape_box, paint in shapes:
+            if boxes_overlap(shape_box, box):
+                paint(draw)
+                touched.append(shape_box)
+        layer.paste(self.scratch.crop(box), box[:2])
+        for shape_box in merge_boxes(touched, self.width, self.height):
+            self.scratch.paste((0, 0, 0, 0), shape_box)
+
+    def _redraw_edges(self, box: Box) -> None:
+        shapes = []
+        for look in self.edge_looks.values():
+            (ax, ay), (bx, by), path_type = look
+            color = EDGE_COLORS.get(path_type, "gray")
+            shapes.append((self._edge_box(look), lambda d, a=(ax, ay), b=(bx, by), c=color: d.line((a, b), fill=c, width=EDGE_WIDTH)))
+        self._redraw(self.edges, box, shapes)
+
+    def _redraw_nodes(self, box: Box) -> None:
+        shapes = []
+        for look in self.node_looks.values():
+            (px, py), (radius, color) = look
+            xy = (px - radius, py - radius, px + radius, py + radius)
+            shapes.append((self._node_box(look), lambda d, xy=xy, c=color: d.ellipse(xy, fill=c, outline=c)))
+        self._redraw(self.nodes, box, shapes)
+
+    def _composite(self, box: Box) -> None:
+        tile = self.background.crop(box).convert("RGBA")
+        tile.alpha_composite(self.edges.crop(box))
+        tile.alpha_composite(self.nodes.crop(box))
+        self.composite.paste(tile.convert("RGB"), box[:2])
+
+    def update(self, nodes: list[dict]) -> list[Box]:
+        """Bring the layers in line with `nodes`; returns the rectangles that were recomposited."""
+        node_looks, edge_looks = self._looks(nodes)
+        node_dirty: list[Box] = []
+        for node_id in node_looks.keys() | self.node_looks.keys():
+            old, new = self.node_looks.get(node_id), node_looks.get(node_id)
+            if old != new:
+                node_dirty += [self._node_box(look) for look in (old, new) if look is not None]
+        edge_dirty: list[Box] = []
+        for key in edge_looks.keys() | self.edge_looks.keys():
+            old, new = self.edge_looks.get(key), edge_looks.get(key)
+            if old != new:
+                edge_dirty += [self._edge_box(look) for look in (old, new) if look is not None]
+        self.node_looks, self.edge_looks = node_looks, edge_looks
+
+        node_dirty = merge_boxes(node_dirty, self.width, self.height)
+        edge_dirty = merge_boxes(edge_dirty, self.width, self.height)
+        dirty = merge_boxes(node_dirty + edge_dirty, self.width, self.height)
+        full = (0, 0, self.width, self.height)
+        if sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in dirty) > FULL_REDRAW_FRACTION * self.width * self.height:
+            node_dirty = [full] if node_dirty else []
+            edge_dirty = [full] if edge_dirty else []
+            dirty = [full]
+        for box in edge_dirty:
+            self._redraw_edges(box)
+        for box in node_dirty:
+            self._redraw_nodes(box)
+        for box in dirty:
+            self._composite(box)
+        return dirty
+
+
+def watch(preview: Path, underlay: Path | None, interval: float) -> int:
+    source = ROOT / "map_data.py"
+    renderer = LayeredRenderer(underlay=underlay)
+    last_mtime: int | None = None
+    print(f"Watching {source.relative_to(ROOT)}; preview at {preview} (Ctrl-C to stop).")
+    try:
+        while True:
+            mtime = source.stat().st_mtime_ns
+            if mtime != last_mtime:
+                last_mtime = mtime
+                started = time.perf_counter()
+                try:
+                    importlib.reload(map_data)
+                except Exception as exc:  # a half-saved edit; wait for the next save
+                    print(f"map_data.py failed to load: {exc}", file=sys.stderr)
+                    time.sleep(interval)
+                    continue
+                errors = validate_map(map_data.WORLD_MAP)
+                for error in errors:
+                    print(f"- {error}", file=sys.stderr)
+                if not errors:
+                    dirty = renderer.update(map_data.WORLD_MAP)
+                    if dirty:
+                        renderer.composite.save(preview, compress_level=1)
+                    area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in dirty)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    print(f"Preview updated in {elapsed:.0f} ms ({len(dirty)} region(s), {area} px redrawn).")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Stopped watching; run generate_map.py to rebuild the artefacts.")
+    return 0
+
+
+def load_cache() -> dict:
+    if not CACHE_FILE.exists():
+        return {}
+    try:
+        return json.loads(read_text(CACHE_FILE))
+    except json.JSONDecodeError:
+        return {}
+
+
+def build(nodes: list[dict], *, force: bool) -> int:
+    digest = source_hash()
+    outputs = [REFERENCE_IMAGE, PICK_IMAGE, HIT_INDEX, *TS_TARGETS]
+    cache = load_cache()
+    if not force and cache.get("source_hash") == digest and all(path.exists() for path in outputs):
+        print("Map sources unchanged; nothing to do.")
+        return 0
+
+    for path, with_coords in TS_TARGETS.items():
+        if write_if_changed(path, render_ts_module(nodes, with_coords=with_coords)):
+            print(f"Wrote {path.relative_to(ROOT)}")
+    render_reference_map(nodes).save(REFERENCE_IMAGE)
+    print(f"Reference map generated at {REFERENCE_IMAGE.relative_to(ROOT)}")
+    render_pick_buffer(nodes).save(PICK_IMAGE)
+    if write_if_changed(HIT_INDEX, json.dumps(build_hit_index(nodes), ensure_ascii=False, separators=(",", ":")) + "\n"):
+        print(f"Wrote {HIT_INDEX.relative_to(ROOT)}")
+    print(f"Pick buffer generated at {PICK_IMAGE.relative_to(ROOT)}")
+
+    write_text(CACHE_FILE, json.dumps({"source_hash": digest, "outputs": [str(p.relative_to(ROOT)) for p in outputs]}, indent=2) + "\n")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true", help="Validate map_data.py without writing outputs")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the source hash is unchanged")
+    parser.add_argument("--watch", action="store_true", help="Keep a layered layout preview up to date as map_data.py changes")
+    parser.add_argument("--preview", default=str(PREVIEW_IMAGE), help="Preview image written by --watch")
+    parser.add_argument("--underlay", default=None, help="Background image for the --watch preview (e.g. docs/map_concept_v2.png)")
+    parser.add_argument("--interval", type=float, default=0.3, help="Seconds between checks of map_data.py in --watch")
+    args = parser.parse_args()
+
+    if args.watch:
+        return watch(Path(args.preview), Path(args.underlay) if args.underlay else None, args.interval)
+
+    nodes = map_data.WORLD_MAP
+    errors = validate_map(nodes)
+    if errors:
+        print("Map validation FAILED with errors:", file=sys.stderr)
+        for error in errors:
+            print(f"- {error}", file=sys.stderr)
+        return 1
+    print(f"Map validation OK ({len(nodes)} nodes).")
+    if args.check:
+        return 0
+    return build(nodes, force=args.force)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
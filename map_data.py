@@ -0,0 +1,140 @@
+"""Canonical board definition. generate_map.py builds every derived artefact from it.
+
+Coordinates are percentages of the board (0-100). Connections must be listed on
+both endpoints with the same path type; generate_map.py validates this.
+"""
+
+LOCATION_TYPES = ["CITY", "SEA", "WILDERNESS"]
+PATH_TYPES = ["TRAIN", "SHIP", "UNCHARTED"]
+
+# Named cities that must exist on every board (mirrors verify_map.ts).
+MAJOR_CITIES = ["arkham", "san_francisco", "london", "rome", "istanbul", "tokyo", "shanghai", "sydney", "buenos_aires"]
+
+
+def node(node_id: str, name: str, type_: str, x: int, y: int, connections: list[tuple[str, str]]) -> dict:
+    return {
+        "id": node_id,
+        "name": name,
+        "type": type_,
+        "x": x,
+        "y": y,
+        "connections": [{"targetId": target, "type": path} for target, path in connections],
+    }
+
+
+WORLD_MAP = [
+    # --- Major Cities ---
+    node("san_francisco", "San Francisco", "CITY", 8, 48, [
+        ("1", "TRAIN"),
+        ("2", "SHIP"),
+        ("5", "UNCHARTED"),
+        ("6", "TRAIN"),
+        ("7", "TRAIN"),
+    ]),
+    node("arkham", "Arkham", "CITY", 28, 45, [
+        ("london", "SHIP"),
+        ("5", "UNCHARTED"),
+        ("6", "TRAIN"),
+        ("8", "SHIP"),
+        ("9", "UNCHARTED"),
+    ]),
+    node("buenos_aires", "Buenos Aires", "CITY", 32, 82, [
+        ("3", "SHIP"),
+        ("7", "TRAIN"),
+        ("8", "SHIP"),
+        ("11", "SHIP"),
+        ("12", "SHIP"),
+        ("amazon", "UNCHARTED"),
+    ]),
+    node("london", "London", "CITY", 48, 38, [("arkham", "SHIP"), ("rome", "TRAIN"), ("13", "SHIP")]),
+    node("rome", "Rome", "CITY", 57, 48, [
+        ("london", "TRAIN"),
+        ("istanbul", "TRAIN"),
+        ("pyramids", "UNCHARTED"),
+        ("10", "UNCHARTED"),
+        ("14", "TRAIN"),
+    ]),
+    node("istanbul", "Istanbul", "CITY", 60, 38, [
+        ("rome", "TRAIN"),
+        ("pyramids", "UNCHARTED"),
+        ("16", "TRAIN"),
+        ("17", "TRAIN"),
+    ]),
+    node("tokyo", "Tokyo", "CITY", 92, 48, [("shanghai", "SHIP"), ("19", "UNCHARTED"), ("20", "TRAIN")]),
+    node("shanghai", "Shanghai", "CITY", 82, 52, [
+        ("tokyo", "SHIP"),
+        ("himalayas", "UNCHARTED"),
+        ("17", "TRAIN"),
+        ("19", "UNCHARTED"),
+        ("20", "TRAIN"),
+    ]),
+    node("sydney", "Sydney", "CITY", 92, 80, [
+        ("antarctica", "SHIP"),
+        ("18", "SHIP"),
+        ("20", "SHIP"),
+        ("21", "UNCHARTED"),
+    ]),
+
+    # --- Named Locations ---
+    node("amazon", "The Amazon", "WILDERNESS", 22, 65, [("buenos_aires", "UNCHARTED"), ("7", "UNCHARTED")]),
+    node("pyramids", "The Pyramids", "WILDERNESS", 55, 58, [
+        ("rome", "UNCHARTED"),
+        ("istanbul", "UNCHARTED"),
+        ("heart_of_africa", "UNCHARTED"),
+        ("10", "UNCHARTED"),
+    ]),
+    node("heart_of_africa", "Heart of Africa", "WILDERNESS", 52, 72, [("pyramids", "UNCHARTED"), ("15", "UNCHARTED")]),
+    node("antarctica", "Antarctica", "WILDERNESS", 60, 95, [("sydney", "SHIP"), ("12", "SHIP")]),
+    node("himalayas", "Himalayas", "WILDERNESS", 72, 48, [("shanghai", "UNCHARTED"), ("17", "UNCHARTED")]),
+    node("tunguska", "Tunguska", "WILDERNESS", 78, 28, [("16", "UNCHARTED"), ("19", "UNCHARTED")]),
+
+    # --- Numbered Spaces (1-21) ---
+    node("1", "1", "CITY", 12, 68, [("4", "UNCHARTED"), ("san_francisco", "TRAIN")]),
+    node("2", "2", "SEA", 20, 72, [("san_francisco", "SHIP")]),
+    node("3", "3", "SEA", 36, 35, [("buenos_aires", "SHIP")]),
+    node("4", "4", "WILDERNESS", 44, 35, [("5", "UNCHARTED"), ("1", "UNCHARTED")]),
+    node("5", "5", "WILDERNESS", 36, 46, [("san_francisco", "UNCHARTED"), ("arkham", "UNCHARTED"), ("4", "UNCHARTED")]),
+    node("6", "6", "CITY", 38, 58, [("san_francisco", "TRAIN"), ("arkham", "TRAIN"), ("7", "TRAIN")]),
+    node("7", "7", "CITY", 48, 52, [
+        ("san_francisco", "TRAIN"),
+        ("buenos_aires", "TRAIN"),
+        ("amazon", "UNCHARTED"),
+        ("8", "SHIP"),
+        ("6", "TRAIN"),
+    ]),
+    node("8", "8", "SEA", 50, 44, [("arkham", "SHIP"), ("buenos_aires", "SHIP"), ("10", "SHIP"), ("7", "SHIP")]),
+    node("9", "9", "WILDERNESS", 30, 52, [("arkham", "UNCHARTED")]),
+    node("10", "10", "WILDERNESS", 78, 38, [
+        ("rome", "UNCHARTED"),
+        ("pyramids", "UNCHARTED"),
+        ("15", "UNCHARTED"),
+        ("8", "SHIP"),
+    ]),
+    node("11", "11", "SEA", 70, 32, [("buenos_aires", "SHIP"), ("15", "SHIP")]),
+    node("12", "12", "SEA", 50, 85, [("buenos_aires", "SHIP"), ("antarctica", "SHIP")]),
+    node("13", "13", "SEA", 52, 78, [("london", "SHIP")]),
+    node("14", "14", "CITY", 66, 40, [("rome", "TRAIN"), ("16", "TRAIN")]),
+    node("15", "15", "CITY", 68, 58, [
+        ("heart_of_africa", "UNCHARTED"),
+        ("17", "TRAIN"),
+        ("18", "SHIP"),
+        ("10", "UNCHARTED"),
+        ("11", "SHIP"),
+    ]),
+    node("16", "16", "CITY", 75, 58, [("istanbul", "TRAIN"), ("tunguska", "UNCHARTED"), ("14", "TRAIN")]),
+    node("17", "17", "CITY", 82, 62, [
+        ("istanbul", "TRAIN"),
+        ("himalayas", "UNCHARTED"),
+        ("shanghai", "TRAIN"),
+        ("20", "TRAIN"),
+        ("15", "TRAIN"),
+    ]),
+    node("18", "18", "SEA", 82, 72, [("sydney", "SHIP"), ("15", "SHIP")]),
+    node("19", "19", "WILDERNESS", 88, 40, [
+        ("tokyo", "UNCHARTED"),
+        ("tunguska", "UNCHARTED"),
+        ("shanghai", "UNCHARTED"),
+    ]),
+    node("20", "20", "CITY", 86, 90, [("tokyo", "TRAIN"), ("shanghai", "TRAIN"), ("sydney", "SHIP"), ("17", "TRAIN")]),
+    node("21", "21", "WILDERNESS", 96, 62, [("sydney", "UNCHARTED")]),
+]
@@ -5,10 +5,18 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import random
+import signal
 import subprocess
 import sys
+import time
 from pathlib import Path
 
+import run_archive
+
+# auto_orchestrate.py exit code for a step whose transient failures outlasted its retries.
+TRANSIENT_EXIT_CODE = 3
+
 
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
@@ -23,26 +31,47 @@ def append_log(path: Path, line: str) -> None:
         f.write(line.rstrip() + "\n")
 
 
-def parse_sequence(runlog_path: Path) -> list[str] | None:
-    if not runlog_path.exists():
+def parse_sequence(view: run_archive.RunView) -> list[str] | None:
+    if not view.exists("runlog.md"):
         return None
-    for line in read_text(runlog_path).splitlines():
+    for line in view.read_text("runlog.md").splitlines():
         if line.startswith("- Sequence:"):
             raw = line.split(":", 1)[1].strip()
             return [s.strip() for s in raw.split(",") if s.strip()]
     return None
 
 
-def find_next_step(run_dir: Path, sequence: list[str]) -> int:
+def find_next_step(view: run_archive.RunView, sequence: list[str]) -> int:
     for idx, skill in enumerate(sequence, 1):
-        out_file = run_dir / f"{idx:02d}-{skill}.md"
-        resp_file = run_dir / f"{idx:02d}-{skill}.response.md"
-        if out_file.exists() or resp_file.exists():
+        if view.exists(f"{idx:02d}-{skill}.md") or view.exists(f"{idx:02d}-{skill}.response.md"):
             continue
         return idx
     return len(sequence) + 1
 
 
+def run_child(cmd: list[str]) -> int:
+    """Run one auto_orchestrate.py chunk, passing SIGINT/SIGTERM on to it.
+
+    The child gets its own process group, so a Ctrl-C reaches it once (through
+    here) rather than also directly from the terminal; it stops the running
+    step's process group, logs the cancellation and exits 128 + signal, which
+    is returned here.
+    """
+    proc = subprocess.Popen(cmd, process_group=0)
+
+    def forward(signum, frame) -> None:
+        proc.send_signal(signum)
+
+    previous = {sig: signal.signal(sig, forward) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        returncode = proc.wait()
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+    # Killed by a signal outright: report it the way a shell would.
+    return 128 - returncode if returncode < 0 else returncode
+
+
 def build_base_cmd(args: argparse.Namespace, run_dir: Path, start_at: int, timeout_seconds: int | None) -> list[str]:
     cmd = [
         sys.executable,
@@ -85,6 +114,41 @@ def build_base_cmd(args: argparse.Namespace, run_dir: Path, start_at: int, timeo
         cmd.append("--no-researcher-web-required")
     if args.auto_reviewer is False:
         cmd.append("--no-auto-reviewer")
+    if args.stable_prefix:
+        cmd.append("--stable-prefix")
+    if args.workspace:
+        cmd += ["--workspace", args.workspace]
+    if args.workspace_root:
+        cmd += ["--workspace-root", args.workspace_root]
+    if args.merge_back:
+        cmd.append("--merge-back")
+    if args.diff_scoped_review is False:
+        cmd.append("--no-diff-scoped-review")
+    if args.hedge:
+        cmd.append("--hedge")
+    if args.hedge_after_seconds is not None:
+        cmd += ["--hedge-after-seconds", str(args.hedge_after_seconds)]
+    if args.hedge_min_samples is not None:
+        cmd += ["--hedge-min-samples", str(args.hedge_min_samples)]
+    if args.hedge_model:
+        cmd += ["--hedge-model", args.hedge_model]
+    if args.hedge_codex_config:
+        for item in args.hedge_codex_config:
+            cmd += ["--hedge-codex-config", item]
+    if args.runs_dir:
+        cmd += ["--runs-dir", args.runs_dir]
+    if args.max_retries is not None:
+        cmd += ["--max-retries", str(args.max_retries)]
+    if args.codex_rate_per_minute is not None:
+        cmd += ["--codex-rate-per-minute", str(args.codex_rate_per_minute)]
+    if args.codex_burst is not None:
+        cmd += ["--codex-burst", str(args.codex_burst)]
+    if args.rate_limit_file:
+        cmd += ["--rate-limit-file", args.rate_limit_file]
+    if args.cpu_seconds is not None:
+        cmd += ["--cpu-seconds", str(args.cpu_seconds)]
+    if args.memory_mb is not None:
+        cmd += ["--memory-mb", str(args.memory_mb)]
     if args.force:
         cmd.append("--force")
     if args.resume:
@@ -120,6 +184,33 @@ def main() -> int:
     parser.add_argument("--researcher-web-required", action=argparse.BooleanOptionalAction, default=True, help="Force researcher web search")
     parser.add_argument("--auto-reviewer", action=argparse.BooleanOptionalAction, default=True, help="Auto insert reviewer roles")
     parser.add_argument("--force", action="store_true", help="Re-run steps even if output files already exist")
+    parser.add_argument(
+        "--diff-scoped-review",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Give reviewer roles only the changes of the step they review",
+    )
+    parser.add_argument("--workspace", choices=["shared", "worktree"], default=None, help="Per-run worktree isolation")
+    parser.add_argument("--workspace-root", default=None, help="Parent directory for per-run worktrees")
+    parser.add_argument("--merge-back", action="store_true", help="Merge the run's worktree back when all steps are done")
+    parser.add_argument("--stable-prefix", action="store_true", help="Use prefix-stable prompt assembly")
+    parser.add_argument("--hedge", action="store_true", help="Hedge steps that outlive their historical p90")
+    parser.add_argument("--hedge-after-seconds", type=float, default=None, help="Hedge after N seconds instead of the p90")
+    parser.add_argument("--hedge-min-samples", type=int, default=None, help="Past runs of a skill required before hedging on p90")
+    parser.add_argument("--hedge-model", default=None, help="Codex model for the hedge attempt")
+    parser.add_argument(
+        "--hedge-codex-config",
+        action="append",
+        default=None,
+        help="Extra Codex config overrides for the hedge attempt (repeatable)",
+    )
+    parser.add_argument("--runs-dir", default=None, help="Directory of past runs used for duration history")
+    parser.add_argument("--max-retries", type=int, default=None, help="In-process retries for transient codex failures")
+    parser.add_argument("--codex-rate-per-minute", type=float, default=None, help="Host-wide limit on codex starts per minute")
+    parser.add_argument("--codex-burst", type=int, default=None, help="Codex starts allowed back-to-back")
+    parser.add_argument("--rate-limit-file", default=None, help="Lock file shared by the rate limiter")
+    parser.add_argument("--cpu-seconds", type=int, default=None, help="CPU-time limit for each codex step")
+    parser.add_argument("--memory-mb", type=int, default=None, help="Address-space limit for each codex step")
     parser.add_argument("--max-steps", type=int, default=None, help="Maximum steps to execute in this run")
     parser.add_argument(
         "--retry-on-timeout",
@@ -128,55 +219,74 @@ def main() -> int:
         help="Retry a step with a larger timeout when a timeout occurs",
     )
     parser.add_argument("--timeout-max", type=int, default=1200, help="Maximum timeout for retries (seconds)")
+    parser.add_argument(
+        "--transient-restarts",
+        type=int,
+        default=2,
+        help="Re-run a step this many times after auto_orchestrate gives up on transient failures",
+    )
+    parser.add_argument("--transient-backoff", type=float, default=60.0, help="Base backoff before a transient restart (seconds)")
 
     args = parser.parse_args()
 
     if args.resume:
         run_dir = Path(args.resume)
-        if not run_dir.exists():
+        if not run_dir.exists() and not run_archive.RunView(run_dir).archived:
             print(f"resume directory not found: {run_dir}", file=sys.stderr)
             return 1
+        run_dir.mkdir(parents=True, exist_ok=True)
+        run_archive.RunView(run_dir).restore("auto_continue.log")
     else:
         run_dir = Path(args.out) if args.out else Path("runs") / dt.datetime.now().strftime("%Y%m%d-%H%M%S")
         run_dir.mkdir(parents=True, exist_ok=True)
 
-    runlog = run_dir / "runlog.md"
     auto_log = run_dir / "auto_continue.log"
     append_log(auto_log, f"== Auto continue start: {dt.datetime.now().isoformat()} ==")
 
     executed = 0
+    transient_restarts = 0
     if args.timeout_seconds is not None:
         current_timeout = args.timeout_seconds
     else:
         current_timeout = 180 if args.avoid_timeout else 300
     while True:
-        sequence = parse_sequence(runlog)
+        # Re-read every round: the orchestrator may have rewritten the run's files.
+        view = run_archive.RunView(run_dir)
+        sequence = parse_sequence(view)
         if not sequence and args.sequence:
             sequence = [s.strip() for s in args.sequence.split(",") if s.strip()]
         if not sequence:
             print("sequence not found; run orchestrator first or provide --sequence", file=sys.stderr)
             return 1
 
-        next_step = find_next_step(run_dir, sequence)
+        next_step = find_next_step(view, sequence)
         if next_step > len(sequence):
             append_log(auto_log, "All steps completed.")
             break
 
         cmd = build_base_cmd(args, run_dir, next_step, current_timeout)
         append_log(auto_log, f"step {next_step}/{len(sequence)}: {' '.join(cmd)}")
-        result = subprocess.run(cmd)
-        append_log(auto_log, f"exit code: {result.returncode}")
+        returncode = run_child(cmd)
+        append_log(auto_log, f"exit code: {returncode}")
 
-        if result.returncode != 0:
-            if result.returncode == 2 and args.retry_on_timeout:
+        if returncode != 0:
+            if returncode == 2 and args.retry_on_timeout:
                 if current_timeout < args.timeout_max:
                     current_timeout = min(args.timeout_max, current_timeout * 2)
                     append_log(auto_log, f"Timeout detected; retrying with timeout {current_timeout}s.")
                     continue
+            if returncode == TRANSIENT_EXIT_CODE and transient_restarts < args.transient_restarts:
+                # Full jitter so orchestrators that failed together do not come back together.
+                delay = random.uniform(0, args.transient_backoff * 2**transient_restarts)
+                transient_restarts += 1
+                append_log(auto_log, f"Transient failure; restarting step in {delay:.1f}s ({transient_restarts}/{args.transient_restarts}).")
+                time.sleep(delay)
+                continue
             append_log(auto_log, "Stopping due to non-zero exit code.")
-            return result.returncode
+            return returncode
 
         executed += 1
+        transient_restarts = 0
         if args.max_steps is not None and executed >= args.max_steps:
             append_log(auto_log, f"Reached max steps: {args.max_steps}")
             break
@@ -9,16 +9,25 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import atexit
 import datetime as dt
+import fcntl
 import json
 import os
+import random
 import re
+import resource
 import shutil
+import signal
 import subprocess
 import sys
+import tempfile
 import time
 from pathlib import Path
 
+import run_archive
+
 DEFAULT_SEQUENCE = [
     "webapp-orchestrator",
     "webapp-researcher",
@@ -32,6 +41,44 @@ DEFAULT_AVOID_TIMEOUT_SECONDS = 180
 LOG_TAIL_CHARS = 4000
 REVIEWER_SKILL = "webapp-reviewer"
 REVIEWER_LITE_SKILL = "webapp-reviewer-lite"
+REVIEWER_SKILLS = (REVIEWER_LITE_SKILL, REVIEWER_SKILL)
+# Largest diff pasted into a reviewer prompt; the full diff stays in NN-skill.diff.
+REVIEW_DIFF_MAX_CHARS = 60000
+# Seconds between SIGTERM and SIGKILL when stopping a step's process group.
+KILL_GRACE_SECONDS = 5
+HEDGE_PERCENTILE = 90
+PLAN_DRAWS = 2000
+PLAN_MIN_FIT_SAMPLES = 5
+PLAN_TIMEOUT_CANDIDATES = [60, 90, 120, 180, 240, 300, 450, 600, 900, 1200]
+STABLE_PREFIX_BRIEF_REF = "（冒頭のプロジェクト概要を参照）"
+STABLE_PREFIX_HANDOFF_REF = "（これまでの成果物 {n} の「次の入力プロンプト（コピペ用）」に従って作業してください）"
+# Exit code for a step that kept failing transiently after all retries.
+TRANSIENT_EXIT_CODE = 3
+# Prefix of codex's own error lines ("ERROR: ...", "[ts] ERROR: ...", "ERROR codex_core::x: ...").
+CODEX_ERROR_LINE = re.compile(
+    r"^(?:\[[^\]]*\]\s*|\d{4}-\d\d-\d\dT\S+\s+)?(?:ERROR|[Ee]rror)\b(?:\s+[\w:]+)?\s*:\s*(?P<message>.*)$"
+)
+# Starts of codex error messages worth retrying (rate limits, overload, network).
+# Matched at the start of the message only: the agent's transcript talks about
+# 500s and timeouts too, and those are not failures of the step.
+TRANSIENT_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"stream (disconnected|error)\b",
+        r"exceeded retry limit\b",
+        r"(unexpected )?status:? (429|500|502|503|504)\b",
+        r"(429|500|502|503|504) [A-Z]",
+        r"rate.?limit",
+        r"too many requests\b",
+        r"(model |server |service )?(is )?overloaded\b",
+        r"(service|server) (temporarily )?unavailable\b",
+        r"connection (reset|refused|closed|error)\b",
+        r"(request|connection|operation) timed out\b",
+        r"(ECONNRESET|ETIMEDOUT|EAI_AGAIN)\b",
+    )
+]
+WORKSPACE_FILE = "workspace.json"
+DEFAULT_RATE_LIMIT_FILE = Path(tempfile.gettempdir()) / "auto_orchestrate-codex.bucket"
 
 
 def read_text(path: Path) -> str:
@@ -129,9 +176,15 @@ def has_handoff_markers(text: str) -> bool:
     return "次の担当:" in text or "引き継ぎパケット" in text
 
 
-def select_output_content(out_file: Path, response_file: Path) -> tuple[str, Path | None]:
-    out_text = read_text(out_file) if out_file.exists() else ""
-    resp_text = read_text(response_file) if response_file.exists() else ""
+def select_output_content(
+    out_file: Path, response_file: Path, view: run_archive.RunView | None = None
+) -> tuple[str, Path | None]:
+    if view is not None:
+        out_text = view.read_text(out_file.name) if view.exists(out_file.name) else ""
+        resp_text = view.read_text(response_file.name) if view.exists(response_file.name) else ""
+    else:
+        out_text = read_text(out_file) if out_file.exists() else ""
+        resp_text = read_text(response_file) if response_file.exists() else ""
     if out_text and has_handoff_markers(out_text):
         return out_text, out_file
     if resp_text and has_handoff_markers(resp_text):
@@ -174,9 +227,25 @@ def find_prompt(outputs: list[str], target_skill: str) -> str | None:
     return None
 
 
+def find_handoff_ref(outputs: list[str], target_skill: str) -> str | None:
+    """Like find_prompt, but points at the handoff inside the shared prefix instead of repeating it."""
+    for n in range(len(outputs), 0, -1):
+        if extract_prompt(outputs[n - 1], target_skill):
+            return f"[{target_skill}]\n{STABLE_PREFIX_HANDOFF_REF.format(n=n)}\n"
+    return None
+
+
 def build_initial_prompt(skill: str, brief: str) -> str:
     return f"[{skill}]\n{PROMPT_HEADER}# プロジェクト概要\n{brief.strip()}\n"
 
+
+def build_first_prompt(skill: str, brief: str, sequence: list[str], sequence_from_output: bool) -> str:
+    if skill == "webapp-orchestrator" and not sequence_from_output:
+        prompt = build_orchestrator_prompt(brief, sequence)
+    else:
+        prompt = build_initial_prompt(skill, brief)
+    return append_orchestrator_requirements(prompt, sequence)
+
 def build_orchestrator_prompt(brief: str, sequence: list[str]) -> str:
     roles = [s for s in sequence if s != "webapp-orchestrator"]
     packets: list[str] = []
@@ -245,6 +314,52 @@ def build_fallback_prompt(skill: str, brief: str, last_output: str | None) -> st
         parts.append("\n# 直前の成果物\n" + last_output.strip())
     return "\n".join(parts) + "\n"
 
+def build_shared_prefix(brief: str, outputs: list[str]) -> str:
+    """Canonical prompt prefix: shared instructions, the brief, then earlier outputs in step order.
+
+    Each step's prefix extends the previous step's byte for byte, so backend
+    prefix caching can reuse everything up to the step-specific suffix.
+    """
+    parts = [PROMPT_HEADER.strip(), "# プロジェクト概要", brief.strip()]
+    for n, content in enumerate(outputs, 1):
+        if content.strip():
+            parts.append(f"# これまでの成果物 {n}\n{content.strip()}")
+    return "\n\n".join(parts) + "\n\n"
+
+
+def assemble_prompt(prefix: str, step_prompt: str) -> str:
+    return f"{prefix}# 今回の担当\n{step_prompt.strip()}\n"
+
+
+def common_prefix_len(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def shared_prefix_bytes(prompt: str, view: run_archive.RunView, step_no: int) -> int:
+    """UTF-8 bytes of the longest prefix this prompt shares with an earlier step's prompt in the run.
+
+    Bytes rather than characters: the briefs are mostly Japanese, and backend
+    prefix caches count what is sent, not code points.
+    """
+    best = 0
+    for name in view.names():
+        head = name.split("-", 1)[0]
+        if name.endswith(".prompt.md") and head.isdigit() and int(head) < step_no:
+            best = max(best, common_prefix_len(prompt, view.read_text(name)))
+    return len(prompt[:best].encode("utf-8"))
+
+
+def step_config_overrides(args: argparse.Namespace, skill: str) -> list[str]:
+    config_overrides = list(args.codex_config or [])
+    if args.avoid_timeout and skill == "webapp-implementer":
+        config_overrides.append("model_reasoning_effort=low")
+    return config_overrides
+
+
 def apply_auto_reviewer(sequence: list[str], auto_reviewer: bool) -> list[str]:
     if not auto_reviewer:
         return sequence
@@ -264,16 +379,323 @@ def apply_auto_reviewer(sequence: list[str], auto_reviewer: bool) -> list[str]:
     return updated
 
 
-def run_codex(
-    prompt: str,
+def error_messages(stdout: str | bytes | None, stderr: str | bytes | None) -> list[str]:
+    """Error messages of a failed codex run: its stderr lines, and codex ERROR lines on stdout.
+
+    The rest of stdout is the agent's transcript and is never classified.
+    """
+    messages: list[str] = []
+    for line in (tail_text(stderr) or "").splitlines():
+        match = CODEX_ERROR_LINE.match(line.strip())
+        messages.append(match.group("message") if match else line.strip())
+    for line in (tail_text(stdout) or "").splitlines():
+        match = CODEX_ERROR_LINE.match(line.strip())
+        if match:
+            messages.append(match.group("message"))
+    return messages
+
+
+def classify_failure(stdout: str | bytes | None, stderr: str | bytes | None) -> str:
+    """Return "transient" when codex reported a retryable API/network failure, else "fatal"."""
+    for message in error_messages(stdout, stderr):
+        if any(pattern.match(message) for pattern in TRANSIENT_PATTERNS):
+            return "transient"
+    return "fatal"
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: random.Random | None = None) -> float:
+    # Full jitter: spreads out orchestrators that failed at the same moment.
+    return (rng or random).uniform(0, min(cap, base * 2**attempt))
+
+
+class TokenBucket:
+    """Host-wide limit on codex starts, shared through a lock file.
+
+    Every orchestrator on the host refills and takes tokens from the same JSON
+    state under an exclusive flock, so `rate_per_minute` holds across processes.
+    """
+
+    def __init__(self, path: Path, rate_per_minute: float, burst: int) -> None:
+        self.path = path
+        self.rate = rate_per_minute / 60
+        self.burst = max(1, burst)
+
+    def try_take(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                state = json.loads(f.read() or "{}")
+            except json.JSONDecodeError:
+                state = {}
+            now = time.time()
+            tokens = float(state.get("tokens", self.burst))
+            updated = float(state.get("updated", now))
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps({"tokens": tokens, "updated": now}))
+            return wait
+
+    def acquire(self) -> float:
+        """Block until a token is taken; returns the seconds spent waiting."""
+        waited = 0.0
+        while (wait := self.try_take()) > 0:
+            # Small jitter so waiters do not all wake on the same tick.
+            wait += random.uniform(0, 0.25)
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+
+def run_git(cd: Path, *args: str, env: dict | None = None) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(["git", "-C", str(cd), *args], capture_output=True, text=True, env=env)
+
+
+def snapshot_tree(cd: Path) -> str | None:
+    """Tree id of the working tree (tracked and untracked, minus ignored files), or None outside git.
+
+    Uses a throwaway copy of the index so the user's staging area is untouched;
+    copying it keeps the stat cache, so only changed files are re-hashed.
+    """
+    index = run_git(cd, "rev-parse", "--git-path", "index")
+    if index.returncode != 0:
+        return None
+    index_path = Path(index.stdout.strip())
+    if not index_path.is_absolute():
+        index_path = cd / index_path
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_index = Path(tmp) / "index"
+        if index_path.exists():
+            shutil.copyfile(index_path, tmp_index)
+        env = {**os.environ, "GIT_INDEX_FILE": str(tmp_index)}
+        if run_git(cd, "add", "-A", env=env).returncode != 0:
+            return None
+        tree = run_git(cd, "write-tree", env=env)
+    return tree.stdout.strip() if tree.returncode == 0 else None
+
+
+def record_step_changes(cd: Path, base: str, out_dir: Path, step_no: int, skill: str) -> dict | None:
+    """Diff the working tree against `base` and save NN-skill.diff / NN-skill.changes.json."""
+    head = snapshot_tree(cd)
+    if head is None:
+        return None
+    numstat = run_git(cd, "diff", "--numstat", base, head)
+    diff = run_git(cd, "diff", "--find-renames", base, head)
+    if numstat.returncode != 0 or diff.returncode != 0:
+        return None
+    files: list[dict] = []
+    for line in numstat.stdout.splitlines():
+        added, deleted, path = line.split("\t", 2)
+        files.append(
+            {
+                "path": path,
+                "added": int(added) if added.isdigit() else None,
+                "deleted": int(deleted) if deleted.isdigit() else None,
+            }
+        )
+    diff_file = out_dir / f"{step_no:02d}-{skill}.diff"
+    write_text(diff_file, diff.stdout)
+    changes = {"base": base, "head": head, "files": files, "diff": str(diff_file)}
+    write_text(out_dir / f"{step_no:02d}-{skill}.changes.json", json.dumps(changes, ensure_ascii=False, indent=2) + "\n")
+    return changes
+
+
+def load_step_changes(view: run_archive.RunView, step_no: int, skill: str) -> dict | None:
+    name = f"{step_no:02d}-{skill}.changes.json"
+    if not view.exists(name):
+        return None
+    try:
+        changes = json.loads(view.read_text(name))
+    except json.JSONDecodeError:
+        return None
+    diff_name = Path(changes["diff"]).name
+    changes["diff_text"] = view.read_text(diff_name) if view.exists(diff_name) else ""
+    return changes
+
+
+def build_review_scope(changes: dict, reviewed_skill: str) -> str:
+    diff_path = Path(changes["diff"])
+    diff = changes["diff_text"]
+    lines = [
+        "# レビュー範囲",
+        f"レビュー対象は {reviewed_skill} が行った以下の変更に限定してください。"
+        "変更外のファイルは、変更の妥当性確認に必要な場合のみ参照してください。",
+        "",
+        "## 変更ファイル",
+    ]
+    if not changes["files"]:
+        lines.append("- （変更なし）")
+    for entry in changes["files"]:
+        if entry["added"] is None:
+            lines.append(f"- {entry['path']} (binary)")
+        else:
+            lines.append(f"- {entry['path']} (+{entry['added']} -{entry['deleted']})")
+    if diff:
+        lines += ["", "## 差分", "```diff"]
+        if len(diff) > REVIEW_DIFF_MAX_CHARS:
+            lines.append(diff[:REVIEW_DIFF_MAX_CHARS].rstrip())
+            lines.append(f"... (以下省略。全文: {diff_path})")
+        else:
+            lines.append(diff.rstrip())
+        lines.append("```")
+    return "\n".join(lines) + "\n"
+
+
+def git_common_dir(cd: Path) -> Path | None:
+    result = run_git(cd, "rev-parse", "--path-format=absolute", "--git-common-dir")
+    return Path(result.stdout.strip()) if result.returncode == 0 else None
+
+
+def load_workspace(view: run_archive.RunView) -> dict | None:
+    return json.loads(view.read_text(WORKSPACE_FILE)) if view.exists(WORKSPACE_FILE) else None
+
+
+def create_worktree(cd: Path, out_dir: Path, root: str | None) -> dict:
+    """Add a git worktree on a fresh branch from HEAD for this run and record it in workspace.json.
+
+    When `cd` is a subdirectory of the checkout, steps run in the same
+    subdirectory of the worktree ("workdir").
+    """
+    common = git_common_dir(cd)
+    head = run_git(cd, "rev-parse", "HEAD")
+    toplevel = run_git(cd, "rev-parse", "--show-toplevel")
+    if common is None or head.returncode != 0 or toplevel.returncode != 0:
+        raise RuntimeError(f"--workspace worktree needs a git checkout with at least one commit: {cd}")
+    subdir = cd.resolve().relative_to(Path(toplevel.stdout.strip()).resolve())
+    source_branch = run_git(cd, "rev-parse", "--abbrev-ref", "HEAD").stdout.strip()
+    name = out_dir.resolve().name
+    # Inside the common git dir by default, so worktrees never show up in `git status`.
+    path = (Path(root) if root else common / "orchestrate-worktrees") / name
+    branch = f"orchestrate/{name}"
+    result = run_git(cd, "worktree", "add", "-b", branch, str(path), head.stdout.strip())
+    if result.returncode != 0:
+        raise RuntimeError(f"git worktree add failed: {result.stderr.strip()}")
+    workspace = {
+        "mode": "worktree",
+        "path": str(path),
+        "workdir": str(path / subdir),
+        "branch": branch,
+        "base": head.stdout.strip(),
+        "source": str(cd.resolve()),
+        "source_branch": source_branch,
+    }
+    write_text(out_dir / WORKSPACE_FILE, json.dumps(workspace, ensure_ascii=False, indent=2) + "\n")
+    return workspace
+
+
+def create_hedge_worktree(cd: Path, base_tree: str, name: str, root: str | None) -> dict | None:
+    """Throwaway detached worktree holding `base_tree`, so a hedge attempt never writes into `cd`.
+
+    `base_tree` is the snapshot_tree of `cd` taken before the primary attempt
+    started, so the hedge sees exactly what the primary saw. Returns None
+    outside git.
+    """
+    common = git_common_dir(cd)
+    toplevel = run_git(cd, "rev-parse", "--show-toplevel")
+    if common is None or toplevel.returncode != 0:
+        return None
+    subdir = cd.resolve().relative_to(Path(toplevel.stdout.strip()).resolve())
+    path = (Path(root) if root else common / "orchestrate-worktrees") / name
+    result = run_git(cd, "worktree", "add", "--detach", str(path), "HEAD")
+    if result.returncode != 0:
+        raise RuntimeError(f"git worktree add failed: {result.stderr.strip()}")
+    result = run_git(path, "read-tree", "-u", "--reset", base_tree)
+    if result.returncode != 0:
+        run_git(cd, "worktree", "remove", "--force", str(path))
+        raise RuntimeError(f"git read-tree in {path} failed: {result.stderr.strip()}")
+    return {"path": str(path), "workdir": str(path / subdir)}
+
+
+def adopt_hedge_tree(hedge_workspace: dict, cd: Path) -> None:
+    """Make `cd`'s checkout match the winning hedge's tree, undoing whatever the cancelled primary wrote."""
+    target = snapshot_tree(Path(hedge_workspace["path"]))
+    current = snapshot_tree(cd)
+    toplevel = run_git(cd, "rev-parse", "--show-toplevel")
+    if target is None or current is None or toplevel.returncode != 0:
+        raise RuntimeError(f"cannot snapshot the hedge worktree {hedge_workspace['path']} or {cd}")
+    if target == current:
+        return
+    diff = run_git(cd, "diff", "--binary", current, target)
+    if diff.returncode != 0:
+        raise RuntimeError(f"git diff for the hedge's changes failed: {diff.stderr.strip()}")
+    applied = subprocess.run(
+        ["git", "-C", toplevel.stdout.strip(), "apply", "-"], input=diff.stdout, capture_output=True, text=True
+    )
+    if applied.returncode != 0:
+        raise RuntimeError(f"applying the hedge's changes to {cd} failed: {applied.stderr.strip()}")
+
+
+def remove_hedge_worktree(hedge_workspace: dict, cd: Path) -> None:
+    run_git(cd, "worktree", "remove", "--force", hedge_workspace["path"])
+
+
+def merge_back_workspace(workspace: dict, run_name: str) -> tuple[str, str]:
+    """Commit the worktree and merge its branch into the source checkout.
+
+    Returns (status, detail) with status "merged", "no-changes", "skipped",
+    "conflict" or "failed". Merges from concurrent runs are serialised with a
+    lock in the common git dir. The merge is skipped when the source checkout
+    is no longer on the branch the worktree came from or has local changes;
+    on skip, conflict or failure the worktree/branch are kept.
+    """
+    path = Path(workspace["path"])
+    source = Path(workspace["source"])
+    branch = workspace["branch"]
+    run_git(path, "add", "-A")
+    if run_git(path, "diff", "--cached", "--quiet").returncode != 0:
+        commit = run_git(path, "commit", "-q", "-m", f"auto_orchestrate: changes from run {run_name}")
+        if commit.returncode != 0:
+            return "failed", f"commit in {path} failed: {commit.stderr.strip()}"
+    if run_git(source, "rev-list", "--count", f"{workspace['base']}..{branch}").stdout.strip() == "0":
+        status, detail = "no-changes", ""
+    else:
+        common = git_common_dir(source) or path
+        with (common / "orchestrate-merge.lock").open("a", encoding="utf-8") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            current = run_git(source, "rev-parse", "--abbrev-ref", "HEAD").stdout.strip()
+            expected = workspace.get("source_branch")
+            if expected and current != expected:
+                return "skipped", f"{source} is on {current}, not {expected}; merge {branch} by hand"
+            dirty = run_git(source, "status", "--porcelain")
+            if dirty.returncode != 0 or dirty.stdout.strip():
+                return "skipped", f"{source} has local changes; merge {branch} by hand\n{dirty.stdout.strip()}"
+            merge = run_git(source, "merge", "--no-ff", "-m", f"auto_orchestrate: merge run {run_name}", branch)
+            if merge.returncode != 0:
+                # Only a merge that actually started (MERGE_HEAD) is a conflict to abort.
+                if run_git(source, "rev-parse", "-q", "--verify", "MERGE_HEAD").returncode == 0:
+                    run_git(source, "merge", "--abort")
+                    return "conflict", (merge.stdout + merge.stderr).strip()
+                return "failed", (merge.stdout + merge.stderr).strip()
+        status, detail = "merged", merge.stdout.strip()
+    run_git(source, "worktree", "remove", "--force", str(path))
+    run_git(source, "branch", "-D" if status == "no-changes" else "-d", branch)
+    return status, detail
+
+
+class StepCancelled(Exception):
+    """The step was interrupted by SIGINT/SIGTERM; its process group has been stopped."""
+
+    def __init__(self, signum: int) -> None:
+        super().__init__(signal.Signals(signum).name)
+        self.signum = signum
+
+
+def build_codex_cmd(
     out_file: Path,
     model: str | None,
     sandbox: str | None,
     full_auto: bool,
     cd: Path,
-    timeout_seconds: int | None,
     config_overrides: list[str] | None,
-) -> subprocess.CompletedProcess[str]:
+) -> list[str]:
     cmd = ["codex", "exec", "-C", str(cd), "--output-last-message", str(out_file)]
     if config_overrides:
         for item in config_overrides:
@@ -284,15 +706,562 @@ def run_codex(
         cmd += ["-s", sandbox]
     if full_auto:
         cmd.append("--full-auto")
+    return cmd
+
+
+def make_limits_hook(cpu_seconds: int | None, memory_mb: int | None):
+    if cpu_seconds is None and memory_mb is None:
+        return None
 
-    return subprocess.run(
+    def apply_limits() -> None:
+        # Runs in the child between fork and exec; limits are inherited by everything codex spawns.
+        if cpu_seconds is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + KILL_GRACE_SECONDS))
+        if memory_mb is not None:
+            limit = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    return apply_limits
+
+
+async def terminate_process_group(proc: asyncio.subprocess.Process, grace: float = KILL_GRACE_SECONDS) -> None:
+    # The child leads its own session, so its pid is also the process group id.
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(wait_exited(proc), grace)
+            return
+        except asyncio.TimeoutError:
+            continue
+
+
+def reap_process_group(pgid: int, grace: float = KILL_GRACE_SECONDS) -> None:
+    """Stop whatever is left in a step's process group once its leader has exited."""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(pgid, sig)
+        except ProcessLookupError:
+            return
+        deadline = time.monotonic() + grace
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            try:
+                os.killpg(pgid, 0)
+            except ProcessLookupError:
+                return
+
+
+def kill_popen_group(proc: subprocess.Popen, grace: float = KILL_GRACE_SECONDS) -> None:
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            proc.wait(grace)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def start_warm_codex(cmd: list[str], cpu_seconds: int | None = None, memory_mb: int | None = None) -> subprocess.Popen:
+    """Start `codex exec` ahead of its step; it pays its start-up cost and then blocks reading the prompt."""
+    return subprocess.Popen(
         cmd,
-        input=prompt,
-        text=True,
-        capture_output=True,
-        timeout=timeout_seconds,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+        preexec_fn=make_limits_hook(cpu_seconds, memory_mb),
     )
 
+
+def discard_warm_codex(slot: dict) -> None:
+    proc = slot.pop("proc", None)
+    if proc is not None and proc.poll() is None:
+        # It has not been given a prompt yet, so there is no work to lose.
+        kill_popen_group(proc, grace=0)
+        proc.communicate()
+
+
+def take_warm_codex(slot: dict, cmd: list[str]) -> subprocess.Popen | None:
+    """Return the pre-started process if it was started for exactly `cmd` and is still waiting."""
+    proc = slot.get("proc")
+    if proc is not None and proc.args == cmd and proc.poll() is None:
+        del slot["proc"]
+        return proc
+    discard_warm_codex(slot)
+    return None
+
+
+async def run_warm_codex_async(proc: subprocess.Popen, prompt: str, timeout_seconds: int | None) -> subprocess.CompletedProcess[str]:
+    """Feed the prompt to a pre-started codex and wait for it, with run_codex_async's timeout/cancel semantics."""
+    try:
+        stdout, stderr = await asyncio.to_thread(proc.communicate, prompt.encode("utf-8"), timeout_seconds)
+    except subprocess.TimeoutExpired:
+        await asyncio.to_thread(kill_popen_group, proc)
+        stdout, stderr = await asyncio.to_thread(proc.communicate)
+        raise subprocess.TimeoutExpired(proc.args, timeout_seconds, output=stdout, stderr=stderr) from None
+    except BaseException:
+        kill_popen_group(proc)
+        raise
+    finally:
+        await asyncio.shield(asyncio.to_thread(reap_process_group, proc.pid))
+    return subprocess.CompletedProcess(
+        proc.args,
+        proc.returncode,
+        stdout=stdout.decode("utf-8", errors="replace"),
+        stderr=stderr.decode("utf-8", errors="replace"),
+    )
+
+
+async def wait_exited(proc: asyncio.subprocess.Process) -> int:
+    # Process.wait() also waits for the pipes to close, which a grandchild holding
+    # them can delay indefinitely; returncode is set as soon as the child is reaped.
+    while proc.returncode is None:
+        await asyncio.sleep(0.05)
+    return proc.returncode
+
+
+async def read_stream(stream: asyncio.StreamReader | None, sink: bytearray) -> None:
+    if stream is None:
+        return
+    while chunk := await stream.read(65536):
+        sink.extend(chunk)
+
+
+async def run_codex_async(
+    prompt: str,
+    out_file: Path,
+    model: str | None,
+    sandbox: str | None,
+    full_auto: bool,
+    cd: Path,
+    timeout_seconds: int | None,
+    config_overrides: list[str] | None,
+    *,
+    cpu_seconds: int | None = None,
+    memory_mb: int | None = None,
+    rate_limit: TokenBucket | None = None,
+    warm: subprocess.Popen | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """Run one `codex exec` in its own process group.
+
+    On every exit path the whole group (codex and anything it started) is
+    stopped before returning, so the step's cores are freed immediately and no
+    child outlives its step. The timeout also covers children that keep
+    codex's stdout/stderr open after codex itself has exited.
+    Raises subprocess.TimeoutExpired with the captured output on timeout.
+    `warm` is a process from start_warm_codex() for this exact command.
+    """
+    cmd = build_codex_cmd(out_file, model, sandbox, full_auto, cd, config_overrides)
+    if warm is not None:
+        return await run_warm_codex_async(warm, prompt, timeout_seconds)
+    if rate_limit is not None:
+        await asyncio.to_thread(rate_limit.acquire)
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+        preexec_fn=make_limits_hook(cpu_seconds, memory_mb),
+    )
+    stdout = bytearray()
+    stderr = bytearray()
+    readers = asyncio.gather(read_stream(proc.stdout, stdout), read_stream(proc.stderr, stderr))
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout_seconds is None else loop.time() + timeout_seconds
+    try:
+        if proc.stdin is not None:
+            proc.stdin.write(prompt.encode("utf-8"))
+            try:
+                await proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            proc.stdin.close()
+        await asyncio.wait_for(wait_exited(proc), timeout_seconds)
+        # A grandchild that inherited the pipes keeps them open past codex's
+        # exit; give it a grace period, then stop the group so the pipes close.
+        remaining = KILL_GRACE_SECONDS if deadline is None else max(0.0, min(KILL_GRACE_SECONDS, deadline - loop.time()))
+        try:
+            await asyncio.wait_for(asyncio.shield(readers), remaining)
+        except asyncio.TimeoutError:
+            await asyncio.to_thread(reap_process_group, proc.pid)
+            try:
+                await asyncio.wait_for(readers, KILL_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    except asyncio.TimeoutError:
+        await terminate_process_group(proc)
+        await asyncio.to_thread(reap_process_group, proc.pid)
+        try:
+            await asyncio.wait_for(readers, KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        raise subprocess.TimeoutExpired(cmd, timeout_seconds, output=bytes(stdout), stderr=bytes(stderr)) from None
+    except BaseException:
+        await asyncio.shield(terminate_process_group(proc))
+        readers.cancel()
+        raise
+    finally:
+        await asyncio.shield(asyncio.to_thread(reap_process_group, proc.pid))
+    return subprocess.CompletedProcess(
+        cmd,
+        proc.returncode,
+        stdout=stdout.decode("utf-8", errors="replace"),
+        stderr=stderr.decode("utf-8", errors="replace"),
+    )
+
+
+async def supervise(coro):
+    """Await `coro`, turning SIGINT/SIGTERM into cancellation of the running step."""
+    loop = asyncio.get_running_loop()
+    task = asyncio.ensure_future(coro)
+    received: list[int] = []
+
+    def on_signal(signum: int) -> None:
+        received.append(signum)
+        task.cancel()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, on_signal, sig)
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if received:
+            raise StepCancelled(received[0]) from None
+        raise
+    finally:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)
+
+
+def run_codex(
+    prompt: str,
+    out_file: Path,
+    model: str | None,
+    sandbox: str | None,
+    full_auto: bool,
+    cd: Path,
+    timeout_seconds: int | None,
+    config_overrides: list[str] | None,
+    *,
+    cpu_seconds: int | None = None,
+    memory_mb: int | None = None,
+    rate_limit: TokenBucket | None = None,
+    warm: subprocess.Popen | None = None,
+) -> subprocess.CompletedProcess[str]:
+    return asyncio.run(
+        supervise(
+            run_codex_async(
+                prompt,
+                out_file,
+                model,
+                sandbox,
+                full_auto,
+                cd,
+                timeout_seconds,
+                config_overrides,
+                cpu_seconds=cpu_seconds,
+                memory_mb=memory_mb,
+                rate_limit=rate_limit,
+                warm=warm,
+            )
+        )
+    )
+
+
+def load_step_history(runs_dir: Path) -> dict[str, list[dict]]:
+    """Per-skill step outcomes from runs/*/events.jsonl, including archived runs.
+
+    Each record has "outcome" (ok / timeout / failed), "elapsed",
+    "timeout_seconds" and the step's "prompt_chars" when a prompt event exists.
+    """
+    history: dict[str, list[dict]] = {}
+    for view in run_archive.run_views(runs_dir):
+        if not view.exists("events.jsonl"):
+            continue
+        prompt_chars: dict[int, int] = {}
+        for line in view.read_text("events.jsonl").splitlines():
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            kind = event.get("event")
+            if kind == "prompt":
+                prompt_chars[event.get("step")] = event.get("prompt_chars")
+            elif kind in ("ok", "timeout", "failed") and isinstance(event.get("elapsed"), (int, float)):
+                history.setdefault(event["skill"], []).append(
+                    {
+                        "outcome": kind,
+                        "elapsed": float(event["elapsed"]),
+                        "timeout_seconds": event.get("timeout_seconds"),
+                        "prompt_chars": prompt_chars.get(event.get("step")),
+                    }
+                )
+    return history
+
+
+def load_skill_durations(runs_dir: Path) -> dict[str, list[float]]:
+    """Elapsed seconds of every successful step in runs/*/events.jsonl, per skill."""
+    return {
+        skill: [record["elapsed"] for record in records if record["outcome"] == "ok"]
+        for skill, records in load_step_history(runs_dir).items()
+    }
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(-(-pct * len(ordered) // 100)) - 1))
+    return ordered[rank]
+
+
+def resolve_hedge_after(args: argparse.Namespace, skill: str, durations: dict[str, list[float]]) -> float | None:
+    if not args.hedge:
+        return None
+    if args.hedge_after_seconds is not None:
+        hedge_after = float(args.hedge_after_seconds)
+    else:
+        samples = durations.get(skill, [])
+        if len(samples) < args.hedge_min_samples:
+            return None
+        hedge_after = percentile(samples, HEDGE_PERCENTILE)
+    if args.timeout_seconds is not None and hedge_after >= args.timeout_seconds:
+        return None
+    return hedge_after
+
+
+async def run_hedged_async(
+    prompt: str,
+    response_file: Path,
+    hedge_response_file: Path,
+    *,
+    primary: dict,
+    hedge: dict,
+    timeout_seconds: int | None,
+    hedge_after: float | None,
+    is_valid,
+    prepare_hedge=None,
+) -> tuple[subprocess.CompletedProcess[str], dict]:
+    """Start `primary`; if it outlives `hedge_after`, race a second attempt against it.
+
+    The first attempt that exits 0 with output accepted by `is_valid(path)` wins
+    and the other is cancelled (its process group is stopped). Both attempts
+    share the step's overall timeout. `prepare_hedge()`, when given, runs just
+    before the hedge starts and returns overrides for it (its own "cd"), so the
+    two attempts never write into the same tree. Returns the winning result and
+    a summary for events.jsonl; the winner's output is left in `response_file`.
+    """
+    started = time.monotonic()
+    tasks = {asyncio.ensure_future(run_codex_async(prompt, response_file, timeout_seconds=timeout_seconds, **primary)): "primary"}
+    done, _ = await asyncio.wait(set(tasks), timeout=hedge_after)
+    if done:
+        return next(iter(done)).result(), {"hedged": False, "winner": "primary"}
+
+    if prepare_hedge is not None:
+        hedge = {**hedge, **await asyncio.to_thread(prepare_hedge)}
+    remaining = None if timeout_seconds is None else max(1, int(timeout_seconds - (time.monotonic() - started)))
+    tasks[asyncio.ensure_future(run_codex_async(prompt, hedge_response_file, timeout_seconds=remaining, **hedge))] = "hedge"
+    summary: dict = {"hedged": True, "hedge_started_after": round(time.monotonic() - started, 3), "winner": None}
+    outputs = {"primary": response_file, "hedge": hedge_response_file}
+    finished: dict[str, asyncio.Future] = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                finished[name] = task
+                if task.exception() is None and task.result().returncode == 0 and is_valid(outputs[name]):
+                    summary["winner"] = name
+                    break
+            if summary["winner"]:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    summary["cancelled"] = [tasks[task] for task in pending]
+    summary["elapsed"] = round(time.monotonic() - started, 3)
+
+    winner = summary["winner"] or "primary"
+    task = finished.get(winner) or finished.get("hedge")
+    if summary["winner"] == "hedge":
+        write_text(response_file, read_text(hedge_response_file))
+    # No valid attempt: surface the primary's own outcome (failure or TimeoutExpired).
+    return task.result(), summary
+
+
+def backoff_sleep(delay: float) -> None:
+    """Sleep before a retry; SIGINT/SIGTERM raise StepCancelled like a running step."""
+    asyncio.run(supervise(asyncio.sleep(delay)))
+
+
+def run_codex_hedged(prompt: str, response_file: Path, hedge_response_file: Path, **kwargs) -> tuple[subprocess.CompletedProcess[str], dict]:
+    return asyncio.run(supervise(run_hedged_async(prompt, response_file, hedge_response_file, **kwargs)))
+
+
+def prompt_scale(records: list[dict], prompt_chars: int | None) -> float:
+    """Duration multiplier for a prompt of `prompt_chars`, from a least-squares fit of elapsed on prompt size."""
+    points = [(r["prompt_chars"], r["elapsed"]) for r in records if r["outcome"] == "ok" and r["prompt_chars"]]
+    if prompt_chars is None or len(points) < PLAN_MIN_FIT_SAMPLES:
+        return 1.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0 or mean_y <= 0:
+        return 1.0
+    slope = max(0.0, sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x)
+    predicted = mean_y + slope * (prompt_chars - mean_x)
+    return min(2.0, max(0.5, predicted / mean_y))
+
+
+def timeout_ladder_cost(duration: float, timeout_seconds: float, timeout_max: float) -> tuple[float, int, bool]:
+    """Wall-clock, retries and whether the step is given up under auto_continue's timeout doubling."""
+    cost = 0.0
+    retries = 0
+    timeout = timeout_seconds
+    while duration > timeout:
+        cost += timeout
+        if timeout >= timeout_max:
+            return cost, retries, True
+        timeout = min(timeout_max, timeout * 2)
+        retries += 1
+    return cost + duration, retries, False
+
+
+def plan_pipeline(
+    sequence: list[str],
+    prompt_chars: list[int | None],
+    history: dict[str, list[dict]],
+    *,
+    timeout_seconds: float,
+    timeout_max: float,
+    runs: int,
+    concurrency: int,
+    draws: int = PLAN_DRAWS,
+    seed: int = 0,
+) -> dict:
+    """Predict per-step and whole-pipeline wall-clock from historical step outcomes.
+
+    Steps run one after another, so a run's critical path is the whole chain;
+    `runs` pipelines share `concurrency` slots. Durations are resampled from
+    history (scaled for prompt size); a timed-out sample counts as finishing
+    just after its timeout, so those estimates are lower bounds.
+    """
+    rng = random.Random(seed)
+    pooled = [record for records in history.values() for record in records]
+    steps: list[dict] = []
+    for n, (skill, chars) in enumerate(zip(sequence, prompt_chars), 1):
+        records = history.get(skill) or pooled
+        scale = prompt_scale(records, chars)
+        samples: list[float] = []
+        fatal = 0
+        for record in records:
+            if record["outcome"] == "ok":
+                samples.append(record["elapsed"] * scale)
+            elif record["outcome"] == "timeout":
+                samples.append(float(record["timeout_seconds"] or record["elapsed"]) * 1.01)
+            else:
+                fatal += 1
+        if not samples:
+            # No history at all: assume every step uses its whole first timeout.
+            samples = [float(timeout_seconds)]
+        outcomes = [timeout_ladder_cost(d, timeout_seconds, timeout_max) for d in samples]
+        steps.append(
+            {
+                "step": n,
+                "skill": skill,
+                "prompt_chars": chars,
+                "samples": len(history.get(skill, [])),
+                "pooled": skill not in history,
+                "p50": percentile(samples, 50),
+                "p90": percentile(samples, 90),
+                "expected_seconds": sum(cost for cost, _, _ in outcomes) / len(outcomes),
+                "expected_retries": sum(retries for _, retries, _ in outcomes) / len(outcomes),
+                "p_timeout_first": sum(1 for d in samples if d > timeout_seconds) / len(samples),
+                "p_give_up": sum(1 for _, _, gave_up in outcomes if gave_up) / len(outcomes),
+                "p_fatal": fatal / len(records) if records else 0.0,
+                "_costs": [cost for cost, _, _ in outcomes],
+            }
+        )
+
+    run_draws = sorted(sum(rng.choice(step["_costs"]) for step in steps) for _ in range(draws))
+    makespans: list[float] = []
+    for _ in range(max(1, draws // 10)):
+        slots = [0.0] * max(1, concurrency)
+        for _ in range(runs):
+            slot = slots.index(min(slots))
+            slots[slot] += rng.choice(run_draws)
+        makespans.append(max(slots))
+    success = 1.0
+    for step in steps:
+        success *= (1 - step["p_fatal"]) * (1 - step["p_give_up"])
+        del step["_costs"]
+    return {
+        "timeout_seconds": timeout_seconds,
+        "timeout_max": timeout_max,
+        "steps": steps,
+        "run_expected_seconds": sum(step["expected_seconds"] for step in steps),
+        "run_p50_seconds": percentile(run_draws, 50),
+        "run_p90_seconds": percentile(run_draws, 90),
+        "run_success_probability": success,
+        "runs": runs,
+        "concurrency": concurrency,
+        "batch_p50_seconds": percentile(makespans, 50),
+        "batch_p90_seconds": percentile(makespans, 90),
+    }
+
+
+def suggest_timeout(sequence: list[str], prompt_chars: list[int | None], history: dict[str, list[dict]], timeout_max: float) -> float | None:
+    if not history:
+        return None
+    best: tuple[float, float] | None = None
+    for candidate in PLAN_TIMEOUT_CANDIDATES:
+        if candidate > timeout_max:
+            break
+        plan = plan_pipeline(sequence, prompt_chars, history, timeout_seconds=candidate, timeout_max=timeout_max, runs=1, concurrency=1, draws=200)
+        expected = plan["run_expected_seconds"] / max(plan["run_success_probability"], 1e-6)
+        if best is None or expected < best[0]:
+            best = (expected, candidate)
+    return best[1] if best else None
+
+
+def format_plan(plan: dict, suggested_timeout: float | None) -> str:
+    def minutes(seconds: float) -> str:
+        return f"{seconds / 60:.1f}m"
+
+    lines = [
+        f"# Plan (timeout {plan['timeout_seconds']:.0f}s, doubling to {plan['timeout_max']:.0f}s)",
+        "",
+        "| # | skill | prompt chars | history | p50 | p90 | P(timeout) | exp. retries | expected |",
+        "| - | - | - | - | - | - | - | - | - |",
+    ]
+    for step in plan["steps"]:
+        history = f"{step['samples']}" + (" (pooled)" if step["pooled"] else "")
+        lines.append(
+            f"| {step['step']} | {step['skill']} | {step['prompt_chars'] if step['prompt_chars'] is not None else '-'} | "
+            f"{history} | {step['p50']:.0f}s | {step['p90']:.0f}s | {step['p_timeout_first']:.0%} | "
+            f"{step['expected_retries']:.2f} | {step['expected_seconds']:.0f}s |"
+        )
+    lines += [
+        "",
+        f"- Run (critical path): expected {minutes(plan['run_expected_seconds'])}, "
+        f"p50 {minutes(plan['run_p50_seconds'])}, p90 {minutes(plan['run_p90_seconds'])}",
+        f"- Run success probability: {plan['run_success_probability']:.0%}",
+        f"- Batch of {plan['runs']} on {plan['concurrency']} slot(s): "
+        f"p50 {minutes(plan['batch_p50_seconds'])}, p90 {minutes(plan['batch_p90_seconds'])}",
+    ]
+    if suggested_timeout is not None:
+        lines.append(f"- Suggested --timeout-seconds: {suggested_timeout:.0f}")
+    return "\n".join(lines) + "\n"
+
+
 def init_run_log(
     path: Path,
     *,
@@ -438,6 +1407,11 @@ def main() -> int:
     parser.add_argument("--full-auto", action="store_true", help="Enable --full-auto for codex exec")
     parser.add_argument("--out", default=None, help="Output directory (default: runs/<timestamp>)")
     parser.add_argument("--dry-run", action="store_true", help="Print prompts without running codex")
+    parser.add_argument("--plan", action="store_true", help="Predict durations, retries and batch wall-clock from runs history; runs nothing")
+    parser.add_argument("--plan-runs", type=int, default=1, help="Pipelines in the planned batch")
+    parser.add_argument("--plan-concurrency", type=int, default=1, help="Pipelines that may run at once in the planned batch")
+    parser.add_argument("--plan-timeout-max", type=int, default=1200, help="auto_continue --timeout-max assumed by the plan")
+    parser.add_argument("--plan-json", action="store_true", help="Print the plan as JSON")
     parser.add_argument("--cd", default=str(Path.cwd()), help="Working directory for codex")
     parser.add_argument("--timeout-seconds", type=int, default=None, help="Per-step timeout in seconds")
     parser.add_argument(
@@ -492,13 +1466,68 @@ def main() -> int:
         default=True,
         help="Auto insert reviewer role after implementer if missing",
     )
+    parser.add_argument(
+        "--hedge",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Start a second attempt in its own worktree when a step outlives its historical p90 duration",
+    )
+    parser.add_argument("--hedge-after-seconds", type=float, default=None, help="Hedge after N seconds instead of the p90")
+    parser.add_argument("--hedge-min-samples", type=int, default=5, help="Past runs of a skill required before hedging on p90")
+    parser.add_argument("--hedge-model", default=None, help="Codex model for the hedge attempt (default: --model)")
+    parser.add_argument(
+        "--hedge-codex-config",
+        action="append",
+        default=None,
+        help="Extra Codex config overrides for the hedge attempt (repeatable)",
+    )
+    parser.add_argument("--runs-dir", default="runs", help="Directory of past runs used for duration history")
+    parser.add_argument(
+        "--stable-prefix",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Lead every prompt with the same brief/earlier-output prefix so it can be prefix-cached",
+    )
+    parser.add_argument(
+        "--diff-scoped-review",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Give reviewer roles only the --cd changes made by the step they review",
+    )
+    parser.add_argument(
+        "--workspace",
+        choices=["shared", "worktree"],
+        default="shared",
+        help="Run codex in --cd itself, or in a per-run git worktree branched from its HEAD",
+    )
+    parser.add_argument("--workspace-root", default=None, help="Parent directory for per-run worktrees (default: <git dir>/orchestrate-worktrees)")
+    parser.add_argument("--merge-back", action="store_true", help="Merge the run's worktree branch into --cd once every step is done")
+    parser.add_argument(
+        "--warm-pool",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Start the next step's codex while the current step runs, so its start-up overlaps",
+    )
+    parser.add_argument("--max-retries", type=int, default=3, help="Retries for a step that fails transiently (rate limit, 5xx, network)")
+    parser.add_argument("--retry-base-seconds", type=float, default=5.0, help="Base delay for jittered exponential backoff")
+    parser.add_argument("--retry-max-seconds", type=float, default=120.0, help="Upper bound for a single backoff delay")
+    parser.add_argument(
+        "--codex-rate-per-minute",
+        type=float,
+        default=0,
+        help="Host-wide limit on codex starts per minute across orchestrators (0 disables)",
+    )
+    parser.add_argument("--codex-burst", type=int, default=3, help="Codex starts allowed back-to-back before the rate applies")
+    parser.add_argument("--rate-limit-file", default=str(DEFAULT_RATE_LIMIT_FILE), help="Lock file shared by the rate limiter")
+    parser.add_argument("--cpu-seconds", type=int, default=None, help="CPU-time limit (RLIMIT_CPU) for each codex step")
+    parser.add_argument("--memory-mb", type=int, default=None, help="Address-space limit (RLIMIT_AS) for each codex step")
 
     args = parser.parse_args()
     timeout_provided = args.timeout_seconds is not None
     if not timeout_provided:
         args.timeout_seconds = 300
 
-    if not shutil.which("codex"):
+    if not shutil.which("codex") and not args.plan:
         print("codex CLI not found in PATH", file=sys.stderr)
         return 1
 
@@ -525,6 +1554,29 @@ def main() -> int:
             return 1
         sequence = ["webapp-orchestrator"]
 
+    if args.plan:
+        history = load_step_history(Path(args.runs_dir))
+        # Later prompts depend on handoffs; use the skill's typical size from history.
+        prompt_chars: list[int | None] = [len(build_first_prompt(sequence[0], brief_for_prompt, sequence, args.sequence_from_output))]
+        for skill in sequence[1:]:
+            sizes = [r["prompt_chars"] for r in history.get(skill, []) if r["prompt_chars"]]
+            prompt_chars.append(int(percentile(sizes, 50)) if sizes else None)
+        plan = plan_pipeline(
+            sequence,
+            prompt_chars,
+            history,
+            timeout_seconds=args.timeout_seconds,
+            timeout_max=args.plan_timeout_max,
+            runs=args.plan_runs,
+            concurrency=args.plan_concurrency,
+        )
+        suggested = suggest_timeout(sequence, prompt_chars, history, args.plan_timeout_max)
+        if args.plan_json:
+            print(json.dumps({**plan, "suggested_timeout_seconds": suggested}, ensure_ascii=False, indent=2))
+        else:
+            print(format_plan(plan, suggested), end="")
+        return 0
+
     if args.skills_dir:
         skills_dir = Path(args.skills_dir)
     else:
@@ -539,12 +1591,19 @@ def main() -> int:
 
     if args.resume:
         out_dir = Path(args.resume)
-        if not out_dir.exists():
+        view = run_archive.RunView(out_dir)
+        if not out_dir.exists() and not view.archived:
             print(f"resume directory not found: {out_dir}", file=sys.stderr)
             return 1
+        # Packed runs resume in place: step files are read from the archive,
+        # only the logs that get appended to are copied back.
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for name in ("runlog.md", "events.jsonl"):
+            view.restore(name)
     else:
         out_dir = Path(args.out) if args.out else Path("runs") / dt.datetime.now().strftime("%Y%m%d-%H%M%S")
         out_dir.mkdir(parents=True, exist_ok=True)
+        view = run_archive.RunView(out_dir)
 
     run_log = out_dir / "runlog.md"
     events_log = out_dir / "events.jsonl"
@@ -569,13 +1628,24 @@ def main() -> int:
             )
         # Keep a copy of the brief for traceability.
         brief_copy = out_dir / "brief.md"
-        if not brief_copy.exists():
+        if not view.exists(brief_copy.name):
             write_text(brief_copy, brief)
 
     if args.start_at < 1:
         print("start-at must be >= 1", file=sys.stderr)
         return 1
 
+    skill_durations = load_skill_durations(Path(args.runs_dir)) if args.hedge else {}
+    rate_limit = (
+        TokenBucket(Path(args.rate_limit_file), args.codex_rate_per_minute, args.codex_burst)
+        if args.codex_rate_per_minute > 0
+        else None
+    )
+    # Created on the first executed step (a worktree with --workspace worktree).
+    workdir: Path | None = None
+    # Holds at most one pre-started codex for the next step (--warm-pool).
+    warm_slot: dict = {}
+    atexit.register(discard_warm_codex, warm_slot)
     outputs: list[str] = []
     executed = 0
     idx = 0
@@ -587,12 +1657,12 @@ def main() -> int:
         response_file = out_dir / f"{step_no:02d}-{skill}.response.md"
 
         if step_no < args.start_at:
-            if out_file.exists() or response_file.exists():
-                content, _ = select_output_content(out_file, response_file)
+            if view.exists(out_file.name) or view.exists(response_file.name):
+                content, _ = select_output_content(out_file, response_file, view)
                 if content:
                     outputs.append(content)
-                if not out_file.exists() and response_file.exists():
-                    write_text(out_file, read_text(response_file))
+                if not view.exists(out_file.name) and view.exists(response_file.name):
+                    write_text(out_file, view.read_text(response_file.name))
                 if args.sequence_from_output and skill == "webapp-orchestrator":
                     derived = parse_sequence_from_orchestrator(outputs[-1] if outputs else "")
                     derived = [s for s in derived if s != "webapp-orchestrator"]
@@ -617,12 +1687,12 @@ def main() -> int:
             print(f"missing output for step {step_no} to skip: {out_file}", file=sys.stderr)
             return 1
 
-        if args.resume and not args.force and (out_file.exists() or response_file.exists()):
-            content, _ = select_output_content(out_file, response_file)
+        if args.resume and not args.force and (view.exists(out_file.name) or view.exists(response_file.name)):
+            content, _ = select_output_content(out_file, response_file, view)
             if content:
                 outputs.append(content)
-            if response_file.exists() and (not out_file.exists() or args.force):
-                write_text(out_file, read_text(response_file))
+            if not view.exists(out_file.name) and view.exists(response_file.name):
+                write_text(out_file, view.read_text(response_file.name))
             if args.sequence_from_output and skill == "webapp-orchestrator":
                 derived = parse_sequence_from_orchestrator(outputs[-1] if outputs else "")
                 derived = [s for s in derived if s != "webapp-orchestrator"]
@@ -645,19 +1715,24 @@ def main() -> int:
             idx += 1
             continue
 
+        # With --stable-prefix the brief and earlier outputs live in the shared prefix.
+        step_brief = STABLE_PREFIX_BRIEF_REF if args.stable_prefix else brief_for_prompt
+        review_changes = None
+        if args.diff_scoped_review and skill in REVIEWER_SKILLS and idx > 0:
+            review_changes = load_step_changes(view, step_no - 1, sequence[idx - 1])
+            if review_changes is not None and not args.stable_prefix:
+                # The change set replaces the full brief as the reviewer's main context.
+                step_brief = summarize_brief(brief, args.short_prompt_chars)
         if step_no == 1:
-            if skill == "webapp-orchestrator" and not args.sequence_from_output:
-                prompt = build_orchestrator_prompt(brief_for_prompt, sequence)
-            else:
-                prompt = build_initial_prompt(skill, brief_for_prompt)
-            prompt = append_orchestrator_requirements(prompt, sequence)
+            prompt = build_first_prompt(skill, step_brief, sequence, args.sequence_from_output)
         else:
-            prompt = find_prompt(outputs, skill)
+            # With --stable-prefix the handoff is already in the shared prefix, inside the output that wrote it.
+            prompt = find_handoff_ref(outputs, skill) if args.stable_prefix else find_prompt(outputs, skill)
             if not prompt:
                 if args.require_handoff and not args.auto_handoff:
                     raise RuntimeError(f"handoff prompt not found for {skill}")
-                last_output = outputs[-1] if outputs else None
-                prompt = build_fallback_prompt(skill, brief_for_prompt, last_output)
+                last_output = outputs[-1] if outputs and not args.stable_prefix and review_changes is None else None
+                prompt = build_fallback_prompt(skill, step_brief, last_output)
                 append_event_log(
                     events_log,
                     {
@@ -688,32 +1763,215 @@ def main() -> int:
         if args.avoid_timeout:
             prompt = apply_timebox_instruction(prompt, skill=skill)
 
+        if review_changes is not None:
+            prompt = prompt.rstrip() + "\n\n" + build_review_scope(review_changes, sequence[idx - 1])
+        if args.stable_prefix:
+            prefix = build_shared_prefix(brief_for_prompt, outputs)
+            prompt = assemble_prompt(prefix, prompt)
         if args.dry_run:
             print(f"\n===== {skill} =====\n{prompt}\n")
             outputs.append("")
             idx += 1
             continue
         write_text(prompt_file, prompt)
+        append_event_log(
+            events_log,
+            {
+                "ts": dt.datetime.now().isoformat(),
+                "event": "prompt",
+                "step": step_no,
+                "skill": skill,
+                "prompt_chars": len(prompt),
+                "stable_prefix_bytes": len(prefix.encode("utf-8")) if args.stable_prefix else 0,
+                "shared_prefix_bytes": shared_prefix_bytes(prompt, view, step_no),
+                "review_files": len(review_changes["files"]) if review_changes is not None else None,
+            },
+        )
+
+        if workdir is None:
+            workdir = Path(args.cd)
+            if args.workspace == "worktree":
+                workspace = load_workspace(view)
+                if workspace is None:
+                    workspace = create_worktree(workdir, out_dir, args.workspace_root)
+                    append_event_log(
+                        events_log,
+                        {
+                            "ts": dt.datetime.now().isoformat(),
+                            "event": "workspace-created",
+                            "step": step_no,
+                            **workspace,
+                        },
+                    )
+                workdir = Path(workspace.get("workdir", workspace["path"]))
+
+        snapshot = None
+        if args.diff_scoped_review and idx + 1 < len(sequence) and sequence[idx + 1] in REVIEWER_SKILLS:
+            snapshot = snapshot_tree(workdir)
 
+        # Read by orchestrate_metrics.py to tell a running step from a crashed one.
+        write_text(
+            out_dir / "status.json",
+            json.dumps(
+                {
+                    "pid": os.getpid(),
+                    "step": step_no,
+                    "skill": skill,
+                    "sequence": sequence,
+                    "started_at": time.time(),
+                },
+                ensure_ascii=False,
+            )
+            + "\n",
+        )
         start_time = time.monotonic()
+        backing_off = False
         try:
-            config_overrides = list(args.codex_config or [])
-            if args.avoid_timeout and skill == "webapp-implementer":
-                config_overrides.append("model_reasoning_effort=low")
-            result = run_codex(
-                prompt,
-                response_file,
-                args.model,
-                args.sandbox,
-                args.full_auto,
-                Path(args.cd),
-                args.timeout_seconds,
-                config_overrides,
-            )
+            config_overrides = step_config_overrides(args, skill)
+            cmd = build_codex_cmd(response_file, args.model, args.sandbox, args.full_auto, workdir, config_overrides)
+            warm = take_warm_codex(warm_slot, cmd) if args.warm_pool else None
+            next_idx = idx + 1
+            if (
+                args.warm_pool
+                and next_idx < len(sequence)
+                and not (args.stop_after and executed + 1 >= args.stop_after)
+                and not (args.sequence_from_output and skill == "webapp-orchestrator")
+                and (rate_limit is None or rate_limit.try_take() == 0)
+            ):
+                # Overlap the next step's codex start-up with this step.
+                next_skill = sequence[next_idx]
+                warm_slot["proc"] = start_warm_codex(
+                    build_codex_cmd(
+                        out_dir / f"{next_idx + 1:02d}-{next_skill}.response.md",
+                        args.model,
+                        args.sandbox,
+                        args.full_auto,
+                        workdir,
+                        step_config_overrides(args, next_skill),
+                    ),
+                    args.cpu_seconds,
+                    args.memory_mb,
+                )
+            hedge_after = resolve_hedge_after(args, skill, skill_durations)
+            # A writing hedge needs its own worktree; outside git there is none to give it.
+            isolate_hedge = args.sandbox != "read-only"
+            if hedge_after is not None and isolate_hedge and git_common_dir(workdir) is None:
+                hedge_after = None
+            attempt_no = 0
+            while True:
+                start_time = time.monotonic()
+                if hedge_after is None:
+                    result = run_codex(
+                        prompt,
+                        response_file,
+                        args.model,
+                        args.sandbox,
+                        args.full_auto,
+                        workdir,
+                        args.timeout_seconds,
+                        config_overrides,
+                        cpu_seconds=args.cpu_seconds,
+                        memory_mb=args.memory_mb,
+                        rate_limit=rate_limit,
+                        warm=warm,
+                    )
+                else:
+                    needs_handoff = args.require_handoff and step_no < len(sequence)
+                    attempt = {
+                        "model": args.model,
+                        "sandbox": args.sandbox,
+                        "full_auto": args.full_auto,
+                        "cd": workdir,
+                        "config_overrides": config_overrides,
+                        "cpu_seconds": args.cpu_seconds,
+                        "memory_mb": args.memory_mb,
+                        "rate_limit": rate_limit,
+                    }
+                    hedge_attempt = {
+                        **attempt,
+                        "model": args.hedge_model or args.model,
+                        "config_overrides": config_overrides + list(args.hedge_codex_config or []),
+                    }
+                    # Taken before the primary starts: the hedge starts from the same tree.
+                    base_tree = snapshot_tree(workdir) if isolate_hedge else None
+                    hedge_workspace: dict = {}
+
+                    def prepare_hedge() -> dict:
+                        hedge_workspace.update(
+                            create_hedge_worktree(
+                                workdir, base_tree, f"{out_dir.resolve().name}-hedge-{step_no:02d}", args.workspace_root
+                            )
+                            or {}
+                        )
+                        return {"cd": Path(hedge_workspace["workdir"])} if hedge_workspace else {}
+
+                    try:
+                        result, hedge_summary = run_codex_hedged(
+                            prompt,
+                            response_file,
+                            out_dir / f"{step_no:02d}-{skill}.hedge.response.md",
+                            primary={**attempt, "warm": warm},
+                            hedge=hedge_attempt,
+                            timeout_seconds=args.timeout_seconds,
+                            # No snapshot, no separate tree: run the primary alone.
+                            hedge_after=hedge_after if base_tree or not isolate_hedge else None,
+                            is_valid=lambda path: path.exists()
+                            and bool(read_text(path).strip())
+                            and (not needs_handoff or has_handoff_markers(read_text(path))),
+                            prepare_hedge=prepare_hedge if base_tree else None,
+                        )
+                        # Keep only the winner's tree; the loser's worktree is discarded below.
+                        if hedge_summary["winner"] == "hedge" and hedge_workspace:
+                            adopt_hedge_tree(hedge_workspace, workdir)
+                    finally:
+                        if hedge_workspace:
+                            remove_hedge_worktree(hedge_workspace, workdir)
+                    if hedge_workspace:
+                        hedge_summary["hedge_workdir"] = hedge_workspace["workdir"]
+                    if hedge_summary["hedged"]:
+                        append_event_log(
+                            events_log,
+                            {
+                                "ts": dt.datetime.now().isoformat(),
+                                "event": "hedge",
+                                "step": step_no,
+                                "skill": skill,
+                                "hedge_after": hedge_after,
+                                "hedge_model": hedge_attempt["model"],
+                                "hedge_codex_config": args.hedge_codex_config or [],
+                                **hedge_summary,
+                            },
+                        )
+                warm = None
+                if result.returncode == 0 or attempt_no >= args.max_retries:
+                    break
+                if classify_failure(result.stdout, result.stderr) != "transient":
+                    break
+                delay = backoff_delay(attempt_no, args.retry_base_seconds, args.retry_max_seconds)
+                attempt_no += 1
+                error_file = write_error_log(out_dir, step_no, skill, result.stdout, result.stderr)
+                append_event_log(
+                    events_log,
+                    {
+                        "ts": dt.datetime.now().isoformat(),
+                        "event": "retry",
+                        "step": step_no,
+                        "skill": skill,
+                        "attempt": attempt_no,
+                        "returncode": result.returncode,
+                        "delay": round(delay, 3),
+                        "error_log": str(error_file) if error_file else None,
+                    },
+                )
+                print(f"transient failure in {skill}; retry {attempt_no}/{args.max_retries} in {delay:.1f}s", file=sys.stderr)
+                backing_off = True
+                backoff_sleep(delay)
+                backing_off = False
             elapsed = time.monotonic() - start_time
             if result.returncode != 0:
                 error_file = write_error_log(out_dir, step_no, skill, result.stdout, result.stderr)
-                note = f"codex exec failed with exit code {result.returncode}"
+                failure = classify_failure(result.stdout, result.stderr)
+                note = f"codex exec failed with exit code {result.returncode} ({failure}, {attempt_no} retries)"
                 append_run_log(
                     run_log,
                     idx=step_no,
@@ -735,12 +1993,14 @@ def main() -> int:
                         "skill": skill,
                         "prompt": str(prompt_file),
                         "returncode": result.returncode,
+                        "failure": failure,
+                        "retries": attempt_no,
                         "elapsed": elapsed,
                         "timeout_seconds": args.timeout_seconds,
                         "error_log": str(error_file) if error_file else None,
                     },
                 )
-                return 1
+                return TRANSIENT_EXIT_CODE if failure == "transient" else 1
             if response_file.exists() and (not out_file.exists() or args.force):
                 write_text(out_file, read_text(response_file))
             content, source_file = select_output_content(out_file, response_file)
@@ -782,6 +2042,20 @@ def main() -> int:
                     "timeout_seconds": args.timeout_seconds,
                 },
             )
+            if snapshot is not None:
+                changes = record_step_changes(workdir, snapshot, out_dir, step_no, skill)
+                if changes is not None:
+                    append_event_log(
+                        events_log,
+                        {
+                            "ts": dt.datetime.now().isoformat(),
+                            "event": "changes-recorded",
+                            "step": step_no,
+                            "skill": skill,
+                            "files": len(changes["files"]),
+                            "diff": changes["diff"],
+                        },
+                    )
         except subprocess.TimeoutExpired as exc:
             elapsed = time.monotonic() - start_time
             error_file = write_error_log(out_dir, step_no, skill, exc.stdout, exc.stderr)
@@ -813,6 +2087,38 @@ def main() -> int:
                 },
             )
             return 2
+        except StepCancelled as exc:
+            elapsed = time.monotonic() - start_time
+            if backing_off:
+                note = f"Cancelled by {exc} during retry backoff (after {attempt_no} of {args.max_retries} retries)"
+            else:
+                note = f"Cancelled by {exc}; process group stopped"
+            append_run_log(
+                run_log,
+                idx=step_no,
+                skill=skill,
+                prompt_file=prompt_file,
+                output_file=None,
+                status="cancelled",
+                note=note,
+                elapsed=elapsed,
+                timeout_seconds=args.timeout_seconds,
+            )
+            append_event_log(
+                events_log,
+                {
+                    "ts": dt.datetime.now().isoformat(),
+                    "event": "cancelled",
+                    "step": step_no,
+                    "skill": skill,
+                    "prompt": str(prompt_file),
+                    "elapsed": elapsed,
+                    "timeout_seconds": args.timeout_seconds,
+                    "signal": str(exc),
+                    "during": "backoff" if backing_off else "step",
+                },
+            )
+            return 128 + exc.signum
         except Exception as exc:  # noqa: BLE001
             elapsed = time.monotonic() - start_time
             note = f"{type(exc).__name__}: {exc}"
@@ -866,6 +2172,26 @@ def main() -> int:
 
         idx += 1
 
+    completed = all(view.exists(f"{n:02d}-{s}.md") for n, s in enumerate(sequence, 1))
+    workspace = load_workspace(view) if args.workspace == "worktree" else None
+    if args.merge_back and completed and workspace is not None and not args.dry_run:
+        status, detail = merge_back_workspace(workspace, out_dir.name)
+        with run_log.open("a", encoding="utf-8") as f:
+            f.write(f"\n## Merge-back\n- Branch: {workspace['branch']}\n- Status: {status}\n")
+        append_event_log(
+            events_log,
+            {
+                "ts": dt.datetime.now().isoformat(),
+                "event": "merge-back",
+                "branch": workspace["branch"],
+                "status": status,
+                "detail": tail_text(detail),
+            },
+        )
+        if status in ("skipped", "conflict", "failed"):
+            print(f"merge-back {status}; worktree kept at {workspace['path']}:\n{detail}", file=sys.stderr)
+            return 1
+
     return 0
 
 
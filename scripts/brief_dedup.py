@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""Find near-duplicate briefs before paying for a pipeline per brief.
+
+Briefs come from brief.template.md, so two briefs in a batch often differ by a
+line or two. Each brief is fingerprinted with MinHash over character shingles,
+keyed by the template section they appear in (text left unchanged from the
+template is ignored). Near-duplicates are grouped with LSH banding, both within
+the batch and against the briefs of earlier runs (runs/*/brief.md, archived
+runs included).
+
+With --reuse, a brief whose closest earlier run is similar enough gets a new run
+directory seeded with that run's upstream step outputs (orchestrator and
+researcher by default), the brief and a runlog.md with the source run's
+sequence; auto_orchestrate.py --resume then skips those steps. A brief that
+already has a run with the identical brief.md (a seeded run included) is not
+seeded again. Other groups are only reported, for review.
+
+Usage:
+  python3 scripts/brief_dedup.py briefs/
+  python3 scripts/brief_dedup.py briefs/*.md --threshold 0.7 --json
+  python3 scripts/brief_dedup.py briefs/ --reuse --reuse-threshold 0.95
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import hashlib
+import json
+import random
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+import auto_continue
+import run_archive
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "brief.template.md"
+MERSENNE_PRIME = (1 << 61) - 1
+MINHASH_SEED = 20240601
+DEFAULT_REUSE_SKILLS = "webapp-orchestrator,webapp-researcher"
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def write_text(path: Path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+
+
+def append_event_log(path: Path, payload: dict) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+
+def normalize_line(line: str) -> str:
+    line = unicodedata.normalize("NFKC", line).lower().strip()
+    line = re.sub(r"^[-*+]\s*|^\d+[.)]\s*", "", line)
+    return re.sub(r"\s+", " ", line).strip()
+
+
+def template_lines(path: Path) -> set[str]:
+    if not path.exists():
+        return set()
+    return {normalize_line(line) for line in read_text(path).splitlines()}
+
+
+def brief_sections(text: str, ignore: set[str]) -> dict[str, list[str]]:
+    """Section title -> normalized lines, dropping lines left as in the template."""
+    sections: dict[str, list[str]] = {}
+    current = ""
+    for raw in text.splitlines():
+        heading = re.match(r"^#{1,6}\s+(.*)$", raw.strip())
+        if heading:
+            current = normalize_line(heading.group(1))
+            continue
+        line = normalize_line(raw)
+        if not line or line in ignore or line == "...":
+            continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def shingles(sections: dict[str, list[str]], size: int) -> set[str]:
+    # Character shingles: briefs are mostly Japanese, which has no word breaks.
+    found: set[str] = set()
+    for title, lines in sections.items():
+        for line in lines:
+            if len(line) <= size:
+                found.add(f"{title}\x1f{line}")
+                continue
+            for start in range(len(line) - size + 1):
+                found.add(f"{title}\x1f{line[start:start + size]}")
+    return found
+
+
+def make_permutations(count: int) -> list[tuple[int, int]]:
+    rng = random.Random(MINHASH_SEED)
+    return [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(count)]
+
+
+def minhash(items: set[str], permutations: list[tuple[int, int]]) -> tuple[int, ...]:
+    if not items:
+        return tuple([MERSENNE_PRIME] * len(permutations))
+    hashes = [int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big") for item in items]
+    return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in permutations)
+
+
+def estimate_similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+def candidate_pairs(signatures: list[tuple[int, ...]], bands: int) -> set[tuple[int, int]]:
+    rows = len(signatures[0]) // bands if signatures else 0
+    pairs: set[tuple[int, int]] = set()
+    for band in range(bands):
+        buckets: dict[tuple[int, ...], list[int]] = {}
+        for idx, signature in enumerate(signatures):
+            buckets.setdefault(signature[band * rows:(band + 1) * rows], []).append(idx)
+        for members in buckets.values():
+            for i, left in enumerate(members):
+                for right in members[i + 1:]:
+                    pairs.add((left, right))
+    return pairs
+
+
+def group_pairs(count: int, edges: list[tuple[int, int, float]]) -> list[list[int]]:
+    parent = list(range(count))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for left, right, _ in edges:
+        parent[find(left)] = find(right)
+    groups: dict[int, list[int]] = {}
+    for node in range(count):
+        groups.setdefault(find(node), []).append(node)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def collect_briefs(paths: list[str]) -> list[Path]:
+    found: list[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            found.extend(sorted(p for p in path.glob("*.md") if p.is_file()))
+        elif path.is_file():
+            found.append(path)
+        else:
+            print(f"warning: brief not found: {path}", file=sys.stderr)
+    return found
+
+
+def upstream_steps(view: run_archive.RunView, reuse_skills: list[str]) -> list[str]:
+    """Output files of the run's leading steps whose skill is reusable, in order."""
+    sequence = auto_continue.parse_sequence(view) or []
+    names: list[str] = []
+    for idx, skill in enumerate(sequence, 1):
+        name = f"{idx:02d}-{skill}.md"
+        if skill not in reuse_skills or not view.exists(name):
+            break
+        names.append(name)
+    return names
+
+
+def resume_command(brief_path: Path, run_dir: Path, sequence: list[str]) -> str:
+    return f"python3 scripts/auto_orchestrate.py --brief {brief_path} --resume {run_dir} --sequence {','.join(sequence)}"
+
+
+def seed_run(
+    brief_path: Path,
+    source: run_archive.RunView,
+    names: list[str],
+    similarity: float,
+    out_root: Path,
+) -> Path:
+    """New run directory with the source run's upstream outputs, ready for auto_orchestrate.py --resume.
+
+    brief.md makes later dedup passes see the seeded run, and runlog.md carries
+    the source run's sequence for auto_continue.py.
+    """
+    stamp = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
+    run_dir = out_root / f"{stamp}-{brief_path.stem}"
+    run_dir.mkdir(parents=True, exist_ok=False)
+    for name in names:
+        write_text(run_dir / name, source.read_text(name))
+    write_text(run_dir / "brief.md", read_text(brief_path))
+    sequence = auto_continue.parse_sequence(source) or []
+    now = dt.datetime.now()
+    write_text(
+        run_dir / "runlog.md",
+        "\n".join(
+            [
+                "# Run Log",
+                "",
+                f"- Started: {now.strftime('%Y-%m-%d %H:%M:%S')}",
+                f"- Sequence: {', '.join(sequence)}",
+                f"- Brief: {brief_path}",
+                f"- Seeded from: {source.run_dir} (similarity {similarity:.3f}; {', '.join(names)})",
+                "",
+            ]
+        ),
+    )
+    append_event_log(
+        run_dir / "events.jsonl",
+        {
+            "ts": now.isoformat(),
+            "event": "reused-upstream",
+            "brief": str(brief_path),
+            "source": str(source.run_dir),
+            "similarity": round(similarity, 3),
+            "steps": names,
+            "sequence": sequence,
+        },
+    )
+    return run_dir
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("briefs", nargs="+", help="Brief files or directories of *.md briefs")
+    parser.add_argument("--runs-dir", default="runs", help="Earlier runs to compare against (brief.md of each run)")
+    parser.add_argument("--template", default=str(TEMPLATE_PATH), help="Brief template whose unchanged lines are ignored")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Estimated Jaccard similarity that groups two briefs")
+    parser.add_argument("--shingle-size", type=int, default=5, help="Characters per shingle")
+    parser.add_argument("--num-perm", type=int, default=128, help="MinHash permutations")
+    parser.add_argument("--bands", type=int, default=32, help="LSH bands (must divide --num-perm)")
+    parser.add_argument("--reuse", action="store_true", help="Seed run directories with a close earlier run's upstream steps")
+    parser.add_argument("--reuse-threshold", type=float, default=0.95, help="Similarity required to reuse upstream steps")
+    parser.add_argument("--reuse-skills", default=DEFAULT_REUSE_SKILLS, help="Comma-separated skills whose outputs may be reused")
+    parser.add_argument("--out-root", default="runs", help="Where seeded run directories are created")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.num_perm % args.bands:
+        print("--bands must divide --num-perm", file=sys.stderr)
+        return 1
+    brief_paths = collect_briefs(args.briefs)
+    if not brief_paths:
+        print("no briefs found", file=sys.stderr)
+        return 1
+
+    ignore = template_lines(Path(args.template))
+    permutations = make_permutations(args.num_perm)
+    # Entries are the batch's briefs followed by the briefs of earlier runs.
+    entries: list[dict] = []
+    for path in brief_paths:
+        entries.append({"kind": "brief", "path": path, "text": read_text(path)})
+    for view in run_archive.run_views(Path(args.runs_dir)):
+        if view.exists("brief.md"):
+            entries.append({"kind": "run", "path": view.run_dir, "view": view, "text": view.read_text("brief.md")})
+    signatures = [minhash(shingles(brief_sections(e["text"], ignore), args.shingle_size), permutations) for e in entries]
+
+    edges: list[tuple[int, int, float]] = []
+    for left, right in sorted(candidate_pairs(signatures, args.bands)):
+        if entries[left]["kind"] == "run" and entries[right]["kind"] == "run":
+            continue
+        similarity = estimate_similarity(signatures[left], signatures[right])
+        if similarity >= args.threshold:
+            edges.append((left, right, similarity))
+    groups = [members for members in group_pairs(len(entries), edges) if any(entries[m]["kind"] == "brief" for m in members)]
+
+    reuse_skills = [s.strip() for s in args.reuse_skills.split(",") if s.strip()]
+    report_groups: list[dict] = []
+    for members in groups:
+        seeded: list[dict] = []
+        for member in members:
+            if entries[member]["kind"] != "brief":
+                continue
+            # Closest earlier run in the same group with something to reuse.
+            best: tuple[float, int, list[str]] | None = None
+            existing: int | None = None
+            for left, right, similarity in edges:
+                if member not in (left, right):
+                    continue
+                other = right if left == member else left
+                if entries[other]["kind"] != "run":
+                    continue
+                if entries[other]["text"] == entries[member]["text"]:
+                    existing = other
+                    break
+                if similarity < args.reuse_threshold:
+                    continue
+                names = upstream_steps(entries[other]["view"], reuse_skills)
+                if names and (best is None or similarity > best[0]):
+                    best = (similarity, other, names)
+            if existing is not None:
+                # Already run (or seeded by an earlier --reuse pass): resume that run instead.
+                view = entries[existing]["view"]
+                sequence = auto_continue.parse_sequence(view) or []
+                seeded.append(
+                    {
+                        "brief": str(entries[member]["path"]),
+                        "existing_run": str(view.run_dir),
+                        "command": resume_command(entries[member]["path"], view.run_dir, sequence),
+                    }
+                )
+                continue
+            if best is None:
+                continue
+            similarity, other, names = best
+            item = {"brief": str(entries[member]["path"]), "source": str(entries[other]["path"]), "similarity": round(similarity, 3), "steps": names}
+            if args.reuse:
+                run_dir = seed_run(entries[member]["path"], entries[other]["view"], names, similarity, Path(args.out_root))
+                item["run_dir"] = str(run_dir)
+                item["command"] = resume_command(entries[member]["path"], run_dir, auto_continue.parse_sequence(entries[other]["view"]) or [])
+            seeded.append(item)
+        edges_in_group = [(l, r, s) for l, r, s in edges if l in members and r in members]
+        report_groups.append(
+            {
+                "members": [{"kind": entries[m]["kind"], "path": str(entries[m]["path"])} for m in members],
+                "min_similarity": round(min(s for _, _, s in edges_in_group), 3),
+                "max_similarity": round(max(s for _, _, s in edges_in_group), 3),
+                "reuse": seeded,
+            }
+        )
+
+    if args.json:
+        print(json.dumps({"briefs": len(brief_paths), "groups": report_groups}, ensure_ascii=False, indent=2))
+        return 0
+    print(f"# Near-duplicate briefs ({len(brief_paths)} briefs, threshold {args.threshold})")
+    if not report_groups:
+        print("\nNo near-duplicates found.")
+        return 0
+    for number, group in enumerate(report_groups, 1):
+        print(f"\n## Group {number} (similarity {group['min_similarity']:.2f}-{group['max_similarity']:.2f})")
+        for member in group["members"]:
+            print(f"- {member['kind']}: {member['path']}")
+        for item in group["reuse"]:
+            if "existing_run" in item:
+                print(f"  {item['brief']} already has run {item['existing_run']}; resume it with:\n    {item['command']}")
+                continue
+            steps = ", ".join(item["steps"])
+            if "run_dir" in item:
+                print(f"  seeded {item['run_dir']} from {item['source']} ({steps}); run it with:\n    {item['command']}")
+            else:
+                print(f"  {item['brief']} can reuse {steps} from {item['source']} (similarity {item['similarity']:.2f}; pass --reuse)")
+        if not group["reuse"]:
+            print("  review: no earlier run close enough to reuse")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Build responsive variants of the board art and map renders.
+
+Every source image gets 1x/2x/3x variants in PNG plus WebP/AVIF when the
+installed Pillow supports them. Work is spread over a process pool, and a
+manifest keyed by content hash lets unchanged sources be skipped.
+
+Usage:
+  python3 scripts/build_assets.py
+  python3 scripts/build_assets.py --force --jobs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PIL import Image, features
+
+ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = ROOT / "public" / "assets"
+OUT_DIR = ASSETS_DIR / "variants"
+MANIFEST = OUT_DIR / "manifest.json"
+EXTRA_SOURCES = [ROOT / "reference_map_layout.png"]
+# Data images read pixel by pixel at runtime; resized or lossy variants would corrupt them.
+EXCLUDED_SOURCES = {ASSETS_DIR / "map_pick.png"}
+SOURCE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+
+# Bump when encoder settings or variant names change so every variant is rebuilt.
+PIPELINE_VERSION = 2
+SCALES = [1, 2, 3]
+# CSS width of the 1x variant, first match wins (paths relative to public/assets).
+BASE_WIDTHS = [
+    ("icon_*", 128),
+    ("investigators/*", 256),
+    ("*", 1024),
+]
+WEBP_QUALITY = 82
+AVIF_QUALITY = 55
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def write_text(path: Path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+
+
+def available_formats() -> list[str]:
+    formats = ["png"]
+    if features.check("webp"):
+        formats.append("webp")
+    if features.check("avif"):
+        formats.append("avif")
+    return formats
+
+
+def base_width_for(rel: str) -> int:
+    for pattern, width in BASE_WIDTHS:
+        if fnmatch.fnmatch(rel, pattern):
+            return width
+    return BASE_WIDTHS[-1][1]
+
+
+def content_hash(path: Path, formats: list[str]) -> str:
+    digest = hashlib.sha256(f"v{PIPELINE_VERSION}:{base_width_for(source_key(path))}:{','.join(formats)}:".encode())
+    digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def source_key(path: Path) -> str:
+    if path.is_relative_to(ASSETS_DIR):
+        return path.relative_to(ASSETS_DIR).as_posix()
+    return path.relative_to(ROOT).as_posix()
+
+
+def collect_sources() -> list[Path]:
+    sources = [
+        path
+        for path in sorted(ASSETS_DIR.rglob("*"))
+        if path.suffix.lower() in SOURCE_SUFFIXES and OUT_DIR not in path.parents and path not in EXCLUDED_SOURCES
+    ]
+    return sources + [path for path in EXTRA_SOURCES if path.exists()]
+
+
+def save_variant(img: Image.Image, path: Path, fmt: str) -> None:
+    if fmt == "png":
+        img.save(path, "PNG", optimize=True)
+    elif fmt == "webp":
+        img.save(path, "WEBP", quality=WEBP_QUALITY, method=6)
+    elif fmt == "avif":
+        img.save(path, "AVIF", quality=AVIF_QUALITY)
+
+
+def to_web_mode(img: Image.Image) -> Image.Image:
+    """RGBA when the image has transparency, RGB otherwise: the modes every encoder here accepts."""
+    if img.mode in ("RGB", "RGBA"):
+        return img.copy()
+    if img.mode.startswith("I"):
+        # 16/32-bit samples: scale to 8 bits instead of clipping everything above 255 to white.
+        img = img.convert("I").point(lambda value: value / 256).convert("L")
+    has_alpha = "A" in img.mode or "a" in img.mode or "transparency" in img.info
+    return img.convert("RGBA" if has_alpha else "RGB")
+
+
+def build_variants(source: Path, key: str, digest: str, formats: list[str]) -> dict:
+    variants: list[dict] = []
+    # The extension stays in the name so foo.png and foo.jpg never share variants.
+    stem = key
+    with Image.open(source) as original:
+        img = to_web_mode(original)
+    base_width = base_width_for(key)
+    widths = [base_width * scale for scale in SCALES if base_width * scale <= img.width] or [img.width]
+    for scale, width in zip(SCALES, widths):
+        height = round(img.height * width / img.width)
+        resized = img if width == img.width else img.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            out = OUT_DIR / f"{stem}@{scale}x.{fmt}"
+            out.parent.mkdir(parents=True, exist_ok=True)
+            save_variant(resized, out, fmt)
+            variants.append(
+                {
+                    "path": "/" + out.relative_to(ROOT / "public").as_posix(),
+                    "scale": scale,
+                    "format": fmt,
+                    "width": width,
+                    "height": height,
+                    "bytes": out.stat().st_size,
+                }
+            )
+    return {"hash": digest, "sourceBytes": source.stat().st_size, "variants": variants}
+
+
+def load_manifest() -> dict:
+    if not MANIFEST.exists():
+        return {"assets": {}}
+    try:
+        return json.loads(read_text(MANIFEST))
+    except json.JSONDecodeError:
+        return {"assets": {}}
+
+
+def remove_variants(entry: dict) -> None:
+    for variant in entry.get("variants", []):
+        (ROOT / "public" / variant["path"].lstrip("/")).unlink(missing_ok=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--force", action="store_true", help="Rebuild every variant even if the source is unchanged")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    args = parser.parse_args()
+
+    formats = available_formats()
+    manifest = load_manifest()
+    previous = manifest.get("assets", {})
+    assets: dict[str, dict] = {}
+    pending: list[tuple[Path, str, str]] = []
+    for source in collect_sources():
+        key = source_key(source)
+        digest = content_hash(source, formats)
+        entry = previous.get(key)
+        if (
+            not args.force
+            and entry
+            and entry.get("hash") == digest
+            and all((ROOT / "public" / v["path"].lstrip("/")).exists() for v in entry["variants"])
+        ):
+            assets[key] = entry
+            continue
+        if entry:
+            remove_variants(entry)
+        pending.append((source, key, digest))
+
+    for key in set(previous) - {source_key(s) for s in collect_sources()}:
+        remove_variants(previous[key])
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    failed = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            futures = {pool.submit(build_variants, source, key, digest, formats): key for source, key, digest in pending}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    assets[key] = future.result()
+                    print(f"built {key} ({len(assets[key]['variants'])} variants)")
+                except Exception as exc:  # noqa: BLE001
+                    failed += 1
+                    print(f"failed {key}: {type(exc).__name__}: {exc}", file=sys.stderr)
+
+    manifest = {"version": PIPELINE_VERSION, "formats": formats, "assets": dict(sorted(assets.items()))}
+    write_text(MANIFEST, json.dumps(manifest, ensure_ascii=False, indent=2) + "\n")
+    print(f"{len(pending) - failed} built, {len(assets) - (len(pending) - failed)} unchanged, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
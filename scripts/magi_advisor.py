@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Suggest the next MAGI CHAIN action with time-bounded Monte-Carlo tree search.
+
+The search runs over the Python rules port (magi_rules.py). Statistics are
+kept in a transposition table keyed by a hash of the rule-relevant state, and
+independent searches run on every core (root parallelisation) and are merged
+before the deadline.
+
+Usage:
+  python3 scripts/magi_advisor.py --state game.json
+  python3 scripts/magi_advisor.py --state game.json --budget-ms 500 --workers 4
+  python3 scripts/magi_advisor.py --serve < requests.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import magi_rules
+
+DEFAULT_BUDGET_MS = 200
+# Time kept back for dispatching work to the pool and merging results.
+DISPATCH_MARGIN_MS = 15
+ROLLOUT_DEPTH = 80
+EXPLORATION = 1.4
+# Undelivered papers/monsters are worth a delivery (2 VP) once handed in.
+CARRIED_ITEM_VALUE = 1.5
+SPIRIT_VALUE = 1.0
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def state_hash(state: dict) -> str:
+    players = {
+        uid: {key: value for key, value in player.items() if key not in ("connected", "lastSeenAt", "name")}
+        for uid, player in state["players"].items()
+    }
+    payload = [state["status"], state["phase"], state["turn"], players, state["stacks"]]
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def action_key(action: dict) -> str:
+    return json.dumps(action, sort_keys=True, ensure_ascii=False)
+
+
+def potential(player: dict) -> float:
+    inventory = player["inventory"]
+    carried = len(inventory["papers"]) + len(inventory["monsters"])
+    return player["score"] + CARRIED_ITEM_VALUE * carried + SPIRIT_VALUE * len(player["spirits"])
+
+
+def evaluate(state: dict) -> dict[str, float]:
+    """Reward in [0, 1] for every player: own potential against the best opponent."""
+    values = {uid: potential(player) for uid, player in state["players"].items()}
+    rewards: dict[str, float] = {}
+    for uid, value in values.items():
+        others = [v for other, v in values.items() if other != uid]
+        margin = value - max(others) if others else value
+        rewards[uid] = 0.5 + 0.5 * math.tanh(margin / 8)
+    return rewards
+
+
+def rollout(state: dict, rng: random.Random) -> None:
+    for _ in range(ROLLOUT_DEPTH):
+        actions = magi_rules.legal_actions(state)
+        if not actions:
+            return
+        magi_rules.apply_action(state, rng.choice(actions), state["turn"]["currentPlayerId"], rng)
+
+
+def select_edge(entry: dict, rng: random.Random) -> str:
+    edges = entry["edges"]
+    untried = [key for key, edge in edges.items() if edge[1] == 0]
+    if untried:
+        return rng.choice(untried)
+    log_n = math.log(entry["visits"])
+    return max(edges, key=lambda key: edges[key][2] / edges[key][1] + EXPLORATION * math.sqrt(log_n / edges[key][1]))
+
+
+def search(root: dict, deadline: float, seed: int) -> dict:
+    """Run MCTS until `deadline` (time.time()) and return root edge statistics."""
+    rng = random.Random(seed)
+    # hash -> {"visits": N, "edges": {action_key: [action, n, w]}}
+    table: dict[str, dict] = {}
+    root_hash = state_hash(root)
+    iterations = 0
+    while True:
+        state = magi_rules.clone_state(root)
+        path: list[tuple[dict, str, str]] = []
+        while state["status"] == "running":
+            digest = root_hash if not path else state_hash(state)
+            entry = table.get(digest)
+            if entry is None:
+                actions = magi_rules.legal_actions(state)
+                table[digest] = {"visits": 0, "edges": {action_key(a): [a, 0, 0.0] for a in actions}}
+                break
+            key = select_edge(entry, rng)
+            actor = state["turn"]["currentPlayerId"]
+            magi_rules.apply_action(state, entry["edges"][key][0], actor, rng)
+            path.append((entry, key, actor))
+        rollout(state, rng)
+        rewards = evaluate(state)
+        for entry, key, actor in path:
+            entry["visits"] += 1
+            edge = entry["edges"][key]
+            edge[1] += 1
+            edge[2] += rewards[actor]
+        iterations += 1
+        if time.time() >= deadline:
+            break
+    root_entry = table[root_hash]
+    return {
+        "iterations": iterations,
+        "edges": {key: {"action": edge[0], "visits": edge[1], "value": edge[2]} for key, edge in root_entry["edges"].items()},
+    }
+
+
+def merge_results(results: list[dict]) -> tuple[dict[str, dict], int]:
+    merged: dict[str, dict] = {}
+    iterations = 0
+    for result in results:
+        iterations += result["iterations"]
+        for key, edge in result["edges"].items():
+            slot = merged.setdefault(key, {"action": edge["action"], "visits": 0, "value": 0.0})
+            slot["visits"] += edge["visits"]
+            slot["value"] += edge["value"]
+    return merged, iterations
+
+
+def advise(state: dict, budget_ms: int, pool: ProcessPoolExecutor | None, workers: int, seed: int | None = None) -> dict:
+    started = time.time()
+    actions = magi_rules.legal_actions(state)
+    if not actions:
+        raise magi_rules.RuleError("No legal actions: game is not running")
+    if len(actions) == 1:
+        return {"action": actions[0], "iterations": 0, "elapsedMs": 0.0, "candidates": []}
+
+    deadline = started + max(0, budget_ms - DISPATCH_MARGIN_MS) / 1000
+    base_seed = seed if seed is not None else random.randrange(1 << 30)
+    if pool is None or workers <= 1:
+        results = [search(state, deadline, base_seed)]
+    else:
+        futures = [pool.submit(search, state, deadline, base_seed + i) for i in range(workers)]
+        results = [future.result() for future in futures]
+    merged, iterations = merge_results(results)
+
+    # Robust child: most visited, ties broken by mean value.
+    ranked = sorted(
+        merged.values(),
+        key=lambda edge: (edge["visits"], edge["value"] / edge["visits"] if edge["visits"] else 0.0),
+        reverse=True,
+    )
+    candidates = [
+        {
+            "action": edge["action"],
+            "visits": edge["visits"],
+            "meanValue": round(edge["value"] / edge["visits"], 4) if edge["visits"] else None,
+        }
+        for edge in ranked[:5]
+    ]
+    return {
+        "action": ranked[0]["action"],
+        "iterations": iterations,
+        "elapsedMs": round((time.time() - started) * 1000, 1),
+        "candidates": candidates,
+    }
+
+
+def serve(budget_ms: int, pool: ProcessPoolExecutor | None, workers: int) -> int:
+    # One JSON request per line: {"state": GameState, "budgetMs"?: number}.
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            response = advise(request["state"], int(request.get("budgetMs", budget_ms)), pool, workers)
+        except Exception as exc:  # noqa: BLE001
+            response = {"error": f"{type(exc).__name__}: {exc}"}
+        sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--state", default=None, help="Path to a GameState JSON document ('-' for stdin)")
+    parser.add_argument("--serve", action="store_true", help="Answer JSON-lines requests on stdin until EOF")
+    parser.add_argument("--budget-ms", type=int, default=DEFAULT_BUDGET_MS, help="Latency budget per request")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel search processes")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible searches")
+    args = parser.parse_args()
+
+    if not args.serve and not args.state:
+        print("either --state or --serve is required", file=sys.stderr)
+        return 1
+
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        if pool is not None:
+            # Start the workers before the first request so it is not charged for process start-up.
+            list(pool.map(int, range(args.workers)))
+        if args.serve:
+            return serve(args.budget_ms, pool, args.workers)
+        raw = sys.stdin.read() if args.state == "-" else read_text(Path(args.state))
+        try:
+            result = advise(json.loads(raw), args.budget_ms, pool, args.workers, args.seed)
+        except magi_rules.RuleError as exc:
+            print(str(exc), file=sys.stderr)
+            return 1
+        print(json.dumps(result, ensure_ascii=False))
+        return 0
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""Export games and their events (spec §9.4) to columnar tables for analytics.
+
+Reads exported JSON (JSON lines, JSON arrays or concatenated documents, parsed
+incrementally) or pages straight through the Firestore emulator's REST API, one
+game's events at a time, and writes:
+
+  events.parquet        one row per event (game, version, actor, action, target, time)
+  player_turns.parquet  one row per player-turn (round, duration, action counts)
+  games.parquet         one row per game document
+
+Rows are written in row groups of --chunk-rows with id columns dictionary-encoded,
+so memory stays bounded by the chunk size and the longest single game, not by
+the size of the history. Parquet output needs the optional `pyarrow` package;
+without it the same tables are written as CSV (--format defaults to parquet
+only when pyarrow is installed).
+
+A summary (turns per game, most-visited tiles, spirit activation rates) is
+computed while streaming; anything else is a query over the tables, e.g.
+  duckdb -c "select target_id, count(*) from 'analytics/events.parquet'
+             where action_type = 'move' group by 1 order by 2 desc limit 10"
+
+Usage:
+  python3 scripts/magi_analytics_export.py --games games.jsonl --events events.jsonl
+  python3 scripts/magi_analytics_export.py --emulator localhost:8080 --project demo-magi
+  python3 scripts/magi_analytics_export.py --games export.json --format csv --out analytics
+"""
+
+from __future__ import annotations
+
+import abc
+import argparse
+import csv
+import datetime as dt
+import json
+import os
+import sys
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: tables are written as CSV without it
+    pa = None
+    pq = None
+
+READ_CHUNK_CHARS = 1 << 16
+DEFAULT_CHUNK_ROWS = 50_000
+EMULATOR_PAGE_SIZE = 300
+# Action fields that name what an action targets, in the order they are looked up.
+TARGET_FIELDS = ("targetId", "cardId", "spiritId", "actionType")
+
+# table -> [(column, kind)]; kind "id" columns are dictionary-encoded.
+TABLES = {
+    "events": [
+        ("game_id", "id"),
+        ("snapshot_version", "int"),
+        ("actor_id", "id"),
+        ("action_type", "id"),
+        ("target_id", "id"),
+        ("created_at", "time"),
+    ],
+    "player_turns": [
+        ("game_id", "id"),
+        ("turn_index", "int"),
+        ("round", "int"),
+        ("player_id", "id"),
+        ("started_at", "time"),
+        ("ended_at", "time"),
+        ("duration_seconds", "float"),
+        ("actions", "int"),
+        ("cards_played", "int"),
+        ("spirits_activated", "int"),
+        ("moves", "int"),
+        ("tile_action", "id"),
+        ("end_tile", "id"),
+    ],
+    "games": [
+        ("game_id", "id"),
+        ("status", "id"),
+        ("ruleset_version", "id"),
+        ("players", "int"),
+        ("turn_number", "int"),
+        ("snapshot_version", "int"),
+        ("created_at", "time"),
+        ("updated_at", "time"),
+    ],
+}
+
+
+def iter_json_documents(path: Path) -> Iterator[dict]:
+    """Yield the objects of a JSON lines file, a JSON array or concatenated JSON, reading in chunks."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    with path.open(encoding="utf-8") as f:
+        eof = False
+        while True:
+            stripped = buffer.lstrip(" \t\r\n,[]")
+            if not stripped:
+                buffer = ""
+                if eof:
+                    return
+                chunk = f.read(READ_CHUNK_CHARS)
+                eof = not chunk
+                buffer += chunk
+                continue
+            try:
+                doc, end = decoder.raw_decode(stripped)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(READ_CHUNK_CHARS)
+                eof = not chunk
+                buffer = stripped + chunk
+                continue
+            buffer = stripped[end:]
+            if isinstance(doc, dict):
+                yield doc
+
+
+def decode_firestore_value(value: dict) -> object:
+    if "mapValue" in value:
+        return {key: decode_firestore_value(child) for key, child in value["mapValue"].get("fields", {}).items()}
+    if "arrayValue" in value:
+        return [decode_firestore_value(child) for child in value["arrayValue"].get("values", [])]
+    if "integerValue" in value:
+        return int(value["integerValue"])
+    if "nullValue" in value:
+        return None
+    for key in ("stringValue", "booleanValue", "doubleValue", "timestampValue", "referenceValue", "bytesValue", "geoPointValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+def iter_emulator_documents(base_url: str, path: str, order_by: str | None = None) -> Iterator[tuple[str, dict]]:
+    token = None
+    while True:
+        query = {"pageSize": EMULATOR_PAGE_SIZE}
+        if order_by:
+            query["orderBy"] = order_by
+        if token:
+            query["pageToken"] = token
+        # "Bearer owner" lets the emulator skip security rules.
+        request = urllib.request.Request(
+            f"{base_url}/{path}?{urllib.parse.urlencode(query)}", headers={"Authorization": "Bearer owner"}
+        )
+        with urllib.request.urlopen(request) as response:
+            payload = json.load(response)
+        for doc in payload.get("documents", []):
+            fields = {key: decode_firestore_value(value) for key, value in doc.get("fields", {}).items()}
+            yield doc["name"].rsplit("/", 1)[1], fields
+        token = payload.get("nextPageToken")
+        if not token:
+            return
+
+
+def to_millis(value: object) -> int | None:
+    if isinstance(value, dict):
+        # firebase-admin JSON exports ({"_seconds", "_nanoseconds"}) and protobuf JSON ({"seconds", "nanos"}).
+        seconds = value.get("_seconds", value.get("seconds"))
+        nanos = value.get("_nanoseconds", value.get("nanos", 0))
+        return int(seconds) * 1000 + int(nanos) // 1_000_000 if seconds is not None else None
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+class TableWriter(abc.ABC):
+    """Buffers rows column by column and writes them out every `chunk_rows` rows."""
+
+    def __init__(self, path: Path, columns: list[tuple[str, str]], chunk_rows: int) -> None:
+        self.path = path
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.buffer: dict[str, list] = {name: [] for name, _ in columns}
+        self.rows = 0
+
+    def add(self, row: dict) -> None:
+        for name, _ in self.columns:
+            self.buffer[name].append(row.get(name))
+        self.rows += 1
+        if len(self.buffer[self.columns[0][0]]) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer[self.columns[0][0]]:
+            self._write()
+            self.buffer = {name: [] for name, _ in self.columns}
+
+    def close(self) -> None:
+        self.flush()
+
+    @abc.abstractmethod
+    def _write(self) -> None:
+        """Write the buffered chunk."""
+
+
+class ParquetTableWriter(TableWriter):
+    ARROW_TYPES = {"int": "int64", "float": "float64"}
+
+    def __init__(self, path: Path, columns: list[tuple[str, str]], chunk_rows: int) -> None:
+        super().__init__(path, columns, chunk_rows)
+        fields = []
+        for name, kind in columns:
+            if kind == "id":
+                arrow_type = pa.dictionary(pa.int32(), pa.string())
+            elif kind == "time":
+                arrow_type = pa.timestamp("ms", tz="UTC")
+            else:
+                arrow_type = getattr(pa, self.ARROW_TYPES[kind])()
+            fields.append(pa.field(name, arrow_type))
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(str(path), self.schema, compression="zstd")
+
+    def _write(self) -> None:
+        arrays = []
+        for (name, kind), field in zip(self.columns, self.schema):
+            values = self.buffer[name]
+            if kind == "id":
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        # One row group per chunk; Parquet keeps a dictionary per column chunk.
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self) -> None:
+        super().close()
+        self.writer.close()
+
+
+class CsvTableWriter(TableWriter):
+    def __init__(self, path: Path, columns: list[tuple[str, str]], chunk_rows: int) -> None:
+        super().__init__(path, columns, chunk_rows)
+        self.handle = path.open("w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.handle)
+        self.writer.writerow([name for name, _ in columns])
+
+    def _write(self) -> None:
+        names = [name for name, _ in self.columns]
+        for values in zip(*(self.buffer[name] for name in names)):
+            self.writer.writerow(
+                [
+                    dt.datetime.fromtimestamp(value / 1000, dt.timezone.utc).isoformat() if kind == "time" and value is not None else value
+                    for value, (_, kind) in zip(values, self.columns)
+                ]
+            )
+
+    def close(self) -> None:
+        super().close()
+        self.handle.close()
+
+
+class Exporter:
+    """Turns one game's events at a time into event and player-turn rows, keeping the summary counters."""
+
+    def __init__(self, writers: dict[str, TableWriter]) -> None:
+        self.writers = writers
+        self.seen_games: set[str] = set()
+        self.turns_per_game: list[int] = []
+        self.rounds_per_game: list[int] = []
+        self.tile_visits: dict[str, int] = {}
+        self.spirit_activations: dict[str, int] = {}
+        self.turns_with_spirit = 0
+        self.player_turns = 0
+
+    def add_game(self, game_id: str, doc: dict) -> None:
+        turn = doc.get("turn") or {}
+        self.writers["games"].add(
+            {
+                "game_id": game_id,
+                "status": doc.get("status"),
+                "ruleset_version": doc.get("rulesetVersion"),
+                "players": len(doc.get("players") or {}),
+                "turn_number": turn.get("turnNumber"),
+                "snapshot_version": doc.get("snapshotVersion"),
+                "created_at": to_millis(doc.get("createdAt")),
+                "updated_at": to_millis(doc.get("updatedAt")),
+            }
+        )
+
+    def add_events(self, game_id: str, events: list[dict]) -> None:
+        if game_id in self.seen_games:
+            print(f"warning: events of game {game_id} are not contiguous; its turns are counted in parts", file=sys.stderr)
+        self.seen_games.add(game_id)
+        events.sort(key=lambda event: event.get("snapshotVersion", 0))
+        turns: list[dict] = []
+        current: dict | None = None
+        round_no = 1
+        round_players: set[str] = set()
+        for event in events:
+            action = event.get("action") or {}
+            action_type = action.get("type")
+            actor = event.get("actorId")
+            created = to_millis(event.get("createdAt"))
+            target = next((action[key] for key in TARGET_FIELDS if action.get(key) is not None), None)
+            self.writers["events"].add(
+                {
+                    "game_id": game_id,
+                    "snapshot_version": event.get("snapshotVersion"),
+                    "actor_id": actor,
+                    "action_type": action_type,
+                    "target_id": target,
+                    "created_at": created,
+                }
+            )
+            if current is None or current["player_id"] != actor:
+                if actor in round_players:
+                    round_no += 1
+                    round_players = set()
+                round_players.add(actor)
+                current = {
+                    "game_id": game_id,
+                    "turn_index": len(turns) + 1,
+                    "round": round_no,
+                    "player_id": actor,
+                    "started_at": created,
+                    "ended_at": created,
+                    "actions": 0,
+                    "cards_played": 0,
+                    "spirits_activated": 0,
+                    "moves": 0,
+                    "tile_action": None,
+                    "end_tile": None,
+                }
+                turns.append(current)
+            current["actions"] += 1
+            current["ended_at"] = created if created is not None else current["ended_at"]
+            if action_type == "play_card":
+                current["cards_played"] += 1
+            elif action_type == "activate_spirit":
+                current["spirits_activated"] += 1
+                spirit = action.get("spiritId")
+                self.spirit_activations[spirit] = self.spirit_activations.get(spirit, 0) + 1
+            elif action_type == "move":
+                current["moves"] += 1
+                current["end_tile"] = action.get("targetId")
+                self.tile_visits[current["end_tile"]] = self.tile_visits.get(current["end_tile"], 0) + 1
+            elif action_type == "tile_action":
+                current["tile_action"] = action.get("actionType")
+            elif action_type == "confirm_draw":
+                # The reducer advances the turn on confirm_draw.
+                current = None
+        for row in turns:
+            started, ended = row["started_at"], row["ended_at"]
+            row["duration_seconds"] = (ended - started) / 1000 if started is not None and ended is not None else None
+            self.writers["player_turns"].add(row)
+            self.turns_with_spirit += 1 if row["spirits_activated"] else 0
+        self.player_turns += len(turns)
+        if turns:
+            self.turns_per_game.append(len(turns))
+            self.rounds_per_game.append(turns[-1]["round"])
+
+    def summary(self, top: int) -> str:
+        games = len(self.turns_per_game)
+        lines = ["# Analytics export", ""]
+        for name, writer in self.writers.items():
+            lines.append(f"- {name}: {writer.rows} rows -> {writer.path}")
+        if games:
+            lines += [
+                f"- Player-turns per game: {sum(self.turns_per_game) / games:.1f} (rounds: {sum(self.rounds_per_game) / games:.1f}) over {games} games",
+                f"- Spirit activations: {sum(self.spirit_activations.values())}, "
+                f"in {self.turns_with_spirit / self.player_turns:.1%} of player-turns",
+            ]
+        if self.tile_visits:
+            lines += ["", "## Most-visited tiles", "", "| tile | moves in |", "| - | - |"]
+            for tile, count in sorted(self.tile_visits.items(), key=lambda item: item[1], reverse=True)[:top]:
+                lines.append(f"| {tile} | {count} |")
+        if self.spirit_activations:
+            lines += ["", "## Spirit activations", "", "| spirit | activations |", "| - | - |"]
+            for spirit, count in sorted(self.spirit_activations.items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"| {spirit} | {count} |")
+        return "\n".join(lines)
+
+
+def export_files(exporter: Exporter, game_paths: list[Path], event_paths: list[Path]) -> None:
+    for path in game_paths:
+        for doc in iter_json_documents(path):
+            game_id = str(doc.get("id") or doc.get("gameId") or "")
+            exporter.add_game(game_id, doc)
+            # Games exported with their events inline.
+            if isinstance(doc.get("events"), list):
+                exporter.add_events(game_id, doc["events"])
+    for path in event_paths:
+        # Events are grouped by game (as exported per subcollection); one game is held at a time.
+        game_id: str | None = None
+        pending: list[dict] = []
+        for doc in iter_json_documents(path):
+            doc_game = str(doc.get("gameId") or "")
+            if pending and doc_game != game_id:
+                exporter.add_events(game_id or "", pending)
+                pending = []
+            game_id = doc_game
+            pending.append(doc)
+        if pending:
+            exporter.add_events(game_id or "", pending)
+
+
+def export_emulator(exporter: Exporter, host: str, project: str) -> None:
+    base_url = f"http://{host}/v1/projects/{project}/databases/(default)/documents"
+    for game_id, doc in iter_emulator_documents(base_url, "games"):
+        exporter.add_game(game_id, doc)
+        events = [fields for _, fields in iter_emulator_documents(base_url, f"games/{game_id}/events", "snapshotVersion")]
+        exporter.add_events(game_id, events)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", action="append", default=None, help="Exported game documents (repeatable)")
+    parser.add_argument("--events", action="append", default=None, help="Exported event documents with gameId, grouped by game (repeatable)")
+    parser.add_argument("--emulator", default=None, help="Firestore emulator host:port (default: $FIRESTORE_EMULATOR_HOST when no files are given)")
+    parser.add_argument("--project", default=os.environ.get("GCLOUD_PROJECT", "demo-magi"), help="Project id for --emulator")
+    parser.add_argument("--out", default="analytics", help="Output directory")
+    parser.add_argument(
+        "--format",
+        choices=["parquet", "csv"],
+        default=None,
+        help="Table format (default: parquet when pyarrow is installed, else csv)",
+    )
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows per row group / write")
+    parser.add_argument("--top", type=int, default=10, help="Tiles to list in the summary")
+    args = parser.parse_args()
+
+    emulator = args.emulator or (None if args.games or args.events else os.environ.get("FIRESTORE_EMULATOR_HOST"))
+    if not emulator and not args.games and not args.events:
+        print("--games/--events or --emulator is required", file=sys.stderr)
+        return 1
+    if args.format is None:
+        args.format = "parquet" if pa is not None else "csv"
+    if args.format == "parquet" and pa is None:
+        print("pyarrow is not installed; pip install pyarrow or use --format csv", file=sys.stderr)
+        return 1
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    writer_class = ParquetTableWriter if args.format == "parquet" else CsvTableWriter
+    writers = {
+        name: writer_class(out_dir / f"{name}.{args.format}", columns, args.chunk_rows) for name, columns in TABLES.items()
+    }
+    exporter = Exporter(writers)
+    try:
+        if emulator:
+            export_emulator(exporter, emulator, args.project)
+        else:
+            export_files(exporter, [Path(p) for p in args.games or []], [Path(p) for p in args.events or []])
+    except (OSError, json.JSONDecodeError) as exc:
+        print(f"export failed: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        for writer in writers.values():
+            writer.close()
+    print(exporter.summary(args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Seeded deck permutations shared by the simulator and src/lib/magiDeck.ts.
+
+Stacks are permutations of catalogue indices (array('H')). The PRNG is
+mulberry32 and the shuffle consumes it exactly like `shuffle` in
+src/lib/magiData.ts, so a seed plus a draw cursor reproduces the same stacks
+on both sides.
+
+Usage:
+  python3 scripts/magi_deck.py --seed 42
+  python3 scripts/magi_deck.py --seed 42 --encode
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import sys
+from array import array
+
+CARD_COLORS = ["white", "red", "blue", "green", "yellow"]
+CARDS_PER_COLOR = 6
+
+# Keep in sync with BASE_SPIRITS / PAPER_DECK / MONSTER_DECK in src/lib/magiData.ts.
+BASE_SPIRITS = [
+    {
+        "id": "spirit-azure-chain",
+        "name": "蒼のチェイン",
+        "pattern": ["blue", "blue", "white"],
+        "effect": {"type": "resource", "resource": "move", "amount": 2},
+    },
+    {
+        "id": "spirit-verdant-guard",
+        "name": "深緑の守護",
+        "pattern": ["green", "green", "white"],
+        "effect": {"type": "resource", "resource": "intel", "amount": 2},
+    },
+    {
+        "id": "spirit-crimson-fang",
+        "name": "紅蓮の牙",
+        "pattern": ["red", "red", "white"],
+        "effect": {"type": "resource", "resource": "attack", "amount": 2},
+    },
+    {
+        "id": "spirit-golden-stream",
+        "name": "金色の奔流",
+        "pattern": ["yellow", "yellow", "white"],
+        "effect": {"type": "resource", "resource": "draw", "amount": 1},
+    },
+    {
+        "id": "spirit-prism-wish",
+        "name": "彩の祈り",
+        "pattern": ["blue", "green", "yellow"],
+        "effect": {"type": "score", "points": 3},
+    },
+]
+SPIRIT_IDS = [spirit["id"] for spirit in BASE_SPIRITS]
+PAPER_DECK = [
+    "古代術式論文",
+    "地脈観測報告",
+    "魔導式改良メモ",
+    "精霊契約研究",
+    "幻獣生態記録",
+]
+MONSTER_DECK = ["霧の獣", "鋼皮のゴーレム", "深淵の影", "雷角獣", "灼熱の飛竜"]
+
+# Shuffle order used by createStacks(seed); every stack draws from one PRNG stream.
+STACK_NAMES = ["cardDeck", "spiritDeck", "paperDeck", "monsterDeck"]
+
+UINT32_MASK = 0xFFFFFFFF
+
+
+def build_card_catalogue() -> list[dict]:
+    cards: list[dict] = []
+    idx = 1
+    for color in CARD_COLORS:
+        for count in range(CARDS_PER_COLOR):
+            cards.append({"id": f"card-{idx}", "color": color, "name": f"{color.upper()}-{count + 1}"})
+            idx += 1
+    return cards
+
+
+CARD_CATALOGUE = build_card_catalogue()
+
+CATALOGUE_SIZES = {
+    "cardDeck": len(CARD_CATALOGUE),
+    "spiritDeck": len(SPIRIT_IDS),
+    "paperDeck": len(PAPER_DECK),
+    "monsterDeck": len(MONSTER_DECK),
+}
+
+
+class Mulberry32:
+    """32-bit PRNG with a bit-exact TypeScript twin (`mulberry32` in magiDeck.ts)."""
+
+    def __init__(self, seed: int) -> None:
+        self.state = seed & UINT32_MASK
+
+    def next_uint32(self) -> int:
+        self.state = (self.state + 0x6D2B79F5) & UINT32_MASK
+        t = self.state
+        t = ((t ^ (t >> 15)) * (t | 1)) & UINT32_MASK
+        t = ((t + (((t ^ (t >> 7)) * (t | 61)) & UINT32_MASK)) & UINT32_MASK) ^ t
+        return (t ^ (t >> 14)) & UINT32_MASK
+
+    def below(self, bound: int) -> int:
+        # floor(u * bound / 2^32); exact in JS doubles while bound <= 2^21.
+        return (self.next_uint32() * bound) >> 32
+
+
+def shuffle_in_place(items: array | list, rng: Mulberry32) -> None:
+    for i in range(len(items) - 1, 0, -1):
+        j = rng.below(i + 1)
+        items[i], items[j] = items[j], items[i]
+
+
+def shuffled_indices(size: int, rng: Mulberry32) -> array:
+    order = array("H", range(size))
+    shuffle_in_place(order, rng)
+    return order
+
+
+def create_stacks(seed: int) -> dict[str, array]:
+    rng = Mulberry32(seed)
+    return {name: shuffled_indices(CATALOGUE_SIZES[name], rng) for name in STACK_NAMES}
+
+
+def draw(order: array, cursor: int, count: int) -> tuple[array, int]:
+    end = min(len(order), cursor + max(0, count))
+    return order[cursor:end], end
+
+
+def encode_indices(order: array) -> str:
+    data = array("H", order)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return base64.b64encode(data.tobytes()).decode("ascii")
+
+
+def decode_indices(encoded: str) -> array:
+    data = array("H")
+    data.frombytes(base64.b64decode(encoded))
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data
+
+
+def resolve_card(index: int) -> dict:
+    return CARD_CATALOGUE[index]
+
+
+def resolve_stack(name: str, order: array) -> list:
+    if name == "cardDeck":
+        return [CARD_CATALOGUE[i] for i in order]
+    if name == "spiritDeck":
+        return [BASE_SPIRITS[i] for i in order]
+    if name == "paperDeck":
+        return [PAPER_DECK[i] for i in order]
+    if name == "monsterDeck":
+        return [MONSTER_DECK[i] for i in order]
+    raise KeyError(name)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, required=True, help="32-bit deck seed")
+    parser.add_argument("--encode", action="store_true", help="Print base64-encoded index stacks instead of ids")
+    args = parser.parse_args()
+
+    stacks = create_stacks(args.seed)
+    if args.encode:
+        payload = {name: encode_indices(order) for name, order in stacks.items()}
+    else:
+        payload = {name: list(order) for name, order in stacks.items()}
+    payload["seed"] = args.seed & UINT32_MASK
+    print(json.dumps(payload, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
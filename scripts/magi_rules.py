@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""Python port of the MAGI CHAIN rules engine (src/lib/magiReducer.ts).
+
+States are the same JSON shape as `GameState` in magiTypes.ts, so documents
+exported from Firestore can be fed in directly. `reduce_game_state` mutates the
+state in place like the TypeScript reducer; use `clone_state` first when the
+original must be kept.
+
+Usage:
+  python3 scripts/magi_rules.py --players 2 --seed 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import random
+
+import magi_deck
+
+PHASES = ["play", "spirit", "move", "tile_action", "discard", "draw"]
+HAND_LIMIT = 8
+INITIAL_HAND_SIZE = 5
+
+RESOURCE_BY_COLOR = {
+    "blue": "move",
+    "red": "attack",
+    "green": "intel",
+    "yellow": "draw",
+    "white": None,
+}
+
+# Keep in sync with TILE_DEFS / ACTION_BY_TILE in src/lib/magiData.ts.
+TILE_DEFS = [
+    {"id": "city-1", "name": "交易都市", "type": "city", "x": 2, "y": 0},
+    {"id": "element-fire", "name": "火の属性地", "type": "element", "x": 1, "y": 1},
+    {"id": "danger-1", "name": "危険な道", "type": "danger", "x": 2, "y": 1},
+    {"id": "seed-1", "name": "聖樹の子株", "type": "seed", "x": 3, "y": 1},
+    {"id": "city-2", "name": "学術都市", "type": "city", "x": 0, "y": 2},
+    {"id": "monster-1", "name": "魔物地帯", "type": "monster", "x": 2, "y": 2},
+    {"id": "element-water", "name": "水の属性地", "type": "element", "x": 4, "y": 2},
+    {"id": "seed-2", "name": "芽吹きの森", "type": "seed", "x": 1, "y": 3},
+    {"id": "danger-2", "name": "崩落渓谷", "type": "danger", "x": 3, "y": 3},
+    {"id": "city-3", "name": "港街", "type": "city", "x": 2, "y": 4},
+]
+
+TILE_ACTIONS_BY_TYPE = {
+    "city": ["deliver"],
+    "danger": ["paper"],
+    "element": ["learn", "contract"],
+    "seed": ["upgrade", "contract"],
+    "monster": ["hunt"],
+}
+
+
+class RuleError(Exception):
+    """Raised where the TypeScript reducer throws `new Error(...)`."""
+
+
+def get_tile_map() -> dict[str, dict]:
+    tiles = [{**tile, "neighbors": []} for tile in TILE_DEFS]
+    for tile in tiles:
+        tile["neighbors"] = [
+            candidate["id"]
+            for candidate in tiles
+            if abs(candidate["x"] - tile["x"]) + abs(candidate["y"] - tile["y"]) == 1
+        ]
+    return {tile["id"]: tile for tile in tiles}
+
+
+TILE_MAP = get_tile_map()
+
+
+def now_iso() -> str:
+    return dt.datetime.now(dt.timezone.utc).isoformat()
+
+
+def create_empty_resources() -> dict[str, int]:
+    return {"move": 0, "attack": 0, "intel": 0, "draw": 0}
+
+
+def create_player_state(uid: str, name: str, seat: int) -> dict:
+    return {
+        "uid": uid,
+        "name": name,
+        "seat": seat,
+        "connected": True,
+        "lastSeenAt": now_iso(),
+        "score": 0,
+        "resources": create_empty_resources(),
+        "hand": [],
+        "field": [],
+        "spirits": [],
+        "boardPos": "city-1",
+        "inventory": {"papers": [], "monsters": [], "tools": []},
+    }
+
+
+def clone_player(player: dict) -> dict:
+    inventory = player["inventory"]
+    return {
+        **player,
+        "resources": dict(player["resources"]),
+        "hand": list(player["hand"]),
+        "field": list(player["field"]),
+        "spirits": list(player["spirits"]),
+        "inventory": {
+            "papers": list(inventory["papers"]),
+            "monsters": list(inventory["monsters"]),
+            "tools": list(inventory["tools"]),
+        },
+    }
+
+
+def clone_state(state: dict) -> dict:
+    # Cards and spirits are never mutated by the reducer, so they are shared.
+    turn = state["turn"]
+    return {
+        **state,
+        "turn": {**turn, "spiritsActivated": list(turn["spiritsActivated"])},
+        "players": {uid: clone_player(player) for uid, player in state["players"].items()},
+        "stacks": {name: list(stack) for name, stack in state["stacks"].items()},
+    }
+
+
+def shuffle(items: list, rng: random.Random | None = None) -> list:
+    array = list(items)
+    (rng or random).shuffle(array)
+    return array
+
+
+def draw_cards(deck: list, discard: list, count: int, rng: random.Random | None = None) -> tuple[list, list, list]:
+    next_deck = list(deck)
+    next_discard = list(discard)
+    drawn: list = []
+    while len(drawn) < count:
+        if not next_deck:
+            if not next_discard:
+                break
+            next_deck = shuffle(next_discard, rng)
+            next_discard = []
+        drawn.append(next_deck.pop(0))
+    return drawn, next_deck, next_discard
+
+
+def create_game(player_names: list[str], seed: int, game_id: str = "sim") -> dict:
+    """Running state equivalent to initializeGame(createLobbyGameState(...)) with createStacks(seed)."""
+    now = now_iso()
+    orders = magi_deck.create_stacks(seed)
+    stacks = {
+        "cardDeck": magi_deck.resolve_stack("cardDeck", orders["cardDeck"]),
+        "cardDiscard": [],
+        "spiritDeck": magi_deck.resolve_stack("spiritDeck", orders["spiritDeck"]),
+        "paperDeck": magi_deck.resolve_stack("paperDeck", orders["paperDeck"]),
+        "monsterDeck": magi_deck.resolve_stack("monsterDeck", orders["monsterDeck"]),
+    }
+    players: dict[str, dict] = {}
+    for seat, name in enumerate(player_names, 1):
+        uid = f"p{seat}"
+        player = create_player_state(uid, name, seat)
+        player["hand"], stacks["cardDeck"], stacks["cardDiscard"] = draw_cards(
+            stacks["cardDeck"], stacks["cardDiscard"], INITIAL_HAND_SIZE
+        )
+        players[uid] = player
+    first = min(players.values(), key=lambda p: p["seat"])
+    return {
+        "id": game_id,
+        "name": game_id,
+        "status": "running",
+        "phase": "play",
+        "turn": {"currentPlayerId": first["uid"], "turnNumber": 1, "spiritsActivated": [], "tileActionUsed": False},
+        "snapshotVersion": 0,
+        "maxPlayers": max(4, len(players)),
+        "memberIds": list(players),
+        "memberNames": {uid: p["name"] for uid, p in players.items()},
+        "players": players,
+        "stacks": stacks,
+        "rulesetVersion": "magi-chain-v3",
+        "createdAt": now,
+        "updatedAt": now,
+    }
+
+
+def require_running(state: dict) -> None:
+    if state["status"] != "running":
+        raise RuleError("Game is not running")
+
+
+def require_turn(state: dict, actor_id: str) -> None:
+    if state["turn"]["currentPlayerId"] != actor_id:
+        raise RuleError("Not your turn")
+
+
+def require_phase(state: dict, phase: str) -> None:
+    if state["phase"] != phase:
+        raise RuleError(f"Invalid phase: {state['phase']}")
+
+
+def get_player(state: dict, actor_id: str) -> dict:
+    player = state["players"].get(actor_id)
+    if not player:
+        raise RuleError("Player not in game")
+    return player
+
+
+def log_event(state: dict, action: dict, actor_id: str, message: str) -> dict:
+    event = {
+        "actorId": actor_id,
+        "action": action,
+        "message": message,
+        "createdAt": now_iso(),
+        "snapshotVersion": state["snapshotVersion"] + 1,
+    }
+    state["lastEvent"] = event
+    return event
+
+
+def matches_pattern(colors: list[str], pattern: list[str]) -> bool:
+    return colors == pattern
+
+
+def advance_turn(state: dict) -> None:
+    players = sorted(state["players"].values(), key=lambda p: p["seat"])
+    current_index = next(
+        (i for i, p in enumerate(players) if p["uid"] == state["turn"]["currentPlayerId"]),
+        -1,
+    )
+    next_index = 0 if current_index == -1 else (current_index + 1) % len(players)
+    next_turn_number = state["turn"]["turnNumber"] + 1 if next_index == 0 else state["turn"]["turnNumber"]
+    state["turn"] = {
+        "currentPlayerId": players[next_index]["uid"],
+        "turnNumber": next_turn_number,
+        "spiritsActivated": [],
+        "tileActionUsed": False,
+    }
+    state["phase"] = "play"
+    for player in state["players"].values():
+        player["resources"] = create_empty_resources()
+        player["field"] = []
+
+
+def clear_field_to_discard(state: dict, player: dict) -> None:
+    if not player["field"]:
+        return
+    state["stacks"]["cardDiscard"] = state["stacks"]["cardDiscard"] + player["field"]
+    player["field"] = []
+
+
+def enforce_hand_limit(player: dict) -> None:
+    if len(player["hand"]) > HAND_LIMIT:
+        player["hand"] = player["hand"][:HAND_LIMIT]
+
+
+def can_take_tile_action(tile_type: str, action_type: str) -> bool:
+    return action_type in TILE_ACTIONS_BY_TYPE.get(tile_type, [])
+
+
+def apply_tile_action(state: dict, player: dict, action_type: str, rng: random.Random | None = None) -> None:
+    tile = TILE_MAP.get(player["boardPos"])
+    if not tile:
+        raise RuleError("Unknown tile")
+    if not can_take_tile_action(tile["type"], action_type):
+        raise RuleError("Action not allowed on this tile")
+
+    stacks = state["stacks"]
+    resources = player["resources"]
+    inventory = player["inventory"]
+    if action_type == "learn":
+        if resources["intel"] < 1:
+            raise RuleError("Not enough intel")
+        resources["intel"] -= 1
+        drawn, stacks["cardDeck"], stacks["cardDiscard"] = draw_cards(stacks["cardDeck"], stacks["cardDiscard"], 1, rng)
+        player["hand"] = player["hand"] + drawn
+        enforce_hand_limit(player)
+    elif action_type == "upgrade":
+        if resources["intel"] < 1:
+            raise RuleError("Not enough intel")
+        resources["intel"] -= 1
+        inventory["tools"] = inventory["tools"] + [f"tool-{len(inventory['tools']) + 1}"]
+    elif action_type == "contract":
+        if resources["intel"] < 1:
+            raise RuleError("Not enough intel")
+        if not stacks["spiritDeck"]:
+            raise RuleError("No spirit cards left")
+        resources["intel"] -= 1
+        player["spirits"] = player["spirits"] + [stacks["spiritDeck"][0]]
+        stacks["spiritDeck"] = stacks["spiritDeck"][1:]
+    elif action_type == "paper":
+        if not stacks["paperDeck"]:
+            raise RuleError("No paper cards left")
+        inventory["papers"] = inventory["papers"] + [stacks["paperDeck"][0]]
+        stacks["paperDeck"] = stacks["paperDeck"][1:]
+    elif action_type == "hunt":
+        if resources["attack"] < 1:
+            raise RuleError("Not enough attack")
+        if not stacks["monsterDeck"]:
+            raise RuleError("No monster cards left")
+        resources["attack"] -= 1
+        inventory["monsters"] = inventory["monsters"] + [stacks["monsterDeck"][0]]
+        stacks["monsterDeck"] = stacks["monsterDeck"][1:]
+    elif action_type == "deliver":
+        if not inventory["papers"] and not inventory["monsters"]:
+            raise RuleError("No delivery items")
+        if inventory["papers"]:
+            inventory["papers"] = inventory["papers"][1:]
+        else:
+            inventory["monsters"] = inventory["monsters"][1:]
+        player["score"] += 2
+    else:
+        raise RuleError("Unknown action")
+
+
+def reduce_game_state(state: dict, action: dict, actor_id: str, rng: random.Random | None = None) -> dict:
+    require_running(state)
+    require_turn(state, actor_id)
+
+    player = get_player(state, actor_id)
+    player["connected"] = True
+    player["lastSeenAt"] = now_iso()
+    action_type = action.get("type")
+
+    if action_type == "play_card":
+        require_phase(state, "play")
+        card_index = next((i for i, card in enumerate(player["hand"]) if card["id"] == action.get("cardId")), -1)
+        if card_index == -1:
+            raise RuleError("Card not in hand")
+        card = player["hand"].pop(card_index)
+        player["field"] = player["field"] + [card]
+        resource = RESOURCE_BY_COLOR.get(card["color"])
+        if resource:
+            player["resources"][resource] += 1
+        return log_event(state, action, actor_id, f"{player['name']} がカードをプレイしました")
+    if action_type == "confirm_play":
+        require_phase(state, "play")
+        state["phase"] = "spirit"
+        return log_event(state, action, actor_id, f"{player['name']} がプレイを確定しました")
+    if action_type == "activate_spirit":
+        require_phase(state, "spirit")
+        if action.get("spiritId") in state["turn"]["spiritsActivated"]:
+            raise RuleError("Spirit already activated")
+        spirit = next((item for item in player["spirits"] if item["id"] == action.get("spiritId")), None)
+        if not spirit:
+            raise RuleError("Spirit not owned")
+        if not matches_pattern([card["color"] for card in player["field"]], spirit["pattern"]):
+            raise RuleError("Spirit pattern not matched")
+        effect = spirit["effect"]
+        if effect["type"] == "resource":
+            player["resources"][effect["resource"]] += effect["amount"]
+        else:
+            player["score"] += effect["points"]
+        state["turn"]["spiritsActivated"] = state["turn"]["spiritsActivated"] + [spirit["id"]]
+        return log_event(state, action, actor_id, f"{player['name']} が精霊 {spirit['name']} を発動しました")
+    if action_type == "confirm_spirit":
+        require_phase(state, "spirit")
+        state["phase"] = "move"
+        return log_event(state, action, actor_id, f"{player['name']} が精霊フェイズを終了しました")
+    if action_type == "move":
+        require_phase(state, "move")
+        if player["resources"]["move"] < 1:
+            raise RuleError("No move points")
+        current = TILE_MAP.get(player["boardPos"])
+        target = TILE_MAP.get(action.get("targetId"))
+        if not current or not target:
+            raise RuleError("Unknown tile")
+        if target["id"] not in current["neighbors"]:
+            raise RuleError("Tile not adjacent")
+        if target["type"] != "city" and any(
+            other["uid"] != player["uid"] and other["boardPos"] == target["id"] for other in state["players"].values()
+        ):
+            raise RuleError("Tile occupied")
+        player["boardPos"] = target["id"]
+        player["resources"]["move"] -= 1
+        return log_event(state, action, actor_id, f"{player['name']} が移動しました")
+    if action_type == "confirm_move":
+        require_phase(state, "move")
+        state["phase"] = "tile_action"
+        return log_event(state, action, actor_id, f"{player['name']} が移動を確定しました")
+    if action_type == "tile_action":
+        require_phase(state, "tile_action")
+        if state["turn"]["tileActionUsed"]:
+            raise RuleError("Tile action already used")
+        apply_tile_action(state, player, action.get("actionType"), rng)
+        state["turn"]["tileActionUsed"] = True
+        return log_event(state, action, actor_id, f"{player['name']} がマスアクションを実行しました")
+    if action_type == "end_tile_action":
+        require_phase(state, "tile_action")
+        clear_field_to_discard(state, player)
+        state["phase"] = "discard"
+        return log_event(state, action, actor_id, f"{player['name']} がマスアクションを終了しました")
+    if action_type == "confirm_discard":
+        require_phase(state, "discard")
+        state["phase"] = "draw"
+        return log_event(state, action, actor_id, f"{player['name']} が捨て札を確定しました")
+    if action_type == "confirm_draw":
+        require_phase(state, "draw")
+        stacks = state["stacks"]
+        drawn, stacks["cardDeck"], stacks["cardDiscard"] = draw_cards(
+            stacks["cardDeck"], stacks["cardDiscard"], max(0, player["resources"]["draw"]), rng
+        )
+        player["hand"] = player["hand"] + drawn
+        enforce_hand_limit(player)
+        advance_turn(state)
+        return log_event(state, action, actor_id, f"{player['name']} が手札を補充しました")
+    raise RuleError("Unknown action")
+
+
+def check_game_end(state: dict) -> None:
+    stacks = state["stacks"]
+    if any(not stacks[name] for name in ("cardDeck", "spiritDeck", "paperDeck", "monsterDeck")):
+        state["status"] = "finished"
+
+
+def apply_action(state: dict, action: dict, actor_id: str, rng: random.Random | None = None) -> dict:
+    """Reduce, bump the snapshot and check for game end, as /api/game/action does."""
+    event = reduce_game_state(state, action, actor_id, rng)
+    state["snapshotVersion"] += 1
+    state["updatedAt"] = event["createdAt"]
+    check_game_end(state)
+    return event
+
+
+def legal_actions(state: dict) -> list[dict]:
+    """Actions the current player can take without the reducer throwing."""
+    if state["status"] != "running":
+        return []
+    player = state["players"][state["turn"]["currentPlayerId"]]
+    phase = state["phase"]
+    actions: list[dict] = []
+    if phase == "play":
+        seen: set[str] = set()
+        for card in player["hand"]:
+            if card["id"] not in seen:
+                seen.add(card["id"])
+                actions.append({"type": "play_card", "cardId": card["id"]})
+        actions.append({"type": "confirm_play"})
+    elif phase == "spirit":
+        colors = [card["color"] for card in player["field"]]
+        for spirit in player["spirits"]:
+            if spirit["id"] not in state["turn"]["spiritsActivated"] and matches_pattern(colors, spirit["pattern"]):
+                actions.append({"type": "activate_spirit", "spiritId": spirit["id"]})
+        actions.append({"type": "confirm_spirit"})
+    elif phase == "move":
+        if player["resources"]["move"] >= 1:
+            for target_id in TILE_MAP[player["boardPos"]]["neighbors"]:
+                target = TILE_MAP[target_id]
+                occupied = target["type"] != "city" and any(
+                    other["uid"] != player["uid"] and other["boardPos"] == target_id
+                    for other in state["players"].values()
+                )
+                if not occupied:
+                    actions.append({"type": "move", "targetId": target_id})
+        actions.append({"type": "confirm_move"})
+    elif phase == "tile_action":
+        if not state["turn"]["tileActionUsed"]:
+            for action_type in TILE_ACTIONS_BY_TYPE[TILE_MAP[player["boardPos"]]["type"]]:
+                if tile_action_allowed(state, player, action_type):
+                    actions.append({"type": "tile_action", "actionType": action_type})
+        actions.append({"type": "end_tile_action"})
+    elif phase == "discard":
+        actions.append({"type": "confirm_discard"})
+    elif phase == "draw":
+        actions.append({"type": "confirm_draw"})
+    return actions
+
+
+def tile_action_allowed(state: dict, player: dict, action_type: str) -> bool:
+    resources = player["resources"]
+    stacks = state["stacks"]
+    inventory = player["inventory"]
+    if action_type in ("learn", "upgrade"):
+        return resources["intel"] >= 1
+    if action_type == "contract":
+        return resources["intel"] >= 1 and bool(stacks["spiritDeck"])
+    if action_type == "paper":
+        return bool(stacks["paperDeck"])
+    if action_type == "hunt":
+        return resources["attack"] >= 1 and bool(stacks["monsterDeck"])
+    if action_type == "deliver":
+        return bool(inventory["papers"] or inventory["monsters"])
+    return False
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=1, help="Number of players (1-4)")
+    parser.add_argument("--seed", type=int, default=0, help="Deck seed (see magi_deck.py)")
+    parser.add_argument("--max-actions", type=int, default=2000, help="Stop a random playout after N actions")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    state = create_game([f"Player {i}" for i in range(1, args.players + 1)], args.seed)
+    actions = 0
+    while state["status"] == "running" and actions < args.max_actions:
+        action = rng.choice(legal_actions(state))
+        apply_action(state, action, state["turn"]["currentPlayerId"], rng)
+        actions += 1
+    summary = {
+        "status": state["status"],
+        "actions": actions,
+        "turnNumber": state["turn"]["turnNumber"],
+        "scores": {uid: p["score"] for uid, p in state["players"].items()},
+    }
+    print(json.dumps(summary, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
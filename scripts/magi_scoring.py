@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""End-game scoring (spec §8) maintained incrementally from game events.
+
+`ScoreBoard.apply(event)` updates per-player, per-city delivery counters and
+VP subtotals from a single `GameEvent`, touching only the acting player (and
+the city's leaders for a delivery), so `leaderboard()` stays O(players).
+Positions are tracked from `move` events, which is all the majority rule needs.
+
+Components:
+- score:    in-game VP already on PlayerState.score (delivery rewards, score spirits)
+- majority: 10 VP per city where the player has the most deliveries (ties all score)
+- tools:    TOOL_VP per upgraded travel tool
+- spirits:  4 VP per contracted spirit
+Deck bonus and noise cards (§8.5/§8.6) are not represented in GameState yet,
+so they have no component here.
+
+Usage:
+  python3 scripts/magi_scoring.py --verify --games 50
+  python3 scripts/magi_scoring.py --state game.json --events events.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+import magi_deck
+import magi_rules
+
+MAJORITY_VP = 10
+SPIRIT_VP = 4
+TOOL_VP = 1
+COMPONENTS = ["score", "majority", "tools", "spirits"]
+
+SPIRITS_BY_ID = {spirit["id"]: spirit for spirit in magi_deck.BASE_SPIRITS}
+# Playout weights for --verify; uniform play almost never delivers anything.
+VERIFY_WEIGHTS = {"tile_action": 20, "play_card": 6, "move": 4}
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+class ScoreBoard:
+    def __init__(self, player_ids: list[str], start_tile: str = "city-1") -> None:
+        self.positions = {uid: start_tile for uid in player_ids}
+        # city -> uid -> deliveries
+        self.deliveries: dict[str, dict[str, int]] = {}
+        # city -> (best count, leaders)
+        self.leaders: dict[str, tuple[int, set[str]]] = {}
+        self.subtotals = {uid: dict.fromkeys(COMPONENTS, 0) for uid in player_ids}
+        self.totals = dict.fromkeys(player_ids, 0)
+
+    def _add(self, uid: str, component: str, delta: int) -> None:
+        if uid not in self.subtotals:
+            self.positions.setdefault(uid, "city-1")
+            self.subtotals[uid] = dict.fromkeys(COMPONENTS, 0)
+            self.totals[uid] = 0
+        self.subtotals[uid][component] += delta
+        self.totals[uid] += delta
+
+    def _deliver(self, uid: str) -> None:
+        city = self.positions.get(uid, "city-1")
+        counts = self.deliveries.setdefault(city, {})
+        counts[uid] = counts.get(uid, 0) + 1
+        best, leaders = self.leaders.get(city, (0, set()))
+        count = counts[uid]
+        if count > best:
+            for leader in leaders - {uid}:
+                self._add(leader, "majority", -MAJORITY_VP)
+            if uid not in leaders:
+                self._add(uid, "majority", MAJORITY_VP)
+            self.leaders[city] = (count, {uid})
+        elif count == best and uid not in leaders:
+            self._add(uid, "majority", MAJORITY_VP)
+            self.leaders[city] = (best, leaders | {uid})
+        self._add(uid, "score", 2)
+
+    def apply(self, event: dict) -> None:
+        uid = event["actorId"]
+        action = event["action"]
+        action_type = action.get("type")
+        if action_type == "move":
+            self.positions[uid] = action["targetId"]
+        elif action_type == "activate_spirit":
+            effect = SPIRITS_BY_ID[action["spiritId"]]["effect"]
+            if effect["type"] == "score":
+                self._add(uid, "score", effect["points"])
+        elif action_type == "tile_action":
+            kind = action.get("actionType")
+            if kind == "deliver":
+                self._deliver(uid)
+            elif kind == "upgrade":
+                self._add(uid, "tools", TOOL_VP)
+            elif kind == "contract":
+                self._add(uid, "spirits", SPIRIT_VP)
+
+    def leaderboard(self) -> list[dict]:
+        ranked = sorted(self.totals.items(), key=lambda item: item[1], reverse=True)
+        return [{"uid": uid, "total": total, **self.subtotals[uid]} for uid, total in ranked]
+
+
+def majority_points(deliveries: list[tuple[str, str]]) -> dict[str, int]:
+    by_city: dict[str, dict[str, int]] = {}
+    for uid, city in deliveries:
+        counts = by_city.setdefault(city, {})
+        counts[uid] = counts.get(uid, 0) + 1
+    points: dict[str, int] = {}
+    for counts in by_city.values():
+        best = max(counts.values())
+        for uid, count in counts.items():
+            if count == best:
+                points[uid] = points.get(uid, 0) + MAJORITY_VP
+    return points
+
+
+def full_recompute(state: dict, deliveries: list[tuple[str, str]]) -> dict[str, dict[str, int]]:
+    """Score from scratch: final PlayerState inventories plus the (uid, city) delivery log."""
+    majority = majority_points(deliveries)
+    result: dict[str, dict[str, int]] = {}
+    for uid, player in state["players"].items():
+        inventory = player["inventory"]
+        subtotals = {
+            "score": player["score"],
+            "majority": majority.get(uid, 0),
+            "tools": TOOL_VP * len(inventory["tools"]),
+            "spirits": SPIRIT_VP * len(player["spirits"]),
+        }
+        result[uid] = {"total": sum(subtotals.values()), **subtotals}
+    return result
+
+
+def verify_majorities(rounds: int, rng: random.Random) -> list[str]:
+    # Real playouts end after a handful of deliveries, so drive the tie and
+    # lead-change paths with a synthetic stream of moves and deliveries.
+    errors: list[str] = []
+    cities = [tile["id"] for tile in magi_rules.TILE_DEFS if tile["type"] == "city"]
+    players = ["p1", "p2", "p3", "p4"]
+    board = ScoreBoard(players)
+    deliveries: list[tuple[str, str]] = []
+    for step in range(rounds):
+        uid = rng.choice(players)
+        if rng.random() < 0.4:
+            board.apply({"actorId": uid, "action": {"type": "move", "targetId": rng.choice(cities)}})
+            continue
+        deliveries.append((uid, board.positions[uid]))
+        board.apply({"actorId": uid, "action": {"type": "tile_action", "actionType": "deliver"}})
+        expected = majority_points(deliveries)
+        actual = {p: board.subtotals[p]["majority"] for p in players if board.subtotals[p]["majority"]}
+        if actual != expected:
+            errors.append(f"synthetic step {step}: incremental majority {actual} != recompute {expected}")
+            break
+    return errors
+
+
+def verify(games: int, seed: int) -> int:
+    rng = random.Random(seed)
+    errors = verify_majorities(games * 20, rng)
+    for game in range(games):
+        state = magi_rules.create_game([f"P{i}" for i in range(1, rng.randint(1, 4) + 1)], rng.randrange(1 << 32))
+        board = ScoreBoard(list(state["players"]))
+        deliveries: list[tuple[str, str]] = []
+        steps = 0
+        while state["status"] == "running" and steps < 3000:
+            actions = magi_rules.legal_actions(state)
+            action = rng.choices(actions, weights=[VERIFY_WEIGHTS.get(a["type"], 1) for a in actions])[0]
+            actor = state["turn"]["currentPlayerId"]
+            if action.get("actionType") == "deliver":
+                deliveries.append((actor, state["players"][actor]["boardPos"]))
+            board.apply(magi_rules.apply_action(state, action, actor, rng))
+            steps += 1
+            expected = full_recompute(state, deliveries)
+            actual = {row["uid"]: {k: v for k, v in row.items() if k != "uid"} for row in board.leaderboard()}
+            if actual != expected:
+                errors.append(f"game {game} step {steps}: incremental {actual} != recompute {expected}")
+                break
+    if errors:
+        print("Scoring verification FAILED with errors:", file=sys.stderr)
+        for error in errors:
+            print(f"- {error}", file=sys.stderr)
+        return 1
+    print(f"Scoring verification SUCCESS ({games} games).")
+    return 0
+
+
+def load_events(path: Path) -> list[dict]:
+    raw = read_text(path).strip()
+    if raw.startswith("["):
+        events = json.loads(raw)
+    else:
+        events = [json.loads(line) for line in raw.splitlines() if line.strip()]
+    return sorted(events, key=lambda event: event.get("snapshotVersion", 0))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verify", action="store_true", help="Cross-check incremental scoring against a full recompute")
+    parser.add_argument("--games", type=int, default=50, help="Simulated games for --verify")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --verify")
+    parser.add_argument("--state", default=None, help="GameState JSON (for the player list)")
+    parser.add_argument("--events", default=None, help="Exported events (JSON array or JSON lines)")
+    args = parser.parse_args()
+
+    if args.verify:
+        return verify(args.games, args.seed)
+    if not args.state or not args.events:
+        print("--state and --events are required unless --verify is given", file=sys.stderr)
+        return 1
+    state = json.loads(read_text(Path(args.state)))
+    board = ScoreBoard(list(state["players"]))
+    for event in load_events(Path(args.events)):
+        board.apply(event)
+    print(json.dumps(board.leaderboard(), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""Profile the size of autosaved GameState snapshots (spec §9.4) and their write cost.
+
+Every action rewrites the full games/{id} document and adds an events/{id}
+document. This reads exported snapshots (or simulates games with
+magi_rules.py), sizes each document with Firestore's storage-size rules
+(string = UTF-8 bytes + 1, number = 8, map = field names + values, plus the
+document name and 32 bytes), and reports:
+
+- bytes per field path (players.*.hand, stacks.cardDeck, lastEvent, ...)
+- writes and mean size per phase the snapshot was saved in
+- writes and bytes per game-hour, from updatedAt/createdAt spans or
+  --seconds-per-action when the export carries no usable timestamps
+- the same numbers for alternative encodings, each measured on the same
+  snapshots rather than estimated
+
+Usage:
+  python3 scripts/magi_snapshot_profile.py --simulate 20 --players 4
+  python3 scripts/magi_snapshot_profile.py --snapshots export.jsonl --events events.jsonl
+  python3 scripts/magi_snapshot_profile.py --snapshots game.json --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import random
+import sys
+from array import array
+from pathlib import Path
+
+import magi_deck
+import magi_rules
+
+DOCUMENT_OVERHEAD = 32
+DOCUMENT_NAME_OVERHEAD = 16
+MAX_DOCUMENT_BYTES = 1 << 20
+AUTO_ID_LENGTH = 20
+# Maps keyed by player uid; their keys are folded to "*" in field paths.
+DYNAMIC_MAPS = {"players", "memberNames"}
+CARD_INDEX = {card["id"]: i for i, card in enumerate(magi_deck.CARD_CATALOGUE)}
+SPIRIT_INDEX = {spirit["id"]: i for i, spirit in enumerate(magi_deck.BASE_SPIRITS)}
+STRING_CATALOGUES = {"paperDeck": magi_deck.PAPER_DECK, "monsterDeck": magi_deck.MONSTER_DECK}
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def string_size(value: str) -> int:
+    return len(value.encode("utf-8")) + 1
+
+
+def firestore_size(value: object) -> int:
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 8
+    if isinstance(value, str):
+        return string_size(value)
+    if isinstance(value, dict):
+        return sum(string_size(key) + firestore_size(child) for key, child in value.items())
+    if isinstance(value, list):
+        return sum(firestore_size(child) for child in value)
+    raise TypeError(f"unsupported value: {type(value).__name__}")
+
+
+def document_name_size(path: str) -> int:
+    return sum(string_size(segment) for segment in path.split("/")) + DOCUMENT_NAME_OVERHEAD
+
+
+def document_size(path: str, data: dict) -> int:
+    return document_name_size(path) + firestore_size(data) + DOCUMENT_OVERHEAD
+
+
+def game_path(state: dict) -> str:
+    return f"games/{state.get('id', 'game')}"
+
+
+def event_path(state: dict) -> str:
+    return f"{game_path(state)}/events/{'x' * AUTO_ID_LENGTH}"
+
+
+def field_breakdown(data: dict, depth: int) -> dict[str, int]:
+    """Field path -> bytes, field names included; the values sum to firestore_size(data)."""
+    totals: dict[str, int] = {}
+
+    def walk(value: object, path: str, level: int) -> None:
+        if isinstance(value, dict) and level < depth:
+            label_all = path.rsplit(".", 1)[-1] in DYNAMIC_MAPS
+            for key, child in value.items():
+                child_path = f"{path}.{'*' if label_all else key}" if path else key
+                totals[child_path] = totals.get(child_path, 0) + string_size(key)
+                walk(child, child_path, level + 1)
+            return
+        totals[path] = totals.get(path, 0) + firestore_size(value)
+
+    walk(data, "", 0)
+    return totals
+
+
+def leaf_fields(data: dict, depth: int) -> dict[str, object]:
+    """Field path (real keys) -> value at `depth`, the granularity of an update() with field paths."""
+    fields: dict[str, object] = {}
+
+    def walk(value: object, path: str, level: int) -> None:
+        if isinstance(value, dict) and value and level < depth:
+            for key, child in value.items():
+                walk(child, f"{path}.{key}" if path else key, level + 1)
+            return
+        fields[path] = value
+
+    walk(data, "", 0)
+    return fields
+
+
+def to_catalogue_indices(value: object, stack: str | None = None) -> object:
+    # Cards and spirits are immutable catalogue entries, so an index identifies them.
+    if isinstance(value, dict):
+        if value.get("id") in CARD_INDEX and "color" in value:
+            return CARD_INDEX[value["id"]]
+        if value.get("id") in SPIRIT_INDEX and "pattern" in value:
+            return SPIRIT_INDEX[value["id"]]
+        return {key: to_catalogue_indices(child, key) for key, child in value.items()}
+    if isinstance(value, list):
+        catalogue = STRING_CATALOGUES.get(stack or "")
+        if catalogue and all(isinstance(item, str) and item in catalogue for item in value):
+            return [catalogue.index(item) for item in value]
+        return [to_catalogue_indices(child) for child in value]
+    return value
+
+
+def pack_index_lists(value: object) -> object:
+    if isinstance(value, dict):
+        return {key: pack_index_lists(child) for key, child in value.items()}
+    if isinstance(value, list):
+        if value and all(isinstance(item, int) and not isinstance(item, bool) and 0 <= item < 1 << 16 for item in value):
+            return magi_deck.encode_indices(array("H", value))
+        return [pack_index_lists(child) for child in value]
+    return value
+
+
+def drop_last_event(state: dict) -> dict:
+    # lastEvent duplicates the events/ document written alongside the snapshot.
+    return {key: value for key, value in state.items() if key != "lastEvent"}
+
+
+# name -> (description, transform, write only changed fields)
+ENCODINGS = {
+    "full": ("full GameState via set(), as today", lambda s: s, False),
+    "catalogue-indices": ("cards/spirits/papers/monsters as catalogue indices", to_catalogue_indices, False),
+    "packed-stacks": ("catalogue indices, index lists as base64 uint16", lambda s: pack_index_lists(to_catalogue_indices(s)), False),
+    "no-last-event": ("full GameState without lastEvent", drop_last_event, False),
+    "field-delta": ("update() of changed fields only", lambda s: s, True),
+    "combined": (
+        "packed-stacks + no-last-event + field-delta",
+        lambda s: drop_last_event(pack_index_lists(to_catalogue_indices(s))),
+        True,
+    ),
+}
+
+
+def delta_size(path: str, previous: dict | None, current: dict, depth: int) -> int:
+    if previous is None:
+        return document_size(path, current)
+    before = leaf_fields(previous, depth)
+    after = leaf_fields(current, depth)
+    size = document_name_size(path)
+    for field, value in after.items():
+        if field not in before or before[field] != value:
+            size += string_size(field) + firestore_size(value)
+    for field in before.keys() - after.keys():
+        size += string_size(field)
+    return size
+
+
+def parse_ts(value: object) -> float | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return dt.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def load_documents(path: Path) -> list[dict]:
+    raw = read_text(path).strip()
+    if not raw:
+        return []
+    if raw.startswith("["):
+        return json.loads(raw)
+    if raw.startswith("{") and "\n{" not in raw:
+        return [json.loads(raw)]
+    return [json.loads(line) for line in raw.splitlines() if line.strip()]
+
+
+def simulate(games: int, players: int, seed: int, max_actions: int) -> tuple[list[dict], list[dict]]:
+    rng = random.Random(seed)
+    snapshots: list[dict] = []
+    events: list[dict] = []
+    for game in range(games):
+        state = magi_rules.create_game([f"Player {i}" for i in range(1, players + 1)], rng.randrange(1 << 32), f"sim-{game}")
+        actions = 0
+        while state["status"] == "running" and actions < max_actions:
+            action = rng.choice(magi_rules.legal_actions(state))
+            event = magi_rules.apply_action(state, action, state["turn"]["currentPlayerId"], rng)
+            # The reducer shares unchanged objects between states; a JSON round trip is an export.
+            snapshots.append(json.loads(json.dumps(state, ensure_ascii=False)))
+            events.append({**event, "gameId": state["id"]})
+            actions += 1
+    return snapshots, events
+
+
+def profile(snapshots: list[dict], events: list[dict], depth: int, seconds_per_action: float) -> dict:
+    by_game: dict[str, list[dict]] = {}
+    for snapshot in snapshots:
+        by_game.setdefault(snapshot.get("id", "game"), []).append(snapshot)
+    events_by_game: dict[str, list[dict]] = {}
+    for event in events:
+        events_by_game.setdefault(event.get("gameId", next(iter(by_game), "game")), []).append(event)
+
+    fields: dict[str, int] = {}
+    phases: dict[str, list[int]] = {}
+    encodings = {name: {"bytes": 0, "max": 0} for name in ENCODINGS}
+    sizes: list[int] = []
+    event_bytes = 0
+    hours = 0.0
+    for game_id, game_snapshots in by_game.items():
+        game_snapshots.sort(key=lambda s: s.get("snapshotVersion", 0))
+        game_events = events_by_game.get(game_id, [])
+        previous: dict[str, dict | None] = dict.fromkeys(ENCODINGS)
+        for snapshot in game_snapshots:
+            path = game_path(snapshot)
+            size = document_size(path, snapshot)
+            sizes.append(size)
+            slot = phases.setdefault(snapshot.get("phase", "?"), [0, 0])
+            slot[0] += 1
+            slot[1] += size
+            for field, count in field_breakdown(snapshot, depth).items():
+                fields[field] = fields.get(field, 0) + count
+            for name, (_, transform, delta) in ENCODINGS.items():
+                encoded = transform(snapshot)
+                written = delta_size(path, previous[name], encoded, depth) if delta else document_size(path, encoded)
+                previous[name] = encoded
+                encodings[name]["bytes"] += written
+                encodings[name]["max"] = max(encodings[name]["max"], written)
+        for event in game_events:
+            event_bytes += document_size(event_path(game_snapshots[0]), {k: v for k, v in event.items() if k != "gameId"})
+        stamps = [t for t in (parse_ts(s.get("updatedAt")) for s in game_snapshots) if t is not None]
+        stamps += [t for t in (parse_ts(e.get("createdAt")) for e in game_events) if t is not None]
+        span = max(stamps) - min(stamps) if len(stamps) > 1 else 0.0
+        # Simulated games (and exports without timestamps) take --seconds-per-action.
+        hours += (span if span >= len(game_snapshots) else len(game_snapshots) * seconds_per_action) / 3600
+
+    writes = len(sizes)
+    total = sum(sizes)
+    return {
+        "games": len(by_game),
+        "snapshots": writes,
+        "events": len(events),
+        "game_hours": hours,
+        "mean_snapshot_bytes": total / writes if writes else 0,
+        "max_snapshot_bytes": max(sizes, default=0),
+        "event_bytes": event_bytes,
+        "fields": {
+            field: {"mean_bytes": count / writes, "share": count / total if total else 0}
+            for field, count in sorted(fields.items(), key=lambda item: item[1], reverse=True)
+        },
+        "phases": {
+            phase: {"writes": count, "mean_bytes": size / count}
+            for phase, (count, size) in sorted(phases.items(), key=lambda item: item[1][1], reverse=True)
+        },
+        "encodings": {
+            name: {
+                "description": ENCODINGS[name][0],
+                "mean_bytes": data["bytes"] / writes if writes else 0,
+                "max_bytes": data["max"],
+                "reduction": 1 - data["bytes"] / encodings["full"]["bytes"] if encodings["full"]["bytes"] else 0,
+                "bytes_per_game_hour": (data["bytes"] + event_bytes) / hours if hours else 0,
+            }
+            for name, data in encodings.items()
+        },
+        "writes_per_game_hour": (writes + len(events)) / hours if hours else 0,
+    }
+
+
+def format_report(report: dict, top: int) -> str:
+    kib = 1024
+    lines = [
+        "# GameState snapshot profile",
+        "",
+        f"- {report['games']} game(s), {report['snapshots']} snapshots, {report['events']} events, "
+        f"{report['game_hours']:.2f} game-hours",
+        f"- Snapshot size: mean {report['mean_snapshot_bytes'] / kib:.1f} KiB, max {report['max_snapshot_bytes'] / kib:.1f} KiB "
+        f"({report['max_snapshot_bytes'] / MAX_DOCUMENT_BYTES:.1%} of the 1 MiB limit)",
+        f"- Writes per game-hour: {report['writes_per_game_hour']:.0f} (snapshots + events)",
+        "",
+        "## Bytes by field path",
+        "",
+        "| field | mean bytes | share |",
+        "| - | - | - |",
+    ]
+    for field, data in list(report["fields"].items())[:top]:
+        lines.append(f"| {field} | {data['mean_bytes']:.0f} | {data['share']:.1%} |")
+    lines += ["", "## By phase saved", "", "| phase | writes | mean bytes |", "| - | - | - |"]
+    for phase, data in report["phases"].items():
+        lines.append(f"| {phase} | {data['writes']} | {data['mean_bytes']:.0f} |")
+    lines += [
+        "",
+        "## Encodings",
+        "",
+        "| encoding | what is written | mean bytes/write | max bytes | vs full | MiB per game-hour |",
+        "| - | - | - | - | - | - |",
+    ]
+    for name, data in report["encodings"].items():
+        lines.append(
+            f"| {name} | {data['description']} | {data['mean_bytes']:.0f} | {data['max_bytes']} | "
+            f"-{data['reduction']:.0%} | {data['bytes_per_game_hour'] / kib / kib:.2f} |"
+        )
+    lines.append("")
+    lines.append("Per game-hour figures include the events/ documents, which no encoding changes.")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--snapshots", action="append", default=None, help="Exported GameState documents (JSON, JSON array or JSON lines; repeatable)")
+    parser.add_argument("--events", action="append", default=None, help="Exported event documents (repeatable)")
+    parser.add_argument("--simulate", type=int, default=0, help="Simulate N games with magi_rules.py instead of reading exports")
+    parser.add_argument("--players", type=int, default=4, help="Players per simulated game")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --simulate")
+    parser.add_argument("--max-actions", type=int, default=2000, help="Stop a simulated game after N actions")
+    parser.add_argument("--seconds-per-action", type=float, default=15.0, help="Pace assumed when snapshots carry no usable timestamps")
+    parser.add_argument("--depth", type=int, default=3, help="Field path depth for the breakdown and for field-delta")
+    parser.add_argument("--top", type=int, default=20, help="Field paths to show")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.simulate:
+        snapshots, events = simulate(args.simulate, args.players, args.seed, args.max_actions)
+    elif args.snapshots:
+        snapshots = [doc for path in args.snapshots for doc in load_documents(Path(path))]
+        events = [doc for path in args.events or [] for doc in load_documents(Path(path))]
+    else:
+        print("--snapshots or --simulate is required", file=sys.stderr)
+        return 1
+    if not snapshots:
+        print("no snapshots found", file=sys.stderr)
+        return 1
+
+    report = profile(snapshots, events, args.depth, args.seconds_per_action)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
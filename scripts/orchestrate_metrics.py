@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Serve live metrics for auto_orchestrate.py runs on this host.
+
+Every scrape reads runs/*/events.jsonl, status.json and auto_continue.log,
+archived runs included (events files are re-parsed only when they change),
+and reports active steps, step counts by status, retries, queue depth and the
+CPU/RSS of each running orchestrator's child processes (from /proc, so Linux
+only).
+
+Endpoints:
+  /metrics       Prometheus text format
+  /metrics.json  the same data as JSON
+
+Usage:
+  python3 scripts/orchestrate_metrics.py --port 9464
+  python3 scripts/orchestrate_metrics.py --runs-dir runs --runs-dir ../other/runs
+  python3 scripts/orchestrate_metrics.py --once json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import run_archive
+
+OUTCOME_EVENTS = ("ok", "failed", "timeout", "cancelled", "skipped-existing", "skipped-before-start")
+DONE_EVENTS = ("ok", "skipped-existing", "skipped-before-start")
+PROC = Path("/proc")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# events.jsonl path -> (version, summary); version is (size, mtime_ns) on disk or the archived blob hash.
+_EVENTS_CACHE: dict[str, tuple[object, dict]] = {}
+
+
+def parse_ts(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return dt.datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def summarize_events(view: run_archive.RunView) -> dict:
+    path = view.run_dir / "events.jsonl"
+    if path.exists():
+        stat = path.stat()
+        version: object = (stat.st_size, stat.st_mtime_ns)
+    else:
+        version = view.archived["events.jsonl"]
+    cached = _EVENTS_CACHE.get(str(path))
+    if cached and cached[0] == version:
+        return cached[1]
+    summary: dict = {
+        "counts": dict.fromkeys(OUTCOME_EVENTS, 0),
+        "retries": 0,
+        "hedges": 0,
+        "done_steps": [],
+        "last_outcome_at": {},
+        "durations": {},
+    }
+    done: set[int] = set()
+    for line in view.read_text("events.jsonl").splitlines():
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        kind = event.get("event")
+        if kind in OUTCOME_EVENTS:
+            summary["counts"][kind] += 1
+            step = event.get("step")
+            summary["last_outcome_at"][step] = parse_ts(event.get("ts")) or 0.0
+            if kind in DONE_EVENTS:
+                done.add(step)
+            if kind == "ok" and isinstance(event.get("elapsed"), (int, float)):
+                total = summary["durations"].setdefault(event["skill"], [0.0, 0])
+                total[0] += event["elapsed"]
+                total[1] += 1
+        elif kind == "retry":
+            summary["retries"] += 1
+        elif kind == "hedge":
+            summary["hedges"] += 1
+    summary["done_steps"] = sorted(done)
+    _EVENTS_CACHE[str(path)] = (version, summary)
+    return summary
+
+
+def count_restarts(view: run_archive.RunView) -> dict[str, int]:
+    restarts = {"timeout": 0, "transient": 0}
+    if not view.exists("auto_continue.log"):
+        return restarts
+    for line in view.read_text("auto_continue.log").splitlines():
+        if line.startswith("Timeout detected"):
+            restarts["timeout"] += 1
+        elif line.startswith("Transient failure"):
+            restarts["transient"] += 1
+    return restarts
+
+
+def read_proc_table() -> dict[int, dict]:
+    """pid -> {"ppid", "cpu_seconds", "rss_bytes"} for every process, or {} without /proc."""
+    table: dict[int, dict] = {}
+    if not PROC.exists():
+        return table
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            raw = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields resume after its closing parenthesis.
+        fields = raw.rsplit(")", 1)[1].split()
+        table[int(entry.name)] = {
+            "ppid": int(fields[1]),
+            "cpu_seconds": (int(fields[11]) + int(fields[12])) / CLOCK_TICKS,
+            "rss_bytes": int(fields[21]) * PAGE_SIZE,
+        }
+    return table
+
+
+def descendants(pid: int, table: dict[int, dict]) -> list[int]:
+    children: dict[int, list[int]] = {}
+    for child, info in table.items():
+        children.setdefault(info["ppid"], []).append(child)
+    found: list[int] = []
+    stack = [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def is_orchestrator(pid: int) -> bool:
+    try:
+        cmdline = (PROC / str(pid) / "cmdline").read_bytes()
+    except OSError:
+        return False
+    return b"auto_orchestrate" in cmdline
+
+
+def collect(runs_dirs: list[Path]) -> dict:
+    now = time.time()
+    table = read_proc_table()
+    runs: list[dict] = []
+    for runs_dir in runs_dirs:
+        for view in run_archive.run_views(runs_dir):
+            if not view.exists("events.jsonl"):
+                continue
+            run_dir = view.run_dir
+            summary = summarize_events(view)
+            status = json.loads(view.read_text("status.json")) if view.exists("status.json") else {}
+            pid = status.get("pid")
+            alive = bool(pid) and is_orchestrator(pid)
+            active = None
+            step = status.get("step")
+            if alive and summary["last_outcome_at"].get(step, 0.0) < status.get("started_at", 0.0):
+                active = {"step": step, "skill": status.get("skill"), "elapsed": now - status["started_at"]}
+            sequence = status.get("sequence") or []
+            children = {"processes": 0, "cpu_seconds": 0.0, "rss_bytes": 0}
+            if alive:
+                for child in descendants(pid, table):
+                    children["processes"] += 1
+                    children["cpu_seconds"] += table[child]["cpu_seconds"]
+                    children["rss_bytes"] += table[child]["rss_bytes"]
+            runs.append(
+                {
+                    "run": run_dir.name,
+                    "path": str(run_dir),
+                    "pid": pid,
+                    "alive": alive,
+                    "active_step": active,
+                    "counts": summary["counts"],
+                    "retries": summary["retries"],
+                    "hedges": summary["hedges"],
+                    "restarts": count_restarts(view),
+                    "pending_steps": max(0, len(sequence) - len(summary["done_steps"])) if sequence else 0,
+                    "durations": summary["durations"],
+                    "children": children,
+                }
+            )
+    return {"generated_at": now, "runs": runs}
+
+
+def escape_label(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_prometheus(data: dict) -> str:
+    lines: list[str] = []
+
+    def sample(name: str, labels: dict, value: float) -> None:
+        label_text = ",".join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+        lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    def metric(name: str, kind: str, help_text: str, samples: list[tuple[dict, float]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            sample(name, labels, value)
+
+    def summary(name: str, help_text: str, samples: list[tuple[dict, float, int]]) -> None:
+        # One family; _sum and _count are its sample suffixes, not metrics of their own.
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} summary")
+        for labels, total, count in samples:
+            sample(f"{name}_sum", labels, total)
+            sample(f"{name}_count", labels, count)
+
+    runs = data["runs"]
+    active = [run for run in runs if run["active_step"]]
+    metric("orchestrate_runs", "gauge", "Runs found, by whether their orchestrator is alive.", [
+        ({"state": "alive"}, sum(1 for run in runs if run["alive"])),
+        ({"state": "stopped"}, sum(1 for run in runs if not run["alive"])),
+    ])
+    metric("orchestrate_active_steps", "gauge", "Steps currently running.", [({}, len(active))])
+    metric("orchestrate_step_running_seconds", "gauge", "Elapsed time of each running step.", [
+        ({"run": run["run"], "step": run["active_step"]["step"], "skill": run["active_step"]["skill"]}, round(run["active_step"]["elapsed"], 3))
+        for run in active
+    ])
+    statuses: dict[str, int] = {}
+    for run in runs:
+        for status, count in run["counts"].items():
+            statuses[status] = statuses.get(status, 0) + count
+    metric("orchestrate_steps_total", "counter", "Finished steps by status.", [({"status": k}, v) for k, v in sorted(statuses.items())])
+    metric("orchestrate_retries_total", "counter", "Step retries by kind.", [
+        ({"kind": "transient"}, sum(run["retries"] for run in runs)),
+        ({"kind": "timeout_restart"}, sum(run["restarts"]["timeout"] for run in runs)),
+        ({"kind": "transient_restart"}, sum(run["restarts"]["transient"] for run in runs)),
+    ])
+    metric("orchestrate_hedges_total", "counter", "Hedged step attempts.", [({}, sum(run["hedges"] for run in runs))])
+    metric("orchestrate_queue_depth", "gauge", "Steps not yet completed in runs that have a sequence.", [
+        ({}, sum(run["pending_steps"] for run in runs))
+    ])
+    durations: dict[str, list[float]] = {}
+    for run in runs:
+        for skill, (total, count) in run["durations"].items():
+            slot = durations.setdefault(skill, [0.0, 0])
+            slot[0] += total
+            slot[1] += count
+    summary("orchestrate_step_duration_seconds", "Elapsed time of successful steps.", [
+        ({"skill": skill}, round(total, 3), count) for skill, (total, count) in sorted(durations.items())
+    ])
+    alive = [run for run in runs if run["alive"]]
+    metric("orchestrate_child_processes", "gauge", "Live descendant processes of each orchestrator.", [
+        ({"run": run["run"]}, run["children"]["processes"]) for run in alive
+    ])
+    metric("orchestrate_child_cpu_seconds", "gauge", "CPU time of live descendant processes.", [
+        ({"run": run["run"]}, round(run["children"]["cpu_seconds"], 2)) for run in alive
+    ])
+    metric("orchestrate_child_rss_bytes", "gauge", "Resident memory of live descendant processes.", [
+        ({"run": run["run"]}, run["children"]["rss_bytes"]) for run in alive
+    ])
+    return "\n".join(lines) + "\n"
+
+
+def make_handler(runs_dirs: list[Path]):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                body = format_prometheus(collect(runs_dirs)).encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/metrics.json":
+                body = json.dumps(collect(runs_dirs), ensure_ascii=False).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            pass
+
+    return MetricsHandler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs-dir", action="append", default=None, help="Directory of runs to watch (repeatable, default: runs)")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=9464, help="Port to listen on")
+    parser.add_argument("--once", choices=["prometheus", "json"], default=None, help="Print one scrape and exit")
+    args = parser.parse_args()
+
+    runs_dirs = [Path(p) for p in (args.runs_dir or ["runs"])]
+    if args.once == "json":
+        print(json.dumps(collect(runs_dirs), ensure_ascii=False, indent=2))
+        return 0
+    if args.once == "prometheus":
+        print(format_prometheus(collect(runs_dirs)), end="")
+        return 0
+
+    try:
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(runs_dirs))
+    except OSError as exc:
+        print(f"cannot listen on {args.host}:{args.port}: {exc}", file=sys.stderr)
+        return 1
+    print(f"serving metrics on http://{args.host}:{args.port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Content-addressed, compressed archive for finished runs/ directories.
+
+Files are deduplicated by SHA-256 (a step's .md and .response.md, the same
+brief across runs, ...) and each unique blob is compressed on its own and
+appended to runs/.archive/blobs.pack. runs/.archive/index.sqlite maps
+(run, path) to a blob and every blob to its offset in the pack, so a single
+file can be read without unpacking anything else. Blobs use zstd when the
+optional `zstandard` package is installed, xz otherwise.
+
+`RunView` is what auto_orchestrate.py --resume, auto_continue.py and the report
+tools read through: it looks in the run directory first and falls back to the
+archive, so a run keeps working after it has been packed.
+
+Usage:
+  python3 scripts/run_archive.py pack --min-age-minutes 60
+  python3 scripts/run_archive.py list
+  python3 scripts/run_archive.py cat 20250101-120000 03-webapp-implementer.md
+  python3 scripts/run_archive.py unpack 20250101-120000
+  python3 scripts/run_archive.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import lzma
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to xz
+    zstandard = None
+
+ARCHIVE_DIR = ".archive"
+INDEX_FILE = "index.sqlite"
+PACK_FILE = "blobs.pack"
+XZ_PRESET = 6
+ZSTD_LEVEL = 19
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    codec TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    run TEXT NOT NULL,
+    path TEXT NOT NULL,
+    sha TEXT NOT NULL REFERENCES blobs(sha),
+    mtime REAL NOT NULL,
+    PRIMARY KEY (run, path)
+);
+"""
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def compress(data: bytes) -> tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), "zstd"
+    return lzma.compress(data, preset=XZ_PRESET), "xz"
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "xz":
+        return lzma.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("blob is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise RuntimeError(f"unknown codec: {codec}")
+
+
+class RunArchive:
+    def __init__(self, runs_dir: Path) -> None:
+        self.root = runs_dir / ARCHIVE_DIR
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.pack_path = self.root / PACK_FILE
+        self.db = sqlite3.connect(self.root / INDEX_FILE, timeout=60, isolation_level=None)
+        self.db.executescript(SCHEMA)
+
+    @classmethod
+    def open_existing(cls, runs_dir: Path) -> RunArchive | None:
+        """The archive under `runs_dir`, or None when nothing has been packed there."""
+        if not (runs_dir / ARCHIVE_DIR / INDEX_FILE).exists():
+            return None
+        return cls(runs_dir)
+
+    def runs(self) -> list[str]:
+        return [row[0] for row in self.db.execute("SELECT DISTINCT run FROM files ORDER BY run")]
+
+    def files(self, run: str) -> dict[str, str]:
+        return dict(self.db.execute("SELECT path, sha FROM files WHERE run = ?", (run,)))
+
+    def read_blob(self, sha: str) -> bytes:
+        row = self.db.execute("SELECT offset, length, codec FROM blobs WHERE sha = ?", (sha,)).fetchone()
+        if row is None:
+            raise KeyError(sha)
+        offset, length, codec = row
+        with self.pack_path.open("rb") as f:
+            f.seek(offset)
+            return decompress(f.read(length), codec)
+
+    def add_run(self, run_dir: Path) -> dict:
+        """Store every file of `run_dir` (replacing older entries for the same paths)."""
+        stats = {"files": 0, "new_blobs": 0, "bytes": 0, "stored_bytes": 0}
+        entries: list[tuple[str, str, float, bytes]] = []
+        for path in sorted(p for p in run_dir.rglob("*") if p.is_file()):
+            data = path.read_bytes()
+            rel = path.relative_to(run_dir).as_posix()
+            entries.append((rel, hashlib.sha256(data).hexdigest(), path.stat().st_mtime, data))
+        # BEGIN IMMEDIATE serialises writers, so pack offsets cannot interleave.
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            with self.pack_path.open("ab") as pack:
+                for rel, sha, mtime, data in entries:
+                    stats["files"] += 1
+                    stats["bytes"] += len(data)
+                    if self.db.execute("SELECT 1 FROM blobs WHERE sha = ?", (sha,)).fetchone() is None:
+                        payload, codec = compress(data)
+                        offset = pack.seek(0, os.SEEK_END)
+                        pack.write(payload)
+                        self.db.execute(
+                            "INSERT INTO blobs (sha, offset, length, size, codec) VALUES (?, ?, ?, ?, ?)",
+                            (sha, offset, len(payload), len(data), codec),
+                        )
+                        stats["new_blobs"] += 1
+                        stats["stored_bytes"] += len(payload)
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO files (run, path, sha, mtime) VALUES (?, ?, ?, ?)",
+                        (run_dir.name, rel, sha, mtime),
+                    )
+                pack.flush()
+                os.fsync(pack.fileno())
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return stats
+
+    def verify_run(self, run_dir: Path) -> list[str]:
+        errors: list[str] = []
+        archived = self.files(run_dir.name)
+        for path in sorted(p for p in run_dir.rglob("*") if p.is_file()):
+            rel = path.relative_to(run_dir).as_posix()
+            sha = archived.get(rel)
+            if sha is None or hashlib.sha256(self.read_blob(sha)).hexdigest() != sha:
+                errors.append(rel)
+        return errors
+
+
+class RunView:
+    """Files of one run: the run directory first, then the archive."""
+
+    def __init__(self, run_dir: Path, archive: RunArchive | None = None) -> None:
+        self.run_dir = run_dir
+        self.archive = archive if archive is not None else RunArchive.open_existing(run_dir.parent)
+        self.archived = self.archive.files(run_dir.name) if self.archive is not None else {}
+
+    def exists(self, name: str) -> bool:
+        return (self.run_dir / name).exists() or name in self.archived
+
+    def read_text(self, name: str) -> str:
+        path = self.run_dir / name
+        if path.exists():
+            return read_text(path)
+        if name not in self.archived:
+            raise FileNotFoundError(path)
+        return self.archive.read_blob(self.archived[name]).decode("utf-8")
+
+    def names(self) -> list[str]:
+        local = {p.relative_to(self.run_dir).as_posix() for p in self.run_dir.rglob("*") if p.is_file()} if self.run_dir.exists() else set()
+        return sorted(local | set(self.archived))
+
+    def restore(self, name: str) -> None:
+        """Copy an archived file back into the run directory (for logs that are appended to)."""
+        path = self.run_dir / name
+        if not path.exists() and name in self.archived:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(self.archive.read_blob(self.archived[name]))
+
+
+def run_views(runs_dir: Path) -> list[RunView]:
+    """Every run under `runs_dir`, unpacked or archived, sorted by name."""
+    archive = RunArchive.open_existing(runs_dir)
+    names = {p.name for p in runs_dir.iterdir() if p.is_dir() and p.name != ARCHIVE_DIR} if runs_dir.exists() else set()
+    if archive is not None:
+        names |= set(archive.runs())
+    return [RunView(runs_dir / name, archive) for name in sorted(names)]
+
+
+def run_is_live(run_dir: Path) -> bool:
+    status = run_dir / "status.json"
+    if not status.exists():
+        return False
+    try:
+        pid = json.loads(read_text(status)).get("pid")
+        return bool(pid) and b"auto_orchestrate" in Path(f"/proc/{pid}/cmdline").read_bytes()
+    except (OSError, json.JSONDecodeError):
+        return False
+
+
+def pack_runs(runs_dir: Path, min_age_minutes: float, keep: bool, only: list[str] | None) -> int:
+    archive = RunArchive(runs_dir)
+    now = time.time()
+    packed = 0
+    for run_dir in sorted(p for p in runs_dir.iterdir() if p.is_dir() and p.name != ARCHIVE_DIR):
+        if only and run_dir.name not in only:
+            continue
+        files = [p for p in run_dir.rglob("*") if p.is_file()]
+        if not files or run_is_live(run_dir):
+            continue
+        if now - max(p.stat().st_mtime for p in files) < min_age_minutes * 60:
+            continue
+        stats = archive.add_run(run_dir)
+        errors = archive.verify_run(run_dir)
+        if errors:
+            print(f"{run_dir.name}: verification failed for {', '.join(errors)}; directory kept", file=sys.stderr)
+            continue
+        if not keep:
+            shutil.rmtree(run_dir)
+        packed += 1
+        print(
+            f"packed {run_dir.name}: {stats['files']} files, {stats['bytes']} bytes -> "
+            f"{stats['new_blobs']} new blobs, {stats['stored_bytes']} bytes"
+        )
+    print(f"{packed} run(s) packed")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs-dir", default="runs", help="Directory that holds the runs and the archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="Archive finished runs and remove their directories")
+    pack.add_argument("runs", nargs="*", help="Only these runs (default: every finished run)")
+    pack.add_argument("--min-age-minutes", type=float, default=60, help="Skip runs modified more recently than this")
+    pack.add_argument("--keep", action="store_true", help="Keep the run directories after packing")
+    sub.add_parser("list", help="List archived runs")
+    cat = sub.add_parser("cat", help="Print one archived file")
+    cat.add_argument("run")
+    cat.add_argument("path")
+    unpack = sub.add_parser("unpack", help="Restore an archived run directory")
+    unpack.add_argument("run")
+    unpack.add_argument("--to", default=None, help="Destination directory (default: runs/<run>)")
+    sub.add_parser("stats", help="Show archive size and deduplication")
+    args = parser.parse_args()
+
+    runs_dir = Path(args.runs_dir)
+    if args.command == "pack":
+        if not runs_dir.exists():
+            print(f"runs directory not found: {runs_dir}", file=sys.stderr)
+            return 1
+        return pack_runs(runs_dir, args.min_age_minutes, args.keep, args.runs)
+
+    archive = RunArchive.open_existing(runs_dir)
+    if archive is None:
+        print(f"no archive in {runs_dir}", file=sys.stderr)
+        return 1
+    if args.command == "list":
+        for run in archive.runs():
+            print(run)
+    elif args.command == "cat":
+        view = RunView(runs_dir / args.run, archive)
+        if args.path not in view.archived:
+            print(f"not archived: {args.run}/{args.path}", file=sys.stderr)
+            return 1
+        sys.stdout.buffer.write(archive.read_blob(view.archived[args.path]))
+    elif args.command == "unpack":
+        dest = Path(args.to) if args.to else runs_dir / args.run
+        files = archive.files(args.run)
+        if not files:
+            print(f"run not archived: {args.run}", file=sys.stderr)
+            return 1
+        for rel, sha in files.items():
+            path = dest / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(archive.read_blob(sha))
+        print(f"unpacked {len(files)} files to {dest}")
+    elif args.command == "stats":
+        runs, files, logical = archive.db.execute(
+            "SELECT COUNT(DISTINCT run), COUNT(*), COALESCE(SUM(b.size), 0) FROM files f JOIN blobs b ON b.sha = f.sha"
+        ).fetchone()
+        blobs, unique, stored = archive.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(length), 0) FROM blobs"
+        ).fetchone()
+        print(f"runs: {runs}, files: {files}, blobs: {blobs}")
+        print(f"logical bytes: {logical}, unique bytes: {unique}, stored bytes: {stored}")
+        if stored:
+            print(f"overall ratio: {logical / stored:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,5 @@
 import { Card, CardColor, GameStacks, PlayerState, Resources, SpiritCard, Tile, TileActionType, TileType } from "./magiTypes";
+import { Rng, createSeededRng } from "./magiDeck";
 
 const CARD_COLORS: CardColor[] = ["white", "red", "blue", "green", "yellow"];
 
@@ -108,7 +109,7 @@ export function createPlayerState(uid: string, name: string, seat: number): Play
   };
 }
 
-export function createCardDeck(): Card[] {
+export function createCardDeck(rng: Rng = Math.random): Card[] {
   const cards: Card[] = [];
   let idx = 1;
   CARD_COLORS.forEach((color) => {
@@ -117,20 +118,22 @@ export function createCardDeck(): Card[] {
       idx += 1;
     }
   });
-  return shuffle(cards);
+  return shuffle(cards, rng);
 }
 
-export function createSpiritDeck(): SpiritCard[] {
-  return shuffle([...BASE_SPIRITS]);
+export function createSpiritDeck(rng: Rng = Math.random): SpiritCard[] {
+  return shuffle([...BASE_SPIRITS], rng);
 }
 
-export function createStacks(): GameStacks {
+// With a seed, the stacks match create_stacks(seed) in scripts/magi_deck.py.
+export function createStacks(seed?: number): GameStacks {
+  const rng = seed === undefined ? Math.random : createSeededRng(seed);
   return {
-    cardDeck: createCardDeck(),
+    cardDeck: createCardDeck(rng),
     cardDiscard: [],
-    spiritDeck: createSpiritDeck(),
-    paperDeck: shuffle([...PAPER_DECK]),
-    monsterDeck: shuffle([...MONSTER_DECK]),
+    spiritDeck: createSpiritDeck(rng),
+    paperDeck: shuffle([...PAPER_DECK], rng),
+    monsterDeck: shuffle([...MONSTER_DECK], rng),
   };
 }
 
@@ -138,10 +141,10 @@ export function createEmptyStacks(): GameStacks {
   return { cardDeck: [], cardDiscard: [], spiritDeck: [], paperDeck: [], monsterDeck: [] };
 }
 
-export function shuffle<T>(items: T[]): T[] {
+export function shuffle<T>(items: T[], rng: Rng = Math.random): T[] {
   const array = [...items];
   for (let i = array.length - 1; i > 0; i -= 1) {
-    const j = Math.floor(Math.random() * (i + 1));
+    const j = Math.floor(rng() * (i + 1));
     [array[i], array[j]] = [array[j], array[i]];
   }
   return array;
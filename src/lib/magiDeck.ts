@@ -0,0 +1,55 @@
+// Seeded deck permutations. Bit-exact twin of scripts/magi_deck.py so that a
+// seed plus a draw cursor reproduces the same stacks in TypeScript and Python.
+
+export type Rng = () => number;
+
+export const STACK_NAMES = ["cardDeck", "spiritDeck", "paperDeck", "monsterDeck"] as const;
+
+export function mulberry32(seed: number) {
+  let state = seed >>> 0;
+  return function nextUint32(): number {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t = (t + Math.imul(t ^ (t >>> 7), t | 61)) ^ t;
+    return (t ^ (t >>> 14)) >>> 0;
+  };
+}
+
+export function createSeededRng(seed: number): Rng {
+  const next = mulberry32(seed);
+  return () => next() / 4294967296;
+}
+
+export function shuffledIndices(size: number, rng: Rng): Uint16Array {
+  const order = Uint16Array.from({ length: size }, (_, index) => index);
+  for (let i = order.length - 1; i > 0; i -= 1) {
+    const j = Math.floor(rng() * (i + 1));
+    const swap = order[i];
+    order[i] = order[j];
+    order[j] = swap;
+  }
+  return order;
+}
+
+export function encodeIndices(order: ArrayLike<number>): string {
+  let binary = "";
+  for (let i = 0; i < order.length; i += 1) {
+    binary += String.fromCharCode(order[i] & 0xff, (order[i] >>> 8) & 0xff);
+  }
+  return btoa(binary);
+}
+
+export function decodeIndices(encoded: string): Uint16Array {
+  const binary = atob(encoded);
+  const order = new Uint16Array(binary.length >> 1);
+  for (let i = 0; i < order.length; i += 1) {
+    order[i] = binary.charCodeAt(i * 2) | (binary.charCodeAt(i * 2 + 1) << 8);
+  }
+  return order;
+}
+
+export function drawIndices(order: Uint16Array, cursor: number, count: number) {
+  const end = Math.min(order.length, cursor + Math.max(0, count));
+  return { drawn: order.subarray(cursor, end), cursor: end };
+}